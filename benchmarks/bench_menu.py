@@ -0,0 +1,91 @@
+"""Benchmarks of core menu operations on synthetic menus at the maximum number
+of supported algorithms.
+
+Setup routines (generating menus, clearing caches) are excluded from timing.
+"""
+
+from tmEditor.core import XmlDecoder, XmlEncoder
+from tmEditor.core.Algorithm import Algorithm, tokenCache
+from tmEditor.core.AlgorithmFormatter import AlgorithmFormatter
+from tmEditor.core.ReferenceExtractor import extractReferences
+
+from synthetic import createMenu
+
+
+def clearCaches():
+    tokenCache.clear()
+    extractReferences.cache_clear()
+
+
+class BenchXml:
+
+    def bench_load(self, benchmark, threshold, seededMenuFile):
+        menu = benchmark.pedantic(XmlDecoder.load, args=(seededMenuFile, ), setup=clearCaches, rounds=3)
+        assert len(menu.algorithms) == 512
+        threshold("load")
+
+    def bench_dump(self, benchmark, threshold, seededMenu, tmp_path):
+        filename = str(tmp_path / "L1Menu_Benchmark.xml")
+        benchmark.pedantic(XmlEncoder.dump, args=(seededMenu, filename, "tmtable"), setup=clearCaches, rounds=3)
+        threshold("dump")
+
+    def bench_dump_stream(self, benchmark, threshold, seededMenu, tmp_path):
+        filename = str(tmp_path / "L1Menu_Benchmark.xml")
+        benchmark.pedantic(XmlEncoder.dump, args=(seededMenu, filename, "stream"), setup=clearCaches, rounds=3)
+        threshold("dump_stream")
+
+    def bench_dump_stream_synthetic(self, benchmark, threshold, tmp_path):
+        filename = str(tmp_path / "L1Menu_Benchmark.xml")
+        menu = createMenu()
+        benchmark.pedantic(XmlEncoder.dump, args=(menu, filename, "stream"), setup=clearCaches, rounds=3)
+        threshold("dump_stream_synthetic")
+
+
+class BenchMenu:
+
+    def bench_validate(self, benchmark, threshold):
+        def setup():
+            clearCaches()
+            return (createMenu(), ), {}
+        benchmark.pedantic(lambda menu: menu.validate(), setup=setup, rounds=3)
+        threshold("validate")
+
+    def bench_validate_incremental(self, benchmark, threshold):
+        menu = createMenu()
+        menu.validate()
+        benchmark(menu.validate)
+        threshold("validate_incremental")
+
+    def bench_orphaned_cuts(self, benchmark, threshold):
+        menu = createMenu()
+        cuts = benchmark(menu.orphanedCuts)
+        assert len(cuts) == 512 * 5 - len({cut for algorithm in menu.algorithms for cut in algorithm.cuts()})
+        threshold("orphaned_cuts")
+
+
+class BenchAlgorithm:
+
+    def bench_references(self, benchmark, threshold):
+        expressions = [algorithm.expression for algorithm in createMenu().algorithms]
+
+        def setup():
+            clearCaches()
+            return ([Algorithm(index, f"L1_Benchmark_{index:04d}", expression) for index, expression in enumerate(expressions)], ), {}
+
+        def references(algorithms):
+            for algorithm in algorithms:
+                algorithm.cuts()
+                algorithm.objects()
+
+        benchmark.pedantic(references, setup=setup, rounds=5)
+        threshold("references")
+
+    def bench_normalize(self, benchmark, threshold):
+        expressions = [algorithm.expression for algorithm in createMenu().algorithms]
+
+        def normalize():
+            for expression in expressions:
+                AlgorithmFormatter.normalize(expression)
+
+        benchmark(normalize)
+        threshold("normalize")
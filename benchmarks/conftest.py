@@ -0,0 +1,75 @@
+import json
+import os
+
+import pytest
+
+from tmEditor.core import XmlDecoder, XmlEncoder
+
+from synthetic import createMenu
+
+ThresholdsFile = os.path.join(os.path.dirname(__file__), "thresholds.json")
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--seed-menu",
+        metavar="FILE",
+        default=os.environ.get("TM_EDITOR_SEED_MENU"),
+        help="XML menu providing scales and external signals for XML load/dump benchmarks (default: $TM_EDITOR_SEED_MENU)"
+    )
+    parser.addoption(
+        "--threshold-factor",
+        metavar="FACTOR",
+        type=float,
+        default=1.0,
+        help="scale regression thresholds, eg. for slower hosts (default: 1.0)"
+    )
+
+
+@pytest.fixture(scope="session")
+def thresholds():
+    with open(ThresholdsFile) as fp:
+        return json.load(fp)
+
+
+@pytest.fixture
+def threshold(benchmark, thresholds, request):
+    """Returns function asserting the mean runtime of the benchmark does not
+    exceed the regression threshold of an operation. The threshold is
+    recorded in the JSON results.
+    """
+    factor = request.config.getoption("--threshold-factor")
+
+    def check(name):
+        limit = thresholds[name] * factor
+        benchmark.extra_info["threshold"] = limit
+        if benchmark.stats is None:
+            return  # benchmarks disabled
+        mean = benchmark.stats.stats.mean
+        assert mean <= limit, f"performance regression of {name!r}: mean {mean:.4f}s exceeds threshold of {limit:.4f}s"
+
+    return check
+
+
+@pytest.fixture(scope="session")
+def seedMenu(request):
+    """Returns menu loaded from the seed XML file, skips if not provided."""
+    filename = request.config.getoption("--seed-menu")
+    if not filename:
+        pytest.skip("requires a seed XML menu (--seed-menu or $TM_EDITOR_SEED_MENU)")
+    return XmlDecoder.load(filename)
+
+
+@pytest.fixture(scope="session")
+def seededMenu(seedMenu):
+    """Returns synthetic menu using scales and external signals of the seed menu."""
+    names = [signal["name"] for signal in seedMenu.extSignals.extSignals][:4]
+    return createMenu(scales=seedMenu.scales, extSignals=seedMenu.extSignals, extSignalNames=names)
+
+
+@pytest.fixture(scope="session")
+def seededMenuFile(seededMenu, tmp_path_factory):
+    """Returns path to XML file of the seeded synthetic menu."""
+    filename = str(tmp_path_factory.mktemp("menus") / "L1Menu_Benchmark.xml")
+    XmlEncoder.dump(seededMenu, filename)
+    return filename
@@ -0,0 +1,107 @@
+"""Synthetic menu generator for benchmarks.
+
+Creates menus at the maximum number of supported algorithms, every algorithm
+defining its own set of cuts (some of them left orphaned on purpose).
+
+>>> menu = createMenu()
+>>> len(menu.algorithms), len(menu.cuts)
+(512, 2560)
+
+"""
+
+from typing import List, Optional, Sequence
+
+import tmGrammar
+
+from tmEditor.core.Algorithm import Algorithm, Cut
+from tmEditor.core.Menu import Menu, ScalesSnapshot, ExtSignalsSnapshot
+from tmEditor.core.Settings import MaxAlgorithms
+
+__all__ = ["createMenu", "createScales", "createExtSignals"]
+
+EtScales = {
+    tmGrammar.MU: 255.5,
+    tmGrammar.EG: 255.5,
+    tmGrammar.TAU: 255.5,
+    tmGrammar.JET: 1023.5,
+    tmGrammar.ETM: 2047.5,
+    tmGrammar.HTT: 2047.5,
+}
+"""Object types and upper ET limits of synthetic scales (0.5 GeV steps)."""
+
+EtaScales = {
+    tmGrammar.MU: (-2.45, 2.45),
+    tmGrammar.EG: (-2.5839, 2.5839),
+    tmGrammar.TAU: (-2.1315, 2.1315),
+    tmGrammar.JET: (-5.0, 5.0),
+}
+
+ExtSignalNames = ("BPTX_plus", "BPTX_minus", "BPTX_plus_AND_minus", "ZeroBias")
+
+Templates = (
+    "MU{t1}[MU-ETA_{s}] AND EG{t2}[EG-PHI_{s}]",
+    "comb{{JET{t1},JET{t2}}} OR TAU{t1}[TAU-ETA_{s}]",
+    "dist{{MU{t1}[MU-ETA_{s}],EG{t2}}}[DETA_{s}]",
+    "mass_inv{{MU{t1},MU{t2}}}[MASS_{s}] AND NOT (ETM{t3} OR HTT{t3})",
+    "(MU{t1} OR EG{t2}[EG-PHI_{s}]) AND EXT_{ext}",
+)
+"""Expression templates, *s* is the algorithm's cut suffix."""
+
+
+def createScales() -> ScalesSnapshot:
+    """Returns synthetic scale set providing ET bins, eta and phi ranges."""
+    scales: List[dict] = []
+    bins = {}
+    for object_, maximum in EtScales.items():
+        scales.append({"object": object_, "type": "ET", "minimum": "0", "maximum": format(maximum), "step": "0.5"})
+        key = f"{object_}-ET"
+        count = int(maximum * 2) + 1
+        bins[key] = [{"number": format(i), "minimum": format(i * .5), "maximum": format((i + 1) * .5)} for i in range(count)]
+    for object_, (minimum, maximum) in EtaScales.items():
+        scales.append({"object": object_, "type": tmGrammar.ETA, "minimum": format(minimum), "maximum": format(maximum), "step": "0.087"})
+        scales.append({"object": object_, "type": tmGrammar.PHI, "minimum": "0", "maximum": "6.2832", "step": "0.0436"})
+    return ScalesSnapshot({"name": "Scales_Benchmark"}, scales, bins)
+
+
+def createExtSignals(names: Sequence[str] = ExtSignalNames) -> ExtSignalsSnapshot:
+    """Returns synthetic external signal set."""
+    return ExtSignalsSnapshot({"name": "ExtSignals_Benchmark"}, [{"name": name} for name in names])
+
+
+def createCuts(suffix: str) -> List[Cut]:
+    return [
+        Cut(f"MU-ETA_{suffix}", tmGrammar.MU, tmGrammar.ETA, -2.1, 2.1),
+        Cut(f"EG-PHI_{suffix}", tmGrammar.EG, tmGrammar.PHI, 0.5, 2.5),
+        Cut(f"TAU-ETA_{suffix}", tmGrammar.TAU, tmGrammar.ETA, -2.0, 2.0),
+        Cut(f"DETA_{suffix}", "", tmGrammar.DETA, 0.0, 1.5),
+        Cut(f"MASS_{suffix}", "", tmGrammar.MASS, 10.0, 200.0),
+    ]
+
+
+def createMenu(count: int = MaxAlgorithms, scales=None, extSignals=None,
+               extSignalNames: Optional[Sequence[str]] = None) -> Menu:
+    """Returns synthetic menu with *count* algorithms and five cuts per
+    algorithm. Optional *scales* and *extSignals* replace the synthetic sets,
+    in that case *extSignalNames* must list signals of *extSignals*.
+    """
+    extSignalNames = extSignalNames or ExtSignalNames
+    menu = Menu()
+    menu.menu.name = "L1Menu_Benchmark"
+    menu.scales = scales if scales is not None else createScales()
+    menu.extSignals = extSignals if extSignals is not None else createExtSignals(extSignalNames)
+    for index in range(count):
+        suffix = f"B{index:04d}"
+        for cut in createCuts(suffix):
+            menu.addCut(cut)
+        template = Templates[index % len(Templates)]
+        expression = template.format(
+            s=suffix,
+            t1=10 + index % 40,
+            t2=5 + index % 20,
+            t3=50 + index % 100,
+            ext=extSignalNames[index % len(extSignalNames)]
+        )
+        algorithm = Algorithm(index, f"L1_Benchmark_{index:04d}", expression)
+        menu.addAlgorithm(algorithm)
+        menu.extendReferenced(algorithm)
+    return menu
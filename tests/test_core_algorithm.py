@@ -1,6 +1,6 @@
 import tmGrammar
 
-from tmEditor.core.Algorithm import Algorithm
+from tmEditor.core.Algorithm import Algorithm, Cut, TokenCache
 
 
 class TestCoreAlgorithm:
@@ -13,10 +13,59 @@ class TestCoreAlgorithm:
         assert algorithm.comment == ""
         assert algorithm.labels == []
 
+    def test_revision(self):
+        algorithm = Algorithm(0, "L1_Mu0", "MU0")
+        revision = algorithm.revision
+        algorithm.comment = "comment"
+        algorithm.expression = "MU1"
+        assert algorithm.revision == revision + 2
+        algorithm.modified = True
+        algorithm.modified = True
+        assert algorithm.revision == revision + 4
+        cut = Cut("MU-ETA_2p1", "MU", "ETA", -2.1, 2.1)
+        revision = cut.revision
+        cut.comment = "comment"
+        assert cut.revision == revision + 1
+
     def test_Algorithm_tokens(self):
         algorithm = Algorithm(0, "L1_Mu0", "MU0")
-        assert algorithm.tokens() == ["MU0"]
+        assert algorithm.tokens() == ("MU0",)
         algorithm.expression = "JET1 AND TAU2"
-        assert algorithm.tokens() == ["JET1", "TAU2", "AND"]
+        assert algorithm.tokens() == ("JET1", "TAU2", "AND")
         algorithm.expression = "JET1 AND (TAU2 OR MU3)"
-        assert algorithm.tokens() == ["JET1", "TAU2", "MU3", "OR", "AND"]
+        assert algorithm.tokens() == ("JET1", "TAU2", "MU3", "OR", "AND")
+
+    def test_TokenCache(self):
+        cache = TokenCache(maxsize=2)
+        assert cache.tokens("MU0") == ("MU0",)
+        assert cache.tokens("MU0") is cache.tokens("MU0")
+        assert cache.misses == 1
+        assert cache.hits == 2
+        cache.tokens("MU1")
+        cache.tokens("MU2")
+        assert len(cache) == 2
+        assert "MU0" not in cache
+        cache.invalidate("MU1")
+        assert "MU1" not in cache
+
+    def test_Algorithm_tokens_invalidate(self):
+        algorithm = Algorithm(0, "L1_Mu0", "MU0")
+        tokens = algorithm.tokens()
+        assert algorithm.tokens() is tokens
+        algorithm.expression = "MU1"
+        assert algorithm.tokens() == ("MU1",)
+
+    def test_Algorithm_references(self):
+        algorithm = Algorithm(0, "L1_Test", "MU10[MU-ETA_2p1] AND dist{JET20,JET20}[DETA_1] OR EXT_BPTX_plus")
+        references = algorithm.references()
+        assert references.objects == ("MU10", "JET20")
+        assert references.cuts == ("MU-ETA_2p1", "DETA_1")
+        assert references.externals == ("EXT_BPTX_plus",)
+        assert len(references.functions) == 1
+        assert references.functions[0].objects == ("JET20", "JET20")
+        assert references.functions[0].cuts == ("DETA_1",)
+        assert references.functions[0].objectCuts == ((), ())
+        assert algorithm.references() is references
+        algorithm.expression = "MU20"
+        assert algorithm.objects() == ["MU20"]
+        assert algorithm.cuts() == []
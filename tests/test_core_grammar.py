@@ -0,0 +1,50 @@
+import threading
+import time
+
+import pytest
+
+from tmEditor.core.Algorithm import parseTokens
+from tmEditor.core.grammar import GrammarWorker, grammarLock, synchronized, submit
+
+
+class TestGrammar:
+
+    def test_synchronized(self):
+        active = []
+        overlaps = []
+
+        @synchronized
+        def parse():
+            active.append(threading.current_thread())
+            if len(active) > 1:
+                overlaps.append(len(active))
+            time.sleep(0.001)
+            active.pop()
+
+        threads = [threading.Thread(target=parse) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not overlaps
+
+    def test_reentrant(self):
+        with grammarLock:
+            assert parseTokens("MU10 AND JET20") == ("MU10", "JET20", "AND")
+
+    def test_submit(self):
+        future = submit(parseTokens, "MU10 AND JET20")
+        assert future.result(timeout=10) == ("MU10", "JET20", "AND")
+
+    def test_worker(self):
+        worker = GrammarWorker()
+        threads = []
+        futures = [worker.submit(lambda: threads.append(threading.current_thread())) for _ in range(4)]
+        for future in futures:
+            future.result(timeout=10)
+        assert len(set(threads)) == 1
+        assert threading.current_thread() not in threads
+        future = worker.submit(int, "MU10")
+        with pytest.raises(ValueError):
+            future.result(timeout=10)
+        worker.shutdown()
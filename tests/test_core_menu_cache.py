@@ -0,0 +1,92 @@
+import os
+
+import pytest
+
+from tmEditor.core.Algorithm import Algorithm, Cut, Object, External
+from tmEditor.core.Menu import Menu, ScalesSnapshot, ExtSignalsSnapshot
+from tmEditor.core import MenuCache as menu_cache
+from tmEditor.core.MenuCache import MenuCache
+
+
+def createMenu():
+    menu = Menu()
+    menu.menu.name = "L1Menu_Unittest"
+    menu.menu.uuid_menu = "00000000-0000-0000-0000-000000000000"
+    menu.menu.grammar_version = "0.13"
+    menu.addAlgorithm(Algorithm(0, "L1_Unittest", "MU10[MU-ETA_Q] AND EXT_BPTX_plus", "comment", ["label"]))
+    menu.addCut(Cut("MU-ETA_Q", "MU", "ETA", -1.5, 1.5))
+    menu.addObject(Object("MU10", "MU", "10"))
+    menu.addExternal(External("EXT_BPTX_plus"))
+    return menu
+
+
+@pytest.fixture
+def filename(tmp_path):
+    path = tmp_path / "L1Menu_Unittest.xml"
+    path.write_text("<menu/>")
+    return str(path)
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return MenuCache(str(tmp_path / "cache"))
+
+
+class TestMenuCache:
+
+    def test_load(self, cache, filename):
+        assert cache.load(filename) is None
+        menu = createMenu()
+        cache.store(filename, menu)
+        cached = cache.load(filename)
+        assert cached.menu.__dict__ == menu.menu.__dict__
+        assert cached.algorithms == menu.algorithms
+        assert cached.algorithms[0].labels == ["label"]
+        assert [cut.name for cut in cached.cuts] == ["MU-ETA_Q"]
+        assert cached.objects == menu.objects
+        assert [external.name for external in cached.externals] == ["EXT_BPTX_plus"]
+        assert cached.algorithmByName("L1_Unittest") is cached.algorithms[0]
+
+    def test_scales(self, cache, filename):
+        menu = createMenu()
+        menu.scales = ScalesSnapshot({"name": "Scales"}, [{"object": "MU", "type": "ET"}], {"MU-ET": [{"number": "0"}]})
+        menu.extSignals = ExtSignalsSnapshot({"name": "ExtSignals"}, [{"name": "BPTX_plus"}])
+        cache.store(filename, menu)
+        snapshot = cache.load(filename).snapshot()
+        assert snapshot.scales == menu.scales
+        assert snapshot.extSignals == menu.extSignals
+
+    def test_outdated(self, cache, filename):
+        cache.store(filename, createMenu())
+        with open(filename, "w") as fp:
+            fp.write("<menu></menu>")
+        assert cache.load(filename) is None
+
+    def test_format_version(self, cache, filename, monkeypatch):
+        cache.store(filename, createMenu())
+        monkeypatch.setattr(menu_cache, "CacheFormatVersion", menu_cache.CacheFormatVersion + 1)
+        assert cache.load(filename) is None
+
+    def test_corrupted(self, cache, filename):
+        cache.store(filename, createMenu())
+        with open(cache.entryPath(filename), "r+b") as fp:
+            fp.seek(8)
+            fp.write(b"corrupted")
+        assert cache.load(filename) is None
+
+    def test_evict(self, cache, tmp_path):
+        filenames = []
+        for index in range(3):
+            path = tmp_path / f"L1Menu_Unittest_{index}.xml"
+            path.write_text(f"<menu>{index}</menu>")
+            filenames.append(str(path))
+        cache.store(filenames[0], createMenu())
+        size = os.path.getsize(cache.entryPath(filenames[0]))
+        cache.maxSize = size * 2 + size // 2  # entry sizes may differ slightly
+        cache.store(filenames[1], createMenu())
+        os.utime(cache.entryPath(filenames[0]), ns=(0, 0))
+        assert cache.load(filenames[1]) is not None
+        cache.store(filenames[2], createMenu())
+        assert not os.path.exists(cache.entryPath(filenames[0]))
+        assert cache.load(filenames[1]) is not None
+        assert cache.load(filenames[2]) is not None
@@ -0,0 +1,60 @@
+import pytest
+
+from tmEditor.core.MultiDecoder import MultiDecoder, picklableError
+
+from .test_core_xml_stream_decoder import Document, contents
+
+
+class UnpicklableError(Exception):
+
+    def __init__(self, message, handle):
+        super().__init__(message)
+        self.handle = handle
+
+    def __reduce__(self):
+        raise TypeError("not picklable")
+
+
+@pytest.fixture
+def filenames(tmp_path):
+    filenames = []
+    for index in range(3):
+        path = tmp_path / f"L1Menu_Unittest_{index}.xml"
+        path.write_text(Document.format(version="0.13"))
+        filenames.append(str(path))
+    return filenames
+
+
+class TestMultiDecoder:
+
+    def test_errors(self, tmp_path):
+        filenames = [str(tmp_path / f"missing_{index}.xml") for index in range(3)]
+        results = list(MultiDecoder(filenames, workers=2, cache=None).results())
+        assert [result.position for result in results] == [0, 1, 2]
+        assert [result.filename for result in results] == filenames
+        assert all(result.error is not None and result.menu is None for result in results)
+
+    def test_load(self, filenames, tmp_path):
+        filenames.insert(1, str(tmp_path / "missing.xml"))
+        progress = []
+        decoder = MultiDecoder(filenames, workers=2, cache=None, backend="stream")
+        results = list(decoder.results(lambda *args: progress.append(args)))
+        assert [result.filename for result in results] == filenames
+        assert results[1].error is not None
+        for index in (0, 2, 3):
+            assert results[index].error is None
+            assert results[index].menu.menu.name == "L1Menu_Unittest"
+        assert contents(results[0].menu) == contents(results[3].menu)
+        assert (0, 100, "done") in progress
+
+    def test_cancel(self, filenames):
+        decoder = MultiDecoder(filenames, workers=1, cache=None)
+        decoder.cancel()
+        assert list(decoder.results()) == []
+
+    def test_picklable_error(self):
+        error = ValueError("invalid")
+        assert picklableError(error) is error
+        error = picklableError(UnpicklableError("invalid", object()))
+        assert isinstance(error, RuntimeError)
+        assert format(error) == "invalid"
@@ -0,0 +1,66 @@
+import threading
+
+import pytest
+
+from tmEditor.core.Queue import Queue, QueueCanceled
+
+
+class TestQueue:
+
+    def test_exec(self):
+        calls = []
+        queue = Queue()
+        queue.add_callback(lambda: calls.append(1), "first")
+        queue.add_callback(lambda: calls.append(2), "second")
+        progress = []
+        for callback in queue:
+            callback()
+            progress.append((queue.message(), queue.progress()))
+        assert calls == [1, 2]
+        assert progress == [("first", 50), ("second", 100)]
+
+    def test_cancel(self):
+        calls = []
+        queue = Queue()
+        queue.add_callback(lambda: calls.append(1), "first")
+        queue.add_callback(queue.cancel, "cancel")
+        queue.add_callback(lambda: calls.append(3), "third")
+        with pytest.raises(QueueCanceled):
+            queue.exec_()
+        assert calls == [1]
+        assert queue.isCanceled()
+
+    def test_cancel_thread(self):
+        started = threading.Event()
+        queue = Queue()
+        errors = []
+
+        def run():
+            started.set()
+            while True:
+                queue.checkCanceled()
+
+        def worker():
+            try:
+                queue.exec_()
+            except QueueCanceled as exc:
+                errors.append(exc)
+
+        queue.add_callback(run, "running")
+        thread = threading.Thread(target=worker)
+        thread.start()
+        started.wait()
+        queue.cancel()
+        thread.join(timeout=5)
+        assert not thread.is_alive()
+        assert len(errors) == 1
+
+    def test_stop(self):
+        calls = []
+        queue = Queue()
+        queue.add_callback(lambda: calls.append(1), "first")
+        queue.add_callback(queue.stop, "stop")
+        queue.add_callback(lambda: calls.append(3), "third")
+        queue.exec_()
+        assert calls == [1]
+        assert queue.progress() == 100
@@ -0,0 +1,77 @@
+import threading
+
+import pytest
+
+from tmEditor.core.Algorithm import Algorithm, toObject
+from tmEditor.core.ReferenceExtractor import extractReferences, extractObject
+
+Expressions = [
+    "MU10",
+    "EG.ge.60+1",
+    "TAU.eq.260p5-2",
+    "JET4[JET-DISP_LLP]",
+    "MU0[MU-QLTY_DBLE,MU-ETA_2p1] AND NOT EG10",
+    "(MU10 OR MU20) AND (JET120 XOR NOT (ETM80 OR HTT200))",
+    "MU10 AND EXT_BPTX_plus AND NOT EXT_BPTX_minus+1",
+    "comb{MU20,MU10}",
+    "comb{MU20[MU-ISO_Q],MU10[MU-ISO_Q]} OR MU20[MU-ISO_Q]",
+    "comb{EG80+1,EG60+1,EG40+1}",
+    "comb{TAU80[TAU-ISO_Q],TAU60[TAU-ISO_Q],TAU40[TAU-ISO_Q],TAU20[TAU-ISO_Q]}",
+    "comb{MU400[MU-ETA_Q],MU300[MU-ETA_Q,MU-PHI_Q,MU-ISO_Q],MU200[MU-PHI_Q],MU100[MU-ETA_Q]}",
+    "dist{MU10,MU20}[DR_Q]",
+    "dist{EG80+1,EG60+1}[DETA_Q,DPHI_Q]",
+    "dist{TAU80[TAU-ISO_Q],TAU20[TAU-ISO_Q]}[DETA_Q]",
+    "mass_inv{MU10,MU20}[MASS_X,CHGCOR_OS] AND comb{MU10,MU20}",
+    "mass_inv_3{MU10,MU20,MU20}[MASS_X]",
+    "mass_trv{MU10,ETM40}[MASSTRV_X]",
+    "dist_orm{JET100,JET80,TAU40}[ORMDR_0p2]",
+    "CENT0 AND MUS1+1 AND ADT[ADT-ASCORE_X]",
+    "ETMHF100 OR HTMHF80 OR ASYMETHF10 OR MBT0HFP1 OR TOWERCOUNT100",
+]
+
+
+class TestReferenceExtractor:
+
+    @pytest.mark.parametrize("expression", Expressions)
+    def test_differential(self, expression):
+        references = extractReferences(expression)
+        algorithm = Algorithm(0, "L1_Unittest", expression)
+        assert list(references.objects) == algorithm.objects()
+        assert list(references.cuts) == algorithm.cuts()
+        assert list(references.externals) == algorithm.externals()
+        functions = algorithm.references().functions
+        assert [(f.objects, f.cuts, f.objectCuts) for f in references.functions] == \
+               [(f.objects, f.cuts, f.objectCuts) for f in functions]
+
+    @pytest.mark.parametrize("token", ["MU10", "EG.ge.60+1", "TAU.eq.260p5-2", "ETMHF100-1", "CENT0+1"])
+    def test_extractObject(self, token):
+        object_ = extractObject(token)
+        reference = toObject(token)
+        assert object_.name == reference.name
+        assert object_.type == reference.type
+        assert object_.bx_offset == reference.bx_offset
+        assert object_.comparison_operator == reference.comparison_operator
+
+    @pytest.mark.parametrize("expression", ["", "MU10 AND (MU20", "comb{MU10,MU20", "MU10[MU-ETA_Q", "FOO10", "comb{MU10,}", "foo{MU10,MU20}"])
+    def test_malformed(self, expression):
+        if not expression:
+            assert extractReferences(expression) == ((), (), (), ())
+            return
+        with pytest.raises(ValueError):
+            extractReferences(expression)
+
+    def test_threads(self):
+        expected = {expression: extractReferences.__wrapped__(expression) for expression in Expressions}
+        errors = []
+
+        def worker():
+            for expression in Expressions * 10:
+                if extractReferences(expression) != expected[expression]:
+                    errors.append(expression)
+
+        threads = [threading.Thread(target=worker) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
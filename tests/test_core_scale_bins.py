@@ -0,0 +1,96 @@
+import gc
+
+from tmEditor.core.Menu import ScalesSnapshot
+from tmEditor.core.ScaleBins import ScaleBins, ScalesCache, scaleBins
+
+
+def createEtBins(count=8):
+    return [{"number": format(i), "minimum": format(i * .5), "maximum": format((i + 1) * .5)} for i in range(count)]
+
+
+def createEtaBins():
+    # two's complement encoded bin numbers, not sorted by numbers
+    bins = []
+    for i in range(4):
+        bins.append({"number": format(i), "minimum": format(i * .25), "maximum": format((i + 1) * .25)})
+    for i in range(1, 5):
+        bins.append({"number": format(256 - i), "minimum": format(-i * .25), "maximum": format((1 - i) * .25)})
+    return bins
+
+
+def createScales():
+    return ScalesSnapshot({"name": "Scales_Unittest"}, [], {"MU-ET": createEtBins(), "MU-ETA": createEtaBins()})
+
+
+class TestScaleBins:
+
+    def test_arrays(self):
+        bins = ScaleBins(createEtBins())
+        assert len(bins) == 8
+        assert list(bins.numbers) == list(range(8))
+        assert bins.minimum == .0
+        assert bins.maximum == 4.
+        assert bins.step == .5
+        assert bins.lastIndex == 7
+        assert bins.bin(3)["minimum"] == 1.5
+
+    def test_sorted(self):
+        bins = ScaleBins(createEtaBins())
+        assert list(bins.values("minimum")) == [-1., -.75, -.5, -.25, 0., .25, .5, .75]
+        assert list(bins.values("maximum")) == [-.75, -.5, -.25, 0., .25, .5, .75, 1.]
+        assert bins.minimum == -1.
+        assert bins.maximum == 1.
+        assert bins.numbers[bins.lastIndex] == 3
+
+    def test_nearest(self):
+        bins = ScaleBins(createEtaBins())
+        assert bins.nearest(-2.) == -1.
+        assert bins.nearest(2.) == .75
+        assert bins.nearest(.3) == .25
+        assert bins.nearest(.375) == .25
+        assert bins.nearest(.4) == .5
+        assert bins.nearest(.3, "maximum") == .25
+        assert bins.nearest(.9, "maximum") == 1.
+
+    def test_bin_for_value(self):
+        bins = ScaleBins(createEtaBins())
+        assert bins.binForValue(-1.) == 252
+        assert bins.binForValue(-.1) == 255
+        assert bins.binForValue(.0) == 0
+        assert bins.binForValue(.8) == 3
+        assert bins.binForValue(1.) is None
+        assert bins.binForValue(-1.1) is None
+
+    def test_is_limit(self):
+        bins = ScaleBins(createEtBins())
+        assert bins.isLimit(.0)
+        assert bins.isLimit(2.5)
+        assert bins.isLimit(4.)
+        assert not bins.isLimit(2.25)
+        assert not bins.isLimit(4.5)
+
+    def test_empty(self):
+        bins = ScaleBins([])
+        assert len(bins) == 0
+        assert bins.lastIndex is None
+        assert bins.binForValue(.0) is None
+        assert not bins.isLimit(.0)
+
+
+class TestScalesCache:
+
+    def test_get(self):
+        scales = createScales()
+        bins = scaleBins(scales, "MU-ET")
+        assert scaleBins(scales, "MU-ET") is bins
+        assert scaleBins(scales, "MU-ETA") is not bins
+        assert scaleBins(scales, "EG-ET") is None
+
+    def test_release(self):
+        cache = ScalesCache(lambda scales, key: ScaleBins(scales.bins[key]))
+        scales = createScales()
+        assert cache.get(scales, "MU-ET") is cache.get(scales, "MU-ET")
+        assert len(cache) == 1
+        del scales
+        gc.collect()
+        assert len(cache) == 0
@@ -0,0 +1,49 @@
+import pickle
+
+from tmEditor.core.Menu import Menu, ScalesSnapshot
+from tmEditor.core.Algorithm import Object
+from tmEditor.core.ScaleIndex import ScaleIndex, scaleIndex
+
+
+def createScales():
+    return ScalesSnapshot(
+        {"name": "Scales_Unittest"},
+        [
+            {"object": "MU", "type": "ET", "minimum": "0", "maximum": "255.5", "step": "0.5"},
+            {"object": "MU", "type": "ETA", "minimum": "-2.45", "maximum": "2.45", "step": "0.087"},
+            {"object": "JET", "type": "ET", "minimum": "0", "maximum": "1023.5", "step": "0.5"},
+            {"object": "PRECISION", "type": "CICADA-CScore", "n_bits": "8"},
+        ],
+        {}
+    )
+
+
+class TestScaleIndex:
+
+    def test_lookup(self):
+        index = ScaleIndex(createScales().scales)
+        assert len(index) == 4
+        assert index.get("MU", "ETA")["maximum"] == "2.45"
+        assert index.get("JET", "ETA") is None
+        assert index.get("PRECISION", "CICADA-CScore")["n_bits"] == "8"
+        assert [scale["type"] for scale in index.byObject("MU")] == ["ET", "ETA"]
+        assert index.byObject("EG") == []
+        assert index.objectTypes() == ["MU", "JET", "PRECISION"]
+        assert "JET" in index
+        assert "EG" not in index
+
+    def test_shared(self):
+        scales = createScales()
+        assert scaleIndex(scales) is scaleIndex(scales)
+        assert scaleIndex(scales) is not scaleIndex(createScales())
+        assert len(scaleIndex(None)) == 0
+
+    def test_menu(self):
+        menu = Menu()
+        assert menu.scaleMeta(Object("MU10", "MU", "10"), "ET") is None
+        menu.scales = createScales()
+        assert menu.scaleIndex is scaleIndex(menu.scales)
+        assert menu.scaleMeta(Object("MU10", "MU", "10"), "ET")["maximum"] == "255.5"
+        assert menu.scaleMeta(Object("EG10", "EG", "10"), "ET") is None
+        restored = pickle.loads(pickle.dumps(menu))
+        assert restored.scaleMeta(Object("JET10", "JET", "10"), "ET")["maximum"] == "1023.5"
@@ -0,0 +1,85 @@
+from tmEditor.core.Algorithm import Cut
+from tmEditor.core.SearchIndex import SearchEntry, SearchIndex, SearchQuery
+from tmEditor.core.SearchIndex import cutEntry, cutSignature
+
+
+def createEntry(index=42):
+    fields = {
+        "cut": ("mu-eta_2p1", "mu-qlty_sngl"),
+        "label": ("physics", "mu"),
+        "name": ("l1_singlemu22",),
+        "object": ("mu22",),
+    }
+    text = "\n".join([str(index), "l1_singlemu22", "mu22[mu-eta_2p1,mu-qlty_sngl]", "physics, mu"])
+    return SearchEntry(text, fields, index)
+
+
+class TestSearchQuery:
+
+    def test_empty(self):
+        query = SearchQuery("  ")
+        assert query.isEmpty()
+        assert query.matches(createEntry())
+
+    def test_terms(self):
+        entry = createEntry()
+        assert SearchQuery("SingleMu").matches(entry)
+        assert SearchQuery("singlemu MU22").matches(entry)
+        assert not SearchQuery("singlemu EG10").matches(entry)
+        assert SearchQuery('"physics, mu"').matches(entry)
+
+    def test_fields(self):
+        entry = createEntry()
+        assert SearchQuery("cut:MU-ETA_2p1").matches(entry)
+        assert SearchQuery("CUT:mu-qlty").matches(entry)
+        assert not SearchQuery("cut:EG-ETA").matches(entry)
+        assert SearchQuery("label:physics").matches(entry)
+        assert not SearchQuery("label:calibration").matches(entry)
+        assert SearchQuery("name:SingleMu object:MU22").matches(entry)
+        assert not SearchQuery("name:physics").matches(entry)
+
+    def test_index(self):
+        assert SearchQuery("index:42").matches(createEntry(42))
+        assert SearchQuery("index:0-100").matches(createEntry(42))
+        assert SearchQuery("index:100-0").matches(createEntry(42))
+        assert not SearchQuery("index:100-200").matches(createEntry(42))
+        assert not SearchQuery("index:0-100").matches(createEntry(None))
+
+    def test_incomplete(self):
+        entry = createEntry()
+        assert SearchQuery("cut:").isEmpty()
+        assert SearchQuery("index:").isEmpty()
+        assert SearchQuery('"physics').matches(entry)
+        # Unknown fields and malformed ranges are plain terms.
+        assert SearchQuery("foo:bar").terms == ["foo:bar"]
+        assert SearchQuery("index:a-b").terms == ["index:a-b"]
+
+
+class TestSearchIndex:
+
+    def test_cut_entry(self):
+        cut = Cut("MU-ETA_2p1", "MU", "ETA", -2.1, 2.1, comment="Barrel")
+        entry = cutEntry(cut)
+        assert entry.fields["cut"] == ("mu-eta_2p1",)
+        assert entry.fields["object"] == ("mu",)
+        assert "barrel" in entry.text
+        assert entry.index is None
+
+    def test_incremental(self):
+        calls = []
+
+        def factory(cut):
+            calls.append(cut.name)
+            return cutEntry(cut)
+
+        cuts = [Cut("MU-ETA_2p1", "MU", "ETA", -2.1, 2.1), Cut("EG-ETA_2p1", "EG", "ETA", -2.1, 2.1)]
+        index = SearchIndex(factory, cutSignature)
+        query = SearchQuery("cut:eta_2p1")
+        assert index.filter(cuts, query) == cuts
+        assert index.filter(cuts, query) == cuts
+        assert calls == ["MU-ETA_2p1", "EG-ETA_2p1"]
+        cuts[0].comment = "barrel"
+        assert index.filter(cuts, SearchQuery("barrel")) == cuts[:1]
+        assert calls == ["MU-ETA_2p1", "EG-ETA_2p1", "MU-ETA_2p1"]
+        index.prune(cuts[1:])
+        assert len(index) == 1
@@ -0,0 +1,45 @@
+import gc
+
+from tmEditor.core.Menu import ScalesSnapshot, ExtSignalsSnapshot
+from tmEditor.core.SetRegistry import SetRegistry, scalesKey, extSignalsKey
+from tmEditor.core.SetRegistry import internScales, internExtSignals
+
+
+def createScales(maximum="255.5"):
+    return ScalesSnapshot(
+        {"name": "Scales_Unittest"},
+        [{"object": "MU", "type": "ET", "minimum": "0", "maximum": maximum, "step": "0.5"}],
+        {"MU-ET": [{"number": "0", "minimum": "0", "maximum": "0.5"}]}
+    )
+
+
+def createExtSignals(channel="1"):
+    return ExtSignalsSnapshot({"name": "ExtSignals_Unittest"}, [{"name": "BPTX_plus", "channel": channel}])
+
+
+class TestSetRegistry:
+
+    def test_keys(self):
+        assert scalesKey(createScales()) == scalesKey(createScales())
+        assert scalesKey(createScales())[0] == "Scales_Unittest"
+        assert scalesKey(createScales()) != scalesKey(createScales("127.5"))
+        assert extSignalsKey(createExtSignals()) == extSignalsKey(createExtSignals())
+        assert extSignalsKey(createExtSignals()) != extSignalsKey(createExtSignals("2"))
+
+    def test_intern(self):
+        scales = internScales(createScales())
+        assert internScales(createScales()) is scales
+        assert internScales(createScales("127.5")) is not scales
+        extSignals = internExtSignals(createExtSignals())
+        assert internExtSignals(createExtSignals()) is extSignals
+        assert internScales(None) is None
+
+    def test_release(self):
+        registry = SetRegistry()
+        scales = createScales()
+        assert registry.intern(scales, scalesKey(scales)) is scales
+        assert len(registry) == 1
+        del scales
+        gc.collect()
+        assert len(registry) == 0
+        assert registry.get(scalesKey(createScales())) is None
@@ -0,0 +1,85 @@
+import os
+import stat
+
+import pytest
+
+from tmEditor.core import XmlEncoder
+from tmEditor.core.Menu import Menu
+from tmEditor.core.XmlEncoder import XmlEncoderQueue, atomicReplace
+
+
+class Tables:
+
+    def __init__(self, content, error=None):
+        self.content = content
+        self.error = error
+
+    def dump(self, filename):
+        with open(filename, "w") as fp:
+            fp.write(self.content)
+        if self.error:
+            raise self.error
+
+
+class TestXmlEncoder:
+
+    def test_atomicReplace(self, tmp_path):
+        source = tmp_path / "source.xml"
+        target = tmp_path / "target.xml"
+        source.write_text("new")
+        target.write_text("old")
+        os.chmod(target, 0o640)
+        atomicReplace(str(source), str(target))
+        assert target.read_text() == "new"
+        assert not source.exists()
+        assert stat.S_IMODE(os.stat(target).st_mode) == 0o640
+
+    def test_atomicReplace_new(self, tmp_path, monkeypatch):
+        source = tmp_path / "source.xml"
+        target = tmp_path / "target.xml"
+        source.write_text("new")
+        os.chmod(source, 0o600)
+        monkeypatch.setattr(os, "umask", lambda mask: pytest.fail("umask must not be changed"))
+        atomicReplace(str(source), str(target))
+        assert target.read_text() == "new"
+        assert stat.S_IMODE(os.stat(target).st_mode) == 0o666 & ~XmlEncoder.ProcessUmask
+
+    def test_replace(self, tmp_path):
+        target = tmp_path / "L1Menu_Unittest.xml"
+        target.write_text("old")
+        queue = XmlEncoderQueue(Menu(), str(target))
+        queue.tables = Tables("new")
+        queue.run_dump_xml()
+        assert target.read_text() == "old"
+        queue.run_verify_dump()
+        queue.run_replace()
+        assert target.read_text() == "new"
+        assert os.listdir(tmp_path) == [target.name]
+
+    def test_replace_symlink(self, tmp_path):
+        target = tmp_path / "menus" / "L1Menu_Unittest.xml"
+        target.parent.mkdir()
+        target.write_text("old")
+        link = tmp_path / "L1Menu_Link.xml"
+        link.symlink_to(target)
+        queue = XmlEncoderQueue(Menu(), str(link))
+        queue.tables = Tables("new")
+        queue.run_dump_xml()
+        assert os.path.dirname(queue.tempfilename) == str(target.parent)
+        queue.run_verify_dump()
+        queue.run_replace()
+        assert link.is_symlink()
+        assert target.read_text() == "new"
+        assert sorted(os.listdir(tmp_path)) == ["L1Menu_Link.xml", "menus"]
+        assert os.listdir(target.parent) == [target.name]
+
+    def test_failed_dump(self, tmp_path):
+        target = tmp_path / "L1Menu_Unittest.xml"
+        target.write_text("old")
+        queue = XmlEncoderQueue(Menu(), str(target))
+        queue.tables = Tables("truncated", RuntimeError("disk full"))
+        with pytest.raises(RuntimeError):
+            queue.run_dump_xml()
+        queue.discard()
+        assert target.read_text() == "old"
+        assert os.listdir(tmp_path) == [target.name]
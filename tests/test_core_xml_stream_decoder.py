@@ -0,0 +1,190 @@
+import pytest
+
+from tmEditor.core import XmlDecoder, XmlEncoder, XmlStreamDecoder
+from tmEditor.core.Algorithm import Algorithm, Cut, Object, External
+from tmEditor.core.Menu import Menu, ScalesSnapshot, ExtSignalsSnapshot
+from tmEditor.core.XmlDecoder import XmlDecoderError
+
+Document = """<?xml version="1.0" encoding="UTF-8"?>
+<utm>
+  <name>L1Menu_Unittest</name>
+  <uuid_menu>00000000-0000-0000-0000-000000000000</uuid_menu>
+  <grammar_version>{version}</grammar_version>
+  <comment>comment</comment>
+  <scale_set>
+    <name>Scales_Unittest</name>
+    <scale>
+      <object>MU</object>
+      <type>ET</type>
+      <minimum>0</minimum>
+      <maximum>1</maximum>
+      <step>0.5</step>
+      <bin><number>0</number><minimum>0</minimum><maximum>0.5</maximum></bin>
+      <bin><number>1</number><minimum>0.5</minimum><maximum>1</maximum></bin>
+    </scale>
+    <scale>
+      <object>MU</object>
+      <type>ETA</type>
+      <minimum>-2.45</minimum>
+      <maximum>2.45</maximum>
+      <step>0.087</step>
+    </scale>
+  </scale_set>
+  <ext_signal_set>
+    <name>ExtSignals_Unittest</name>
+    <ext_signal><name>BPTX_plus</name><system>GT</system><cable>0</cable><channel>1</channel></ext_signal>
+  </ext_signal_set>
+  <algorithm>
+    <name>L1_SingleMu10</name>
+    <expression>MU10[MU-ETA_Q] AND EXT_BPTX_plus</expression>
+    <index>0</index>
+    <comment/>
+    <labels>foo,bar</labels>
+    <cut>
+      <name>MU-ETA_Q</name><object>MU</object><type>ETA</type>
+      <minimum>-1.5</minimum><maximum>1.5</maximum><data/><comment/>
+    </cut>
+    <object_requirement>
+      <name>MU10</name><type>MU</type><comparison_operator>.ge.</comparison_operator>
+      <threshold>10</threshold><bx_offset>+0</bx_offset><comment/>
+    </object_requirement>
+    <external_requirement>
+      <name>EXT_BPTX_plus</name><bx_offset>+0</bx_offset><comment/>
+    </external_requirement>
+  </algorithm>
+  <algorithm>
+    <name>L1_DoubleMu10</name>
+    <expression>comb{{MU10,MU10}}</expression>
+    <index>1</index>
+    <comment/>
+    <object_requirement>
+      <name>MU10</name><type>MU</type><comparison_operator>.ge.</comparison_operator>
+      <threshold>10</threshold><bx_offset>+0</bx_offset><comment/>
+    </object_requirement>
+  </algorithm>
+</utm>
+"""
+
+
+def createMenu():
+    menu = Menu()
+    menu.menu.name = "L1Menu_Unittest"
+    menu.scales = ScalesSnapshot(
+        {"name": "Scales_Unittest"},
+        [
+            {"object": "MU", "type": "ET", "minimum": "0", "maximum": "1", "step": "0.5", "n_bits": "1"},
+            {"object": "MU", "type": "ETA", "minimum": "-2.45", "maximum": "2.45", "step": "0.087", "n_bits": "6"},
+        ],
+        {"MU-ET": [{"number": "0", "minimum": "0", "maximum": "0.5"}, {"number": "1", "minimum": "0.5", "maximum": "1"}]}
+    )
+    menu.extSignals = ExtSignalsSnapshot({"name": "ExtSignals_Unittest"}, [{"name": "BPTX_plus", "system": "GT", "cable": "0", "channel": "1"}])
+    menu.addAlgorithm(Algorithm(0, "L1_SingleMu10", "MU10[MU-ETA_Q] AND EXT_BPTX_plus", labels=["foo"]))
+    menu.addAlgorithm(Algorithm(1, "L1_DoubleMu10", "comb{MU10,MU10}"))
+    menu.addCut(Cut("MU-ETA_Q", "MU", "ETA", -1.5, 1.5))
+    menu.addObject(Object("MU10", "MU", "10"))
+    menu.addExternal(External("EXT_BPTX_plus"))
+    return menu
+
+
+def contents(menu):
+    return (
+        sorted((a.index, a.name, a.expression, a.comment, tuple(a.labels)) for a in menu.algorithms),
+        sorted((c.name, c.object, c.type, float(c.minimum), float(c.maximum), c.data) for c in menu.cuts),
+        sorted((o.name, o.type, o.decodeThreshold(), o.comparison_operator, o.bx_offset) for o in menu.objects),
+        sorted((e.name, e.bx_offset) for e in menu.externals),
+    )
+
+
+def tables(menu):
+    snapshot = menu.snapshot()
+    return snapshot.scales, [dict(signal) for signal in menu.extSignals.extSignals]
+
+
+@pytest.fixture
+def filename(tmp_path):
+    path = tmp_path / "L1Menu_Unittest.xml"
+    path.write_text(Document.format(version="0.13"))
+    return str(path)
+
+
+class TestXmlStreamDecoder:
+
+    def test_load(self, filename):
+        menu = XmlStreamDecoder.load(filename)
+        assert menu.menu.name == "L1Menu_Unittest"
+        assert menu.menu.grammar_version == "0.13"
+        assert menu.menu.comment == "comment"
+        assert [algorithm.name for algorithm in menu.algorithms] == ["L1_SingleMu10", "L1_DoubleMu10"]
+        assert menu.algorithms[0].labels == ["bar", "foo"]
+        assert [cut.name for cut in menu.cuts] == ["MU-ETA_Q"]
+        assert menu.cuts[0].minimum == -1.5
+        assert [object_.name for object_ in menu.objects] == ["MU10"]
+        assert [external.name for external in menu.externals] == ["EXT_BPTX_plus"]
+        assert menu.scales.scaleSet == {"name": "Scales_Unittest"}
+        assert [(scale["object"], scale["type"]) for scale in menu.scales.scales] == [("MU", "ET"), ("MU", "ETA")]
+        assert list(menu.scaleBins(menu.objects[0], "ET").numbers) == [0, 1]
+        assert "MU-ETA" not in menu.scales.bins
+        assert menu.extSignals.extSignals[0]["channel"] == "1"
+
+    def test_version(self, tmp_path):
+        path = tmp_path / "L1Menu_Unittest.xml"
+        path.write_text(Document.format(version="99.0"))
+        with pytest.raises(XmlDecoderError, match="Unsupported grammar version"):
+            XmlStreamDecoder.load(str(path))
+
+    def test_malformed(self, tmp_path):
+        path = tmp_path / "L1Menu_Unittest.xml"
+        path.write_text(Document.format(version="0.13")[:-32])
+        with pytest.raises(XmlDecoderError):
+            XmlStreamDecoder.load(str(path))
+
+    def test_unknown_requirement(self, tmp_path):
+        path = tmp_path / "L1Menu_Unittest.xml"
+        path.write_text(Document.format(version="0.13").replace("external_requirement>", "signal_requirement>"))
+        with pytest.raises(XmlDecoderError, match="Unknown element <signal_requirement> of algorithm 'L1_SingleMu10'"):
+            XmlStreamDecoder.load(str(path))
+
+    def test_backend(self, filename, monkeypatch):
+        assert type(XmlDecoder.createQueue(filename, backend="stream")) is XmlStreamDecoder.XmlStreamDecoderQueue
+        monkeypatch.setenv("TM_EDITOR_XML_DECODER", "stream")
+        assert type(XmlDecoder.createQueue(filename)) is XmlStreamDecoder.XmlStreamDecoderQueue
+        with pytest.raises(ValueError):
+            XmlDecoder.createQueue(filename, backend="foo")
+
+    def test_roundtrip(self, tmp_path):
+        filename = str(tmp_path / "L1Menu_Unittest.xml")
+        XmlEncoder.dump(createMenu(), filename, backend="tmtable")
+        reference = XmlDecoder.load(filename, backend="tmtable")
+        menu = XmlDecoder.load(filename, backend="stream")
+        assert menu.menu.__dict__ == reference.menu.__dict__
+        assert contents(menu) == contents(reference)
+        assert tables(menu) == tables(reference)
+
+    def test_menu2xml(self, tmp_path):
+        """Decode output of tmTable.menu2xml using both backends."""
+        filename = str(tmp_path / "L1Menu_Unittest.xml")
+        menu = createMenu()
+        menu.menu.comment = "Special characters <&>\""
+        menu.algorithms[0].comment = "a & b"
+        menu.algorithms[1].labels = ["physics", "mu"]
+        menu.algorithms[1].expression = "comb{MU10,MU10} AND EXT_BPTX_plus+1"
+        menu.cuts[0].comment = "<cut>"
+        menu.addExternal(External("EXT_BPTX_plus+1", 1))
+        XmlEncoder.dump(menu, filename, backend="tmtable")
+        reference = XmlDecoder.load(filename, backend="tmtable")
+        decoded = XmlDecoder.load(filename, backend="stream")
+        assert decoded.menu.__dict__ == reference.menu.__dict__
+        assert contents(decoded) == contents(reference)
+        assert [cut.comment for cut in decoded.cuts] == [cut.comment for cut in reference.cuts]
+        assert tables(decoded) == tables(reference)
+        assert decoded.scales == reference.scales
+        assert decoded.extSignals == reference.extSignals
+
+    def test_roundtrip_stream(self, tmp_path):
+        filename = str(tmp_path / "L1Menu_Unittest.xml")
+        XmlEncoder.dump(createMenu(), filename, backend="tmtable")
+        menu = XmlStreamDecoder.load(filename)
+        XmlEncoder.dump(menu, filename, backend="tmtable")
+        reference = XmlDecoder.load(filename, backend="tmtable")
+        assert contents(menu) == contents(reference)
+        assert tables(menu) == tables(reference)
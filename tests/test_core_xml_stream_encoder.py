@@ -0,0 +1,83 @@
+import pytest
+
+from tmEditor.core import XmlDecoder, XmlEncoder, XmlStreamDecoder, XmlStreamEncoder
+from tmEditor.core.Algorithm import Algorithm, Cut, Object, External
+from tmEditor.core.Menu import Menu, ScalesSnapshot, ExtSignalsSnapshot
+from tmEditor.core.XmlEncoder import XmlEncoderError
+
+
+def createMenu(cuts=True):
+    menu = Menu()
+    menu.menu.name = "L1Menu_Unittest"
+    menu.menu.comment = "Special characters <&>\""
+    menu.scales = ScalesSnapshot(
+        {"name": "Scales_Unittest"},
+        [
+            {"object": "MU", "type": "ET", "minimum": "0", "maximum": "255.5", "step": "0.5", "n_bits": "9"},
+            {"object": "MU", "type": "ETA", "minimum": "-2.45", "maximum": "2.45", "step": "0.087", "n_bits": "6"},
+        ],
+        {"MU-ET": [{"number": format(i), "minimum": format(i * .5), "maximum": format((i + 1) * .5)} for i in range(512)]}
+    )
+    menu.extSignals = ExtSignalsSnapshot({"name": "ExtSignals_Unittest"}, [{"name": "BPTX_plus", "system": "GT", "cable": "0", "channel": "1"}])
+    if cuts:
+        menu.addAlgorithm(Algorithm(0, "L1_SingleMu10_er", "MU10[MU-ETA_Q] AND EXT_BPTX_plus", labels=["foo"]))
+        menu.addCut(Cut("MU-ETA_Q", "MU", "ETA", -1.5, 1.5, comment="<cut>"))
+        menu.addExternal(External("EXT_BPTX_plus"))
+    menu.addAlgorithm(Algorithm(1, "L1_DoubleMu10", "comb{MU10,MU10} AND EXT_BPTX_plus+1", comment="a & b"))
+    menu.addObject(Object("MU10", "MU", "10"))
+    menu.addExternal(External("EXT_BPTX_plus+1", 1))
+    return menu
+
+
+def contents(menu):
+    return (
+        menu.menu.name,
+        menu.menu.comment,
+        sorted((a.index, a.name, a.expression, a.comment, tuple(a.labels)) for a in menu.algorithms),
+        sorted((c.name, c.object, c.type, float(c.minimum), float(c.maximum), c.data, c.comment) for c in menu.cuts),
+        sorted((o.name, o.type, o.decodeThreshold(), o.comparison_operator, o.bx_offset) for o in menu.objects),
+        sorted((e.name, e.bx_offset) for e in menu.externals),
+    )
+
+
+class TestXmlStreamEncoder:
+
+    def test_roundtrip_stream(self, tmp_path):
+        filename = str(tmp_path / "L1Menu_Unittest.xml")
+        menu = createMenu(cuts=False)
+        XmlStreamEncoder.dump(menu, filename, validate=False)
+        decoded = XmlStreamDecoder.load(filename)
+        assert contents(decoded) == contents(menu)
+        assert decoded.menu.uuid_menu == menu.menu.uuid_menu
+        assert decoded.scales == menu.scales
+        assert decoded.extSignals == menu.extSignals
+        assert [path.name for path in tmp_path.iterdir()] == ["L1Menu_Unittest.xml"]
+
+    def test_roundtrip(self, tmp_path):
+        filename = str(tmp_path / "L1Menu_Unittest.xml")
+        menu = createMenu()
+        XmlStreamEncoder.dump(menu, filename)
+        assert contents(XmlDecoder.load(filename, backend="tmtable")) == contents(menu)
+
+    def test_equivalence(self, tmp_path):
+        reference = str(tmp_path / "L1Menu_Reference.xml")
+        filename = str(tmp_path / "L1Menu_Unittest.xml")
+        menu = createMenu()
+        XmlEncoder.dump(menu, reference, backend="tmtable")
+        XmlEncoder.dump(menu, filename, backend="stream")
+        assert contents(XmlDecoder.load(filename)) == contents(XmlDecoder.load(reference))
+
+    def test_missing_requirement(self, tmp_path):
+        filename = tmp_path / "L1Menu_Unittest.xml"
+        menu = createMenu(cuts=False)
+        menu.addAlgorithm(Algorithm(2, "L1_SingleMu20", "MU20"))
+        with pytest.raises(XmlEncoderError, match="missing object requirement: MU20"):
+            XmlStreamEncoder.dump(menu, str(filename))
+        assert not list(tmp_path.iterdir())
+
+    def test_backend(self, tmp_path, monkeypatch):
+        filename = str(tmp_path / "L1Menu_Unittest.xml")
+        monkeypatch.setenv("TM_EDITOR_XML_ENCODER", "stream")
+        assert type(XmlEncoder.createQueue(Menu(), filename)) is XmlStreamEncoder.XmlStreamEncoderQueue
+        with pytest.raises(ValueError):
+            XmlEncoder.createQueue(Menu(), filename, backend="foo")
@@ -1,12 +1,16 @@
 import logging
+import pickle
 
+import pytest
 import tmGrammar
 import tmTable
 
 from tmGrammar import isGate as isOperator
 from tmGrammar import isObject, isFunction
 from tmEditor.core import XmlDecoder, XmlEncoder
-from tmEditor.core.Menu import Menu, GrammarVersion
+from tmEditor.core.Menu import Menu, GrammarVersion, ParallelValidationThreshold, ScalesSnapshot
+from tmEditor.core.AlgorithmSyntaxValidator import AlgorithmSyntaxValidator, AlgorithmSyntaxError, ExpressionTree
+from tmEditor.core.ParallelValidator import ParallelValidator
 from tmEditor.core.Algorithm import Object, External, Cut, Algorithm
 from tmEditor.core.Algorithm import toObject, toExternal
 from tmEditor.core.Algorithm import functionObjects, functionCuts, functionObjectsCuts
@@ -15,6 +19,30 @@ from tmEditor.core.Algorithm import objectCuts
 UTM_VERSION: str = "0.13.0"
 
 
+def createValidationMenu(count, invalid=None):
+    """Returns menu of *count* valid algorithms, algorithm at position
+    *invalid* uses a threshold not matching a scale bin."""
+    menu = Menu()
+    menu.menu.name = "L1Menu_Unittest"
+    menu.scales = ScalesSnapshot(
+        {"name": "Scales_Unittest"},
+        [
+            {"object": "MU", "type": "ET", "minimum": "0", "maximum": "255.5", "step": "0.5", "n_bits": "9"},
+            {"object": "MU", "type": "ETA", "minimum": "-2.45", "maximum": "2.45", "step": "0.087", "n_bits": "6"},
+        ],
+        {"MU-ET": [{"number": format(i), "minimum": format(i * .5), "maximum": format((i + 1) * .5)} for i in range(512)]}
+    )
+    for index in range(count):
+        threshold = index % 100 + 1
+        expression = f"comb{{MU{threshold},MU{threshold}}}" if index % 2 else f"MU{threshold}"
+        if index == invalid:
+            expression = "MU10p2"
+        algorithm = Algorithm(index, f"L1_Unittest_{index}", expression)
+        menu.addAlgorithm(algorithm)
+        menu.extendReferenced(algorithm)
+    return menu
+
+
 class TestMenu:
 
     def test_isOperator(self):
@@ -122,6 +150,174 @@ class TestMenu:
         logging.info("cuts: %s", menu.cuts)
         logging.info("objects: %s", menu.objects)
 
+    def test_lookup_indices(self):
+        menu = Menu()
+        algorithm = Algorithm(42, "L1_SingleMu10", "MU10")
+        menu.addAlgorithm(algorithm)
+        menu.addCut(Cut("MU-ETA_2p1", "MU", "ETA", -2.1, +2.1))
+        assert menu.algorithmByName("L1_SingleMu10") is algorithm
+        assert menu.algorithmByIndex(42) is algorithm
+        assert menu.algorithmByIndex("42") is algorithm
+        # Renames and index moves
+        algorithm.name = "L1_SingleMu10_er2p1"
+        algorithm.index = 7
+        assert menu.algorithmByName("L1_SingleMu10") is None
+        assert menu.algorithmByName("L1_SingleMu10_er2p1") is algorithm
+        assert menu.algorithmByIndex(42) is None
+        assert menu.algorithmByIndex(7) is algorithm
+        cut = menu.cutByName("MU-ETA_2p1")
+        cut.name = "MU-ETA_2p0"
+        assert menu.cutByName("MU-ETA_2p1") is None
+        assert menu.cutByName("MU-ETA_2p0") is cut
+        # Direct list manipulations (eg. by table models)
+        menu.algorithms.remove(algorithm)
+        assert menu.algorithmByName("L1_SingleMu10_er2p1") is None
+        assert menu.algorithmByIndex(7) is None
+        menu.cuts.append(Cut("MU-ETA_1p5", "MU", "ETA", -1.5, +1.5))
+        assert menu.cutByName("MU-ETA_1p5").name == "MU-ETA_1p5"
+
+    def test_reference_graph(self):
+        menu = Menu()
+        menu.addCut(Cut("MU-ETA_2p1", "MU", "ETA", -2.1, +2.1))
+        menu.addCut(Cut("MU-ETA_1p5", "MU", "ETA", -1.5, +1.5))
+        algorithm = Algorithm(0, "L1_DoubleMu_er2p1", "comb{MU20[MU-ETA_2p1],MU10[MU-ETA_2p1]}")
+        menu.addAlgorithm(algorithm)
+        menu.extendReferenced(algorithm)
+        assert menu.algorithmsByCut("MU-ETA_2p1") == [algorithm]
+        assert menu.algorithmsByObject(menu.objectByName("MU20")) == [algorithm]
+        assert menu.isCutOrphaned("MU-ETA_1p5")
+        assert menu.orphanedCuts() == ["MU-ETA_1p5"]
+        assert menu.orphanedObjects() == []
+        # Editing expression
+        algorithm.expression = "MU20[MU-ETA_1p5]"
+        assert menu.orphanedCuts() == ["MU-ETA_2p1"]
+        assert menu.orphanedObjects() == ["MU10"]
+        # Removing algorithm
+        menu.algorithms.remove(algorithm)
+        assert menu.algorithmsByCut("MU-ETA_1p5") == []
+        assert menu.orphanedCuts() == ["MU-ETA_2p1", "MU-ETA_1p5"]
+
+    def test_validate_incremental(self, monkeypatch):
+        validated = []
+        monkeypatch.setattr(AlgorithmSyntaxValidator, "validate", lambda self, expression: validated.append(expression))
+        menu = Menu()
+        menu.menu.name = "L1Menu_Unittest"
+        menu.addCut(Cut("MU-ETA_2p1", "MU", "ETA", -2.1, +2.1))
+        for index, threshold in enumerate((10, 20, 30)):
+            algorithm = Algorithm(index, f"L1_SingleMu{threshold}_er2p1", f"MU{threshold}[MU-ETA_2p1]")
+            menu.addAlgorithm(algorithm)
+            menu.extendReferenced(algorithm)
+        menu.addAlgorithm(Algorithm(3, "L1_SingleMu40", "MU40"))
+        menu.extendReferenced(menu.algorithmByIndex(3))
+        menu.validate()
+        assert len(validated) == 4
+        # Nothing changed
+        menu.validate()
+        assert len(validated) == 4
+        # Changed expression
+        menu.algorithmByIndex(0).expression = "MU12[MU-ETA_2p1]"
+        menu.extendReferenced(menu.algorithmByIndex(0))
+        menu.validate()
+        assert validated[4:] == ["MU12[MU-ETA_2p1]"]
+        # Edited cut revalidates all algorithms referencing it
+        menu.cutByName("MU-ETA_2p1").minimum = -2.0
+        menu.validate()
+        assert len(validated) == 8
+
+    def test_snapshot(self):
+        menu = Menu()
+        menu.addCut(Cut("MU-ETA_2p1", "MU", "ETA", -2.1, +2.1))
+        snapshot = pickle.loads(pickle.dumps(menu.snapshot()))
+        assert snapshot.cutByName("MU-ETA_2p1") == menu.cutByName("MU-ETA_2p1")
+        # Renaming a cut after taking a snapshot updates the menu's index
+        menu.snapshot()
+        cut = menu.cutByName("MU-ETA_2p1")
+        cut.name = "MU-ETA_2p0"
+        assert menu.cutByName("MU-ETA_2p0") is cut
+        assert menu.cutByName("MU-ETA_2p1") is None
+        error = pickle.loads(pickle.dumps(AlgorithmSyntaxError("Invalid", "MU10")))
+        assert (format(error), error.token) == ("Invalid", "MU10")
+
+    def test_observers(self):
+        menu = Menu()
+        events = []
+
+        class Observer:
+
+            def itemsAboutToBeInserted(self, position, count):
+                events.append(("about", position, count, len(menu.cuts), menu.cutByName("MU-ETA_2p1")))
+
+            def itemsInserted(self, position, count):
+                events.append(("inserted", position, count, len(menu.cuts), menu.cutByName("MU-ETA_2p1")))
+
+        observer = Observer()
+        menu.cuts.addObserver(observer)
+        cut = Cut("MU-ETA_2p1", "MU", "ETA", -2.1, +2.1)
+        menu.addCut(cut)
+        assert events == [("about", 0, 1, 0, None), ("inserted", 0, 1, 1, cut)]
+        menu.cuts.insert(-5, Cut("MU-ETA_2p0", "MU", "ETA", -2.0, +2.0))
+        assert events[2:] == [("about", 0, 1, 1, cut), ("inserted", 0, 1, 2, cut)]
+        # Observers are referenced weakly
+        del observer
+        menu.addCut(Cut("MU-ETA_1p0", "MU", "ETA", -1.0, +1.0))
+        assert len(events) == 4
+
+    def test_validate_parallel(self, monkeypatch):
+        calls = []
+        validate = ParallelValidator.validate
+        monkeypatch.setattr(ParallelValidator, "validate", lambda self, algorithms: calls.append(len(algorithms)) or validate(self, algorithms))
+        count = ParallelValidationThreshold + 8
+        # Valid algorithms
+        serial, parallel = createValidationMenu(count), createValidationMenu(count)
+        serial.validate()
+        assert calls == []
+        parallel.validate(workers=2)
+        assert calls == [count]
+        def results(menu):
+            syntaxValidator = AlgorithmSyntaxValidator(menu)
+            results = []
+            for algorithm in menu.algorithms:
+                try:
+                    syntaxValidator.validate(algorithm.expression)
+                    results.append((algorithm.index, algorithm.name, None))
+                except Exception as exc:
+                    results.append((algorithm.index, algorithm.name, (type(exc), format(exc))))
+            return results
+        expected = results(serial)
+        assert all(error is None for index, name, error in expected)
+        actual = [(result.index, result.name, result.error) for result in ParallelValidator(parallel, workers=2).validate(parallel.algorithms)]
+        assert actual == expected
+        # Invalid algorithm raises the same error
+        errors = []
+        for workers in (None, 2):
+            menu = createValidationMenu(count, invalid=count // 2)
+            with pytest.raises(AlgorithmSyntaxError) as exc_info:
+                menu.validate(workers=workers)
+            errors.append((format(exc_info.value), exc_info.value.token))
+        assert errors[0] == errors[1]
+
+    def test_expression_tree(self, monkeypatch):
+        token = "comb{MU10[MU-ETA_2p1],MU20}"
+        names = [object.name for object in functionObjects(token)]
+        parsed = []
+        Function_parser = tmGrammar.Function_parser
+        monkeypatch.setattr(tmGrammar, "Function_parser", lambda token, item: parsed.append(token) or Function_parser(token, item))
+        menu = Menu()
+        menu.addCut(Cut("MU-ETA_2p1", "MU", "ETA", -2.1, +2.1))
+        tree = ExpressionTree((token, "MU10[MU-ETA_2p1]", "AND"), menu)
+        assert [node.token for node in tree.functions] == [token]
+        assert [node.token for node in tree.objects] == ["MU10[MU-ETA_2p1]"]
+        function = tree.functions[0]
+        assert function.name == "comb"
+        assert [object.name for object in function.objects] == names
+        assert function.objectCuts == [["MU-ETA_2p1"], []]
+        assert function.cuts == []
+        # Object requirements are shared between nodes
+        assert function.objectNodes[0] is tree.objects[0]
+        assert tree.objects[0].cuts == ["MU-ETA_2p1"]
+        assert tree.cut("MU-ETA_2p1") is menu.cutByName("MU-ETA_2p1")
+        assert parsed.count(token) == 1
+
     def test_version(self):
         assert tmGrammar.__version__ == UTM_VERSION
         assert tmTable.__version__ == UTM_VERSION
@@ -0,0 +1,39 @@
+import json
+import subprocess
+import sys
+
+from tmEditor import validate
+
+from .test_core_xml_stream_decoder import Document
+
+
+class TestValidate:
+
+    def test_no_qt(self):
+        code = "import sys, tmEditor.validate, tmEditor.core.XmlEncoder, tmEditor.core.MultiDecoder; sys.exit('PyQt5' in sys.modules)"
+        assert subprocess.run([sys.executable, "-c", code]).returncode == 0
+
+    def test_error(self, tmp_path):
+        filename = str(tmp_path / "missing.xml")
+        result = validate.validateFile(filename)
+        assert result["filename"] == filename
+        assert not result["valid"]
+        assert result["error"]["message"]
+        assert result["timings"]["total"] >= 0
+
+    def test_main(self, tmp_path):
+        filenames = [str(tmp_path / f"missing_{index}.xml") for index in range(3)]
+        output = tmp_path / "report.json"
+        assert validate.main(["-j", "2", "-o", str(output)] + filenames) == 1
+        report = json.loads(output.read_text())
+        assert [result["filename"] for result in report["files"]] == filenames
+        assert report["valid"] == 0
+        assert report["invalid"] == 3
+
+    def test_valid(self, tmp_path):
+        path = tmp_path / "L1Menu_Unittest.xml"
+        path.write_text(Document.format(version="0.13"))
+        result = validate.validateFile(str(path), backend="stream")
+        assert result["error"] is None
+        assert result["valid"]
+        assert result["algorithms"] == 2
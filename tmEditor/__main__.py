@@ -6,16 +6,14 @@ import signal
 import sys
 import os
 
-import PyQt5
-from PyQt5 import QtCore, QtWidgets
-
 from . import __version__
-from .application import Application
 
 
 def parse_args() -> argparse.Namespace:
     """Command line argument parser."""
-    parser = argparse.ArgumentParser()
+    parser = argparse.ArgumentParser(
+        epilog="run `%(prog)s validate --help` for validating files without graphical user interface",
+    )
     parser.add_argument(
         "filenames",
         metavar="<file>",
@@ -47,9 +45,18 @@ def parse_args() -> argparse.Namespace:
 
 def main() -> None:
     """Main application routine."""
+    # Headless batch validation, must not import PyQt5.
+    if sys.argv[1:2] == ["validate"]:
+        from .validate import main as validate
+        sys.exit(validate(sys.argv[2:]))
+
     # Parse arguments.
     args = parse_args()
 
+    import PyQt5
+    from PyQt5 import QtCore
+    from .application import Application
+
     # Setup console logging and debug level.
     level = logging.DEBUG if args.verbose else logging.INFO
     logging.basicConfig(format="%(levelname)s: %(message)s", level=level)
@@ -63,9 +70,8 @@ def main() -> None:
 
     # Load documents from command line (optional).
     def loadDocuments():
-        for filename in args.filenames:
-            logging.debug("loading file %s", filename)
-            app.loadDocument(filename)
+        logging.debug("loading files %s", ", ".join(args.filenames))
+        app.loadDocuments(args.filenames)
     QtCore.QTimer().singleShot(100, loadDocuments)  # type: ignore
 
     app.eventLoop()
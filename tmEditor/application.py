@@ -3,6 +3,7 @@
 import logging
 import signal
 import sys
+from typing import List
 
 from PyQt5 import QtCore, QtWidgets
 
@@ -43,6 +44,9 @@ class Application:
     def loadDocument(self, filename: str) -> None:
         self.window.loadDocument(filename)
 
+    def loadDocuments(self, filenames: List[str]) -> None:
+        self.window.loadDocuments(filenames)
+
     def loadSettings(self) -> None:
         settings = QtCore.QSettings()
         # Window size
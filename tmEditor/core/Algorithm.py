@@ -1,8 +1,11 @@
 """Algorithm container."""
 
 import logging
+import itertools
 import math
 import re
+import threading
+from collections import OrderedDict, namedtuple
 from typing import List, Optional, Tuple
 
 import tmGrammar
@@ -10,10 +13,15 @@ import tmGrammar
 from .types import ObjectTypes, SignalTypes, ExternalObjectTypes, FunctionCutTypes
 from .Settings import MaxAlgorithms
 from .AlgorithmHelper import decode_threshold, encode_threshold
+from .grammar import synchronized
 
 __all__ = ["Algorithm"]
 
 RangeType = Tuple[float, float]
+TokensType = Tuple[str, ...]
+
+TokenCacheSize: int = 4096
+"""Maximum number of distinct expressions held by the RPN token cache."""
 
 RegExObject = re.compile(r"({0})(?:\.(?:ge|eq)\.)?(\d+(?:p\d+)?)(?:[\+\-]\d+)?(?:\[[^\]]+\])?".format("|".join(ObjectTypes)))
 """Precompiled regular expression for matching object requirements."""
@@ -69,11 +77,17 @@ def isFunction(token: str) -> bool:
     return tmGrammar.isFunction(token)
 
 
+@synchronized
 def toObject(token: str) -> "Object":
     """Returns an object's dict."""
     o = tmGrammar.Object_Item()
     if not tmGrammar.Object_parser(token, o):
         raise ValueError(token)
+    return fromObjectItem(o)
+
+
+def fromObjectItem(o) -> "Object":
+    """Returns an object's dict from a parsed object item."""
     return Object(
         name=o.getObjectName(),
         threshold=o.threshold,
@@ -94,6 +108,7 @@ def toExternal(token: str) -> "External":
     )
 
 
+@synchronized
 def functionObjects(token: str) -> List["Object"]:
     """Returns list of object dicts assigned to a function."""
     objects = []
@@ -106,6 +121,7 @@ def functionObjects(token: str) -> List["Object"]:
     return objects
 
 
+@synchronized
 def functionCuts(token: str) -> List:
     """Returns list of cut names assigned to a function."""
     cuts: List = []
@@ -117,6 +133,7 @@ def functionCuts(token: str) -> List:
     return cuts
 
 
+@synchronized
 def functionObjectsCuts(token: str) -> List[List[str]]:
     """Returns lists of cuts assigned to function objects. Index ist object number.
     >>> functionObjectsCuts("comb{MU0[MU-QLTY_HQ,MU-ETA_2p1],MU0[MU-QLTY_OPEN]}")
@@ -132,6 +149,7 @@ def functionObjectsCuts(token: str) -> List[List[str]]:
     return cuts
 
 
+@synchronized
 def objectCuts(token: str) -> List[str]:
     """Returns list of cut names assigned to an object."""
     o = tmGrammar.Object_Item()
@@ -140,6 +158,121 @@ def objectCuts(token: str) -> List[str]:
     return list(o.cuts)
 
 
+class TokenCache:
+    """Process wide LRU cache mapping algorithm expressions to RPN tokens.
+
+    >>> cache = TokenCache(maxsize=1024)
+    >>> cache.tokens("MU10 AND JET20")
+    ('MU10', 'JET20', 'AND')
+    """
+
+    def __init__(self, maxsize: int = TokenCacheSize) -> None:
+        self.maxsize: int = maxsize
+        self.hits: int = 0
+        self.misses: int = 0
+        self.__entries: "OrderedDict[str, TokensType]" = OrderedDict()
+        self.__lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def __contains__(self, expression: str) -> bool:
+        return expression in self.__entries
+
+    def tokens(self, expression: str) -> TokensType:
+        """Returns tuple of RPN tokens for *expression*, parses the expression
+        only if not already cached. Raises a ValueError if parsing fails.
+        """
+        with self.__lock:
+            tokens = self.__entries.get(expression)
+            if tokens is not None:
+                self.__entries.move_to_end(expression)
+                self.hits += 1
+                return tokens
+        # Parse without holding the cache lock, parsing acquires the grammar
+        # lock which might be held by a caller waiting for the cache.
+        tokens = parseTokens(expression)
+        with self.__lock:
+            self.misses += 1
+            self.__entries[expression] = tokens
+            while len(self.__entries) > self.maxsize:
+                self.__entries.popitem(last=False)
+            return tokens
+
+    def invalidate(self, expression: str) -> None:
+        """Remove cached entry for *expression* (if any)."""
+        with self.__lock:
+            self.__entries.pop(expression, None)
+
+    def clear(self) -> None:
+        """Remove all cached entries and reset statistics."""
+        with self.__lock:
+            self.__entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+@synchronized
+def parseTokens(expression: str) -> TokensType:
+    """Returns tuple of RPN tokens parsed by tmGrammar (bypassing the token cache)."""
+    tmGrammar.Algorithm_Logic.clear()
+    if not tmGrammar.Algorithm_parser(expression):
+        raise ValueError("Failed to parse algorithm expression")
+    return tuple(tmGrammar.Algorithm_Logic.getTokens())
+
+
+tokenCache = TokenCache()
+"""Shared RPN token cache used by all algorithms."""
+
+cutVersions = itertools.count(1)
+"""Process wide cut version counter, every cut modification draws a new version."""
+
+AlgorithmReferences = namedtuple("AlgorithmReferences", "objects, cuts, externals, functions")
+"""Names of objects, cuts and external signals referenced by an algorithm
+expression (ordered by first occurrence) and per function references.
+"""
+
+FunctionReferences = namedtuple("FunctionReferences", "token, objects, cuts, objectCuts")
+"""Object names, function cut names and per object cut names of a function token."""
+
+
+@synchronized
+def collectReferences(tokens) -> AlgorithmReferences:
+    """Returns references collected from a sequence of RPN tokens."""
+    objects: dict = {}
+    cuts: dict = {}
+    externals: dict = {}
+    functions: List[FunctionReferences] = []
+    for token in tokens:
+        if isObject(token):
+            objects.setdefault(toObject(token).name)  # Cast to object required to fetch complete name.
+            for cut in objectCuts(token):
+                cuts.setdefault(cut)
+        elif isFunction(token):
+            function = FunctionReferences(
+                token=token,
+                objects=tuple(object.name for object in functionObjects(token)),
+                cuts=tuple(functionCuts(token)),
+                objectCuts=tuple(tuple(names) for names in functionObjectsCuts(token))
+            )
+            for name in function.objects:
+                objects.setdefault(name)
+            for cut in function.cuts:
+                cuts.setdefault(cut)
+            for names in function.objectCuts:
+                for cut in names:
+                    cuts.setdefault(cut)
+            functions.append(function)
+        elif isExternal(token):
+            externals.setdefault(toExternal(token).name)
+    return AlgorithmReferences(
+        objects=tuple(objects),
+        cuts=tuple(cuts),
+        externals=tuple(externals),
+        functions=tuple(functions)
+    )
+
+
 def calculateDRRange() -> RangeType:
     """Calculate valid DR range. This is function is currently a prototype and
     should fetch the actual limits from the menus scales in future.
@@ -179,7 +312,35 @@ def calculateTwoBodyPtRange() -> RangeType:
     return (minimum, maximum)
 
 
-class Algorithm:
+class MenuItem:
+    """Base class for menu items notifying their owning menu on changes of
+    attributes the menu uses for indexing. The owner is assigned by the menu
+    and is neither copied nor pickled.
+
+    Every assignment of a public attribute increments the item's `revision`,
+    eg. to detect in place edits invalidating cached display values.
+    """
+
+    _owner = None
+    revision = 0
+
+    def __setattr__(self, name: str, value) -> None:
+        super().__setattr__(name, value)
+        if not name.startswith("_") and name != "revision":
+            super().__setattr__("revision", self.revision + 1)
+
+    def _notify(self, attr: str, previous) -> None:
+        owner = self._owner
+        if owner is not None:
+            owner.itemChanged(self, attr, previous)
+
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        state.pop("_owner", None)
+        return state
+
+
+class Algorithm(MenuItem):
     """Algorithm container class."""
 
     RegExAlgorithmName = re.compile(r"^(L1_)([a-zA-Z\d_]+)$")
@@ -188,6 +349,8 @@ class Algorithm:
                  labels: Optional[List[str]] = None) -> None:
         self.index: int = index
         self.name: str = name
+        self._tokens: Optional[TokensType] = None
+        self._references: Optional[AlgorithmReferences] = None
         self.expression: str = expression
         self.comment: str = comment or ""
         self.labels: list = labels or []
@@ -201,54 +364,67 @@ class Algorithm:
         """Custom sorting by index, name and expression."""
         return (self.index, self.name, self.expression) < (item.index, item.name, item.expression)
 
-    def tokens(self) -> List[str]:
-        """Returns list of RPN tokens of algorithm expression. Note that paranthesis is not included in RPN."""
-        tmGrammar.Algorithm_Logic.clear()
-        if not tmGrammar.Algorithm_parser(self.expression):
-            raise ValueError("Failed to parse algorithm expression")
-        return list(tmGrammar.Algorithm_Logic.getTokens())
+    @property
+    def index(self) -> int:
+        return self._index
+
+    @index.setter
+    def index(self, index: int) -> None:
+        previous = self.__dict__.get("_index")
+        self._index = index
+        self._notify("index", previous)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, name: str) -> None:
+        previous = self.__dict__.get("_name")
+        self._name = name
+        self._notify("name", previous)
+
+    @property
+    def expression(self) -> str:
+        return self._expression
+
+    @expression.setter
+    def expression(self, expression: str) -> None:
+        """Assigning an expression invalidates previously fetched tokens and references."""
+        previous = self.__dict__.get("_expression")
+        self._expression = expression
+        self._tokens = None
+        self._references = None
+        self._notify("expression", previous)
+
+    def tokens(self) -> TokensType:
+        """Returns tuple of RPN tokens of algorithm expression. Note that
+        paranthesis is not included in RPN. Tokens are fetched from the shared
+        token cache, so every distinct expression is parsed only once.
+        """
+        if self._tokens is None:
+            self._tokens = tokenCache.tokens(self.expression)
+        return self._tokens
+
+    def references(self) -> AlgorithmReferences:
+        """Returns references of the algorithm's expression, collected once
+        after every assignment of the expression.
+        """
+        if self._references is None:
+            self._references = collectReferences(self.tokens())
+        return self._references
 
     def objects(self) -> List[str]:
         """Returns list of object names used in the algorithm's expression."""
-        objects = set()
-        for token in self.tokens():
-            if isObject(token):
-                object = toObject(token)  # Cast to object required to fetch complete name.
-                if object.name not in objects:
-                    objects.add(object.name)
-            if isFunction(token):
-                for object in functionObjects(token):
-                    if object.name not in objects:
-                        objects.add(object.name)
-        return list(objects)
+        return list(self.references().objects)
 
     def externals(self) -> List[str]:
         """Returns list of external names used in the algorithm's expression."""
-        externals = set()
-        for token in self.tokens():
-            if isExternal(token):
-                external = toExternal(token)
-                if external.name not in externals:
-                    externals.add(external.name)
-        return list(externals)
+        return list(self.references().externals)
 
     def cuts(self) -> List[str]:
         """Returns list of cut names used in the algorithm's expression."""
-        cuts = set()
-        for token in self.tokens():
-            if isObject(token):
-                for cut in objectCuts(token):
-                    if cut not in cuts:
-                        cuts.add(cut)
-            if isFunction(token):
-                for cut in functionCuts(token):
-                    if cut not in cuts:
-                        cuts.add(cut)
-                for objcuts in functionObjectsCuts(token):
-                    for cut in objcuts:
-                        if cut not in cuts:
-                            cuts.add(cut)
-        return list(cuts)
+        return list(self.references().cuts)
 
     def validate(self) -> None:
         """Optional argument validate is a function to validate the algorithm expression."""
@@ -264,11 +440,14 @@ class Algorithm:
             raise ValueError(message)
 
 
-class Cut:
+class Cut(MenuItem):
     """Cut container class."""
 
     RegExCutName = re.compile(r"^([A-Z0-9\-]+_)([a-zA-Z\d_]+)$")
 
+    VersionedAttributes = ("name", "object", "type", "minimum", "maximum", "data")
+    """Attributes affecting validation results, assigning any of them updates the cut's version."""
+
     def __init__(self, name: str, object: str, type: str, minimum=0.0, maximum=0.0, data: Optional[str] = None,
                  comment: Optional[str] = None) -> None:
         self.name: str = name
@@ -280,6 +459,21 @@ class Cut:
         self.comment: str = comment or ""
         self.modified = False
 
+    def __setattr__(self, name: str, value) -> None:
+        super().__setattr__(name, value)
+        if name in self.VersionedAttributes:
+            super().__setattr__("version", next(cutVersions))
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @name.setter
+    def name(self, name: str) -> None:
+        previous = self.__dict__.get("_name")
+        self._name = name
+        self._notify("name", previous)
+
     @property
     def isFunctionCut(self) -> bool:
         return self.type in FunctionCutTypes
@@ -9,19 +9,21 @@ Usage example
 """
 
 from abc import ABC, abstractmethod
-from typing import Dict, Iterable, List
+from typing import Dict, Iterable, List, Optional, Sequence
 
 import tmGrammar
 
 from .Settings import CutSpecs
 from .types import SignalTypes, ObjectScaleMap, FunctionTypes
 from .Algorithm import isOperator, isObject, isExternal, isFunction
-from .Algorithm import toObject, toExternal
-from .Algorithm import functionObjects, functionCuts, functionObjectsCuts, objectCuts
+from .Algorithm import toExternal, fromObjectItem
+from .Algorithm import tokenCache
+from .grammar import synchronized
 
 __all__ = [
     "AlgorithmSyntaxValidator",
     "AlgorithmSyntaxError",
+    "ExpressionTree",
 ]
 
 kMinimum = "minimum"
@@ -32,26 +34,143 @@ kStep = "step"
 kType = "type"
 
 
+class TokenNode:
+    """Node of an analysed expression token (operators, external signals)."""
+
+    def __init__(self, token: str) -> None:
+        self.token: str = token
+
+
+class ObjectNode(TokenNode):
+    """Object requirement node, parses the token on first access."""
+
+    def __init__(self, token: str) -> None:
+        super().__init__(token)
+        self._item = None
+        self._object = None
+
+    @property
+    def item(self) -> tmGrammar.Object_Item:
+        if self._item is None:
+            item = tmGrammar.Object_Item()
+            if not tmGrammar.Object_parser(self.token, item):
+                message = f"Invalid object statement {item.message!r}"
+                raise AlgorithmSyntaxError(message, self.token)
+            self._item = item
+        return self._item
+
+    @property
+    def object(self):
+        if self._object is None:
+            self._object = fromObjectItem(self.item)
+        return self._object
+
+    @property
+    def cuts(self) -> List[str]:
+        return list(self.item.cuts)
+
+
+class FunctionNode(TokenNode):
+    """Function node, parses the token and its object requirements on first
+    access.
+    """
+
+    def __init__(self, token: str, tree: "ExpressionTree") -> None:
+        super().__init__(token)
+        self.name: str = token.split("{")[0].strip()  # fetch function name, eg "dist{...}[...]"
+        self._tree = tree
+        self._item = None
+        self._objectNodes: Optional[List[ObjectNode]] = None
+        self._cuts: Optional[List[str]] = None
+        self._objectCuts: Optional[List[List[str]]] = None
+
+    @property
+    def item(self) -> tmGrammar.Function_Item:
+        if self._item is None:
+            item = tmGrammar.Function_Item()
+            if not tmGrammar.Function_parser(self.token, item):
+                message = f"Invalid function statement {item.message!r}"
+                raise AlgorithmSyntaxError(message, self.token)
+            self._item = item
+        return self._item
+
+    @property
+    def objectNodes(self) -> List[ObjectNode]:
+        if self._objectNodes is None:
+            tokens = tmGrammar.Function_getObjects(self.item)
+            self._objectNodes = [self._tree.objectNode(token) for token in tokens if isObject(token)]
+        return self._objectNodes
+
+    @property
+    def objects(self) -> List:
+        return [node.object for node in self.objectNodes]
+
+    @property
+    def cuts(self) -> List[str]:
+        if self._cuts is None:
+            self._cuts = list(tmGrammar.Function_getCuts(self.item))
+        return self._cuts
+
+    @property
+    def objectCuts(self) -> List[List[str]]:
+        """Returns lists of cuts assigned to function objects."""
+        if self._objectCuts is None:
+            # Note: returns strings containting list of cuts.
+            self._objectCuts = [names.split(",") if names else [] for names in tmGrammar.Function_getObjectCuts(self.item)]
+        return self._objectCuts
+
+
+class ExpressionTree:
+    """Analysis of an algorithm expression shared by all syntax rules. Object
+    and function tokens as well as referenced cuts are parsed respectively
+    resolved only once per validation.
+    """
+
+    def __init__(self, tokens: Sequence[str], menu) -> None:
+        self.tokens: Sequence[str] = tokens
+        self.menu = menu
+        self._objectNodes: Dict[str, ObjectNode] = {}
+        self._cuts: Dict[str, object] = {}
+        self.nodes: List[TokenNode] = [self.createNode(token) for token in tokens]
+
+    def createNode(self, token: str) -> TokenNode:
+        if isOperator(token):
+            return TokenNode(token)
+        if isObject(token):
+            return self.objectNode(token)
+        if isFunction(token):
+            return FunctionNode(token, self)
+        return TokenNode(token)
+
+    def objectNode(self, token: str) -> ObjectNode:
+        """Returns shared node for object requirement *token*."""
+        if token not in self._objectNodes:
+            self._objectNodes[token] = ObjectNode(token)
+        return self._objectNodes[token]
+
+    @property
+    def objects(self) -> List[ObjectNode]:
+        """Returns object requirement nodes in order of tokens."""
+        return [node for node in self.nodes if isinstance(node, ObjectNode)]
+
+    @property
+    def functions(self) -> List[FunctionNode]:
+        """Returns function nodes in order of tokens."""
+        return [node for node in self.nodes if isinstance(node, FunctionNode)]
+
+    def cut(self, name: str):
+        """Returns resolved cut by *name* or None if no such cut exists."""
+        if name not in self._cuts:
+            self._cuts[name] = self.menu.cutByName(name)
+        return self._cuts[name]
+
+
 class SyntaxRule(ABC):
     """Base class to be inherited by custom syntax rule classes."""
 
     def __init__(self, validator) -> None:
         self.validator = validator
 
-    def toObjectItem(self, token: str) -> tmGrammar.Object_Item:
-        item = tmGrammar.Object_Item()
-        if not tmGrammar.Object_parser(token, item):
-            message = f"Invalid object statement {item.message!r}"
-            raise AlgorithmSyntaxError(message, token)
-        return item
-
-    def toFunctionItem(self, token: str) -> tmGrammar.Function_Item:
-        item = tmGrammar.Function_Item()
-        if not tmGrammar.Function_parser(token, item):
-            message = f"Invalid function statement {item.message!r}"
-            raise AlgorithmSyntaxError(message, token)
-        return item
-
     def toCutItem(self, token: str) -> tmGrammar.Cut_Item:
         item = tmGrammar.Cut_Item()
         if not tmGrammar.Cut_parser(token, item):
@@ -60,7 +179,7 @@ class SyntaxRule(ABC):
         return item
 
     @abstractmethod
-    def validate(self, tokens: List[str]) -> None:
+    def validate(self, tree: ExpressionTree) -> None:
         ...
 
 
@@ -71,27 +190,27 @@ class SyntaxValidator:
         self.menu = menu
         self.rules: List[SyntaxRule] = []
 
+    @synchronized
     def validate(self, expression: str) -> None:
-        tokens: List[str] = self.tokenize(expression)
+        tree = ExpressionTree(self.tokenize(expression), self.menu)
         for rule in self.rules:
-            rule.validate(tokens)
+            rule.validate(tree)
 
     def addRule(self, cls) -> None:
         """Add a syntx rule class. Creates and tores an instance of the class."""
         self.rules.append(cls(self))
 
-    def tokenize(self, expression: str) -> List[str]:
-        """Parses algorithm expression and returns list of RPN tokens."""
-        # Make sure to clear static algorithm logic.
-        tmGrammar.Algorithm_Logic.clear()
+    def tokenize(self, expression: str) -> Sequence[str]:
+        """Parses algorithm expression and returns RPN tokens."""
         # Check for empty expression
         if not expression.strip():
             message = "Empty expression"
             raise AlgorithmSyntaxError(message)
-        if not tmGrammar.Algorithm_parser(expression):
+        try:
+            return tokenCache.tokens(expression)
+        except ValueError:
             message = f"Invalid expression {expression!r}"
             raise AlgorithmSyntaxError(message)
-        return tmGrammar.Algorithm_Logic.getTokens()
 
 
 class AlgorithmSyntaxError(Exception):
@@ -100,6 +219,10 @@ class AlgorithmSyntaxError(Exception):
         super().__init__(message)
         self.token = token
 
+    def __reduce__(self):
+        # Preserve token when passing exceptions between processes.
+        return self.__class__, (format(self), self.token)
+
 
 class AlgorithmSyntaxValidator(SyntaxValidator):
     """Algorithm syntax validator class."""
@@ -125,22 +248,21 @@ class AlgorithmSyntaxValidator(SyntaxValidator):
 class BasicSyntax(SyntaxRule):
     """Validates basic algorithm syntax."""
 
-    def validate(self, tokens: List[str]) -> None:
+    def validate(self, tree: ExpressionTree) -> None:
         menu = self.validator.menu
         ext_signal_names = [item[kName] for item in menu.extSignals.extSignals]
-        for token in tokens:
+        for node in tree.nodes:
+            token = node.token
             # Validate operators
             if isOperator(token):
                 pass
             # Validate object
-            elif isObject(token):
-                o = self.toObjectItem(token)
-                for cut in o.cuts:
+            elif isinstance(node, ObjectNode):
+                for cut in node.item.cuts:
                     self.toCutItem(cut)
             # Validate function
-            elif isFunction(token):
-                f = self.toFunctionItem(token)
-                for cut in f.cuts:
+            elif isinstance(node, FunctionNode):
+                for cut in node.item.cuts:
                     self.toCutItem(cut)
             # Validate externals
             elif isExternal(token):
@@ -156,18 +278,18 @@ class BasicSyntax(SyntaxRule):
 class ObjectThresholds(SyntaxRule):
     """Validates object thresholds/counts."""
 
-    def validate(self, tokens: List[str]) -> None:
+    def validate(self, tree: ExpressionTree) -> None:
         # TODO... better to use floating point representation and compare by string?!
-        for token in tokens:
+        for node in tree.nodes:
             # Validate object
-            if isObject(token):
-                object = toObject(token)
+            if isinstance(node, ObjectNode):
+                object = node.object
                 if object.type not in SignalTypes:
-                    self.validateThreshold(token, object)
+                    self.validateThreshold(node.token, object)
             # Validate function
-            if isFunction(token):
-                for object in functionObjects(token):
-                    self.validateThreshold(token, object)
+            if isinstance(node, FunctionNode):
+                for object in node.objects:
+                    self.validateThreshold(node.token, object)
 
     def validateThreshold(self, token: str, object):
         menu = self.validator.menu
@@ -188,144 +310,121 @@ class ObjectThresholds(SyntaxRule):
             raise AlgorithmSyntaxError(message, token)
         # Check step
         bins = menu.scaleBins(object, ObjectScaleMap[object.type])
-        if not list(filter(lambda bin: float(bin[kMinimum]) == threshold or float(bin[kMaximum]) == threshold, bins)):
+        if bins is None or not bins.isLimit(threshold):
             message = f"Invalid threshold {object.threshold!r} at object {token!r}"
             raise AlgorithmSyntaxError(message, token)
 
 
 class RequiredObjectCuts(SyntaxRule):
 
-    def validate(self, tokens: List[str]) -> None:
-        for token in tokens:
-            if isObject(token):
-                if token.startswith(tmGrammar.ADT):
-                    o = self.toObjectItem(token)
-                    ascore_count = 0
-                    for cut in o.cuts:
-                        if cut.startswith(tmGrammar.ADT + "-" + tmGrammar.ASCORE):
-                            ascore_count += 1
-                    if ascore_count != 1:
-                        message = f"ADT object requires exactly one ASCORE cut. Invalid expression near {token!r}"
-                        raise AlgorithmSyntaxError(message)
-                #if token.startswith(tmGrammar.AXO):
-                    #o = self.toObjectItem(token)
-                    #ascore_count = 0
-                    #for cut in o.cuts:
-                        #if cut.startswith(tmGrammar.AXO + "-" + tmGrammar.SCORE):
-                            #ascore_count += 1
-                    #if ascore_count != 1:
-                        #message = f"AXO object requires exactly one SCORE cut. Invalid expression near {token!r}"
-                        #raise AlgorithmSyntaxError(message)
-                if token.startswith(tmGrammar.AXO):
-                    o = self.toObjectItem(token)
-                    tcuts_count = 0
-                    for cut in o.cuts:
-                        if cut.startswith(tmGrammar.AXO + "-" + tmGrammar.SCORE):
-                            tcuts_count += 1
-                        if cut.startswith(tmGrammar.AXO + "-" + tmGrammar.MODEL):
-                            tcuts_count += 1
-                    if tcuts_count != 2:
-                        message = f"AXO object requires exactly one SCORE and one MODEL cut. Invalid expression near {token!r}"
-                        raise AlgorithmSyntaxError(message)
-                if token.startswith(tmGrammar.TOPO):
-                    o = self.toObjectItem(token)
-                    tcuts_count = 0
-                    for cut in o.cuts:
-                        if cut.startswith(tmGrammar.TOPO + "-" + tmGrammar.SCORE):
-                            tcuts_count += 1
-                        if cut.startswith(tmGrammar.TOPO + "-" + tmGrammar.MODEL):
-                            tcuts_count += 1
-                    if tcuts_count != 2:
-                        message = f"TOPO object requires exactly one SCORE and one MODEL cut. Invalid expression near {token!r}"
-                        raise AlgorithmSyntaxError(message)
-                if token.startswith(tmGrammar.CICADA):
-                    o = self.toObjectItem(token)
-                    cscore_count = 0
-                    for cut in o.cuts:
-                        if cut.startswith(tmGrammar.CICADA + "-" + tmGrammar.CSCORE):
-                            cscore_count += 1
-                    if cscore_count != 1:
-                        message = f"CICADA object requires exactly one CSCORE cut. Invalid expression near {token!r}"
-                        raise AlgorithmSyntaxError(message)
+    def validate(self, tree: ExpressionTree) -> None:
+        for node in tree.objects:
+            token = node.token
+            if token.startswith(tmGrammar.ADT):
+                ascore_count = 0
+                for cut in node.cuts:
+                    if cut.startswith(tmGrammar.ADT + "-" + tmGrammar.ASCORE):
+                        ascore_count += 1
+                if ascore_count != 1:
+                    message = f"ADT object requires exactly one ASCORE cut. Invalid expression near {token!r}"
+                    raise AlgorithmSyntaxError(message)
+            #if token.startswith(tmGrammar.AXO):
+                #ascore_count = 0
+                #for cut in node.cuts:
+                    #if cut.startswith(tmGrammar.AXO + "-" + tmGrammar.SCORE):
+                        #ascore_count += 1
+                #if ascore_count != 1:
+                    #message = f"AXO object requires exactly one SCORE cut. Invalid expression near {token!r}"
+                    #raise AlgorithmSyntaxError(message)
+            if token.startswith(tmGrammar.AXO):
+                tcuts_count = 0
+                for cut in node.cuts:
+                    if cut.startswith(tmGrammar.AXO + "-" + tmGrammar.SCORE):
+                        tcuts_count += 1
+                    if cut.startswith(tmGrammar.AXO + "-" + tmGrammar.MODEL):
+                        tcuts_count += 1
+                if tcuts_count != 2:
+                    message = f"AXO object requires exactly one SCORE and one MODEL cut. Invalid expression near {token!r}"
+                    raise AlgorithmSyntaxError(message)
+            if token.startswith(tmGrammar.TOPO):
+                tcuts_count = 0
+                for cut in node.cuts:
+                    if cut.startswith(tmGrammar.TOPO + "-" + tmGrammar.SCORE):
+                        tcuts_count += 1
+                    if cut.startswith(tmGrammar.TOPO + "-" + tmGrammar.MODEL):
+                        tcuts_count += 1
+                if tcuts_count != 2:
+                    message = f"TOPO object requires exactly one SCORE and one MODEL cut. Invalid expression near {token!r}"
+                    raise AlgorithmSyntaxError(message)
+            if token.startswith(tmGrammar.CICADA):
+                cscore_count = 0
+                for cut in node.cuts:
+                    if cut.startswith(tmGrammar.CICADA + "-" + tmGrammar.CSCORE):
+                        cscore_count += 1
+                if cscore_count != 1:
+                    message = f"CICADA object requires exactly one CSCORE cut. Invalid expression near {token!r}"
+                    raise AlgorithmSyntaxError(message)
 
 
 class CombBxOffset(SyntaxRule):
     """Validates that all objects of a combination function use the same BX offset."""
 
-    def validate(self, tokens: List[str]) -> None:
-        for token in tokens:
-            if not isFunction(token):
-                continue
-            name = token.split("{")[0].strip()  # fetch function name, eg "dist{...}[...]"
+    def validate(self, tree: ExpressionTree) -> None:
+        for node in tree.functions:
+            name = node.name
             if name not in (tmGrammar.comb, tmGrammar.comb_orm):
                 continue
-            f = tmGrammar.Function_Item()
-            if not tmGrammar.Function_parser(token, f):
-                raise AlgorithmSyntaxError(f.message)
-            objects = functionObjects(token)
+            objects = node.objects
             sameBxRange = len(objects)
             if name == tmGrammar.comb_orm:
                 sameBxRange -= 1  # exclude last object
             for i in range(sameBxRange):
                 if int(objects[i].bx_offset) != int(objects[0].bx_offset):
                     message = f"All object requirements of function {name}{{...}} must be of same bunch crossing offset.\n" \
-                              f"Invalid expression near {token!r}"  # TODO differentiate!
-                    raise AlgorithmSyntaxError(message, token)
+                              f"Invalid expression near {node.token!r}"  # TODO differentiate!
+                    raise AlgorithmSyntaxError(message, node.token)
 
 
 class CombMultiThresholds(SyntaxRule):
     """Validates that all objects of a combination function with more then 4 objects require same thresholds."""
 
-    def validate(self, tokens: List[str]) -> None:
-        for token in tokens:
-            if not isFunction(token):
-                continue
-            name = token.split("{")[0].strip()  # fetch function name, eg "dist{...}[...]"
+    def validate(self, tree: ExpressionTree) -> None:
+        for node in tree.functions:
+            name = node.name
             if name not in (tmGrammar.comb, ):
                 continue
-            f = tmGrammar.Function_Item()
-            if not tmGrammar.Function_parser(token, f):
-                raise AlgorithmSyntaxError(f.message)
-            obj_tokens = []
-            objects = []
-            for obj_token in tmGrammar.Function_getObjects(f):
-                if isObject(obj_token):
-                    obj_tokens.append(obj_token)
-                    objects.append(toObject(obj_token))
+            obj_tokens = [object_node.token for object_node in node.objectNodes]
+            objects = node.objects
             if len(obj_tokens) <= 4:
                 continue
-            obj_cuts = functionObjectsCuts(token)
+            obj_cuts = node.objectCuts
             thresholds = set()
             for i in range(len(objects)):
                 if objects[i].type not in [tmGrammar.EG, tmGrammar.JET, tmGrammar.TAU]:
                     message = f"All objects of function {name}{{...}} must be of type EG, JET or TAU.\n" \
                               f"Invalid expression near {obj_tokens[i]!r}"
-                    raise AlgorithmSyntaxError(message, token)
+                    raise AlgorithmSyntaxError(message, node.token)
                 thresholds.add(objects[i].threshold)
                 if len(thresholds) > 1:
                     message = f"All object thresholds of function {name}{{...}} must be identical, if assigning more then 4 objects.\n" \
                               f"Invalid expression near {obj_tokens[i]!r}"
-                    raise AlgorithmSyntaxError(message, token)
+                    raise AlgorithmSyntaxError(message, node.token)
                 if obj_cuts[i]:
                     message = f"All objects of function {name}{{...}} must not use additional cuts, if assigning more then 4 objects.\n" \
                               f"Invalid expression near {obj_tokens[i]!r}"
-                    raise AlgorithmSyntaxError(message, token)
+                    raise AlgorithmSyntaxError(message, node.token)
 
 
 class ChargeCorrelation(SyntaxRule):
     """Validates that all objects of a function are of type muon if applying a CHGCOR cut."""
 
-    def validate(self, tokens: List[str]) -> None:
-        for token in tokens:
-            if not isFunction(token):
-                continue
-            f = tmGrammar.Function_Item()
-            if not tmGrammar.Function_parser(token, f):
-                raise AlgorithmSyntaxError(f.message)
+    def validate(self, tree: ExpressionTree) -> None:
+        for node in tree.functions:
+            token = node.token
             # Test for applied CHGCOR cuts
-            if not list(filter(lambda name: name.startswith(tmGrammar.CHGCOR), functionCuts(token))):
+            if not list(filter(lambda name: name.startswith(tmGrammar.CHGCOR), node.cuts)):
                 continue
-            objects = functionObjects(token)
+            objects = node.objects
             for i in range(len(objects)):
                 if objects[i].type != tmGrammar.MU:
                     name = token.split("{")[0]  # TODO: get function name
@@ -337,39 +436,34 @@ class ChargeCorrelation(SyntaxRule):
 class DistNrObjects(SyntaxRule):
     """Limit number of objects for distance function."""
 
-    def validate(self, tokens: List[str]) -> None:
-        for token in tokens:
-            if not isFunction(token):
-                continue
-            name = token.split("{")[0].strip()  # fetch function name, eg "dist{...}[...]"
+    def validate(self, tree: ExpressionTree) -> None:
+        for node in tree.functions:
+            name = node.name
             if name not in (tmGrammar.dist, tmGrammar.dist_orm):
                 continue
-            f = tmGrammar.Function_Item()
-            if not tmGrammar.Function_parser(token, f):
-                raise AlgorithmSyntaxError(f.message)
-            objects = functionObjects(token)
+            objects = node.objects
             if name == tmGrammar.dist and len(objects) != 2:
                 message = f"Function {name}{{...}} requires excactly two object requirements.\n" \
-                          f"Invalid expression near {token!r}"
+                          f"Invalid expression near {node.token!r}"
                 raise AlgorithmSyntaxError(message)
 
 
 class DistDeltaRange(SyntaxRule):
     """Validates that delta-eta/phi cut ranges does not exceed assigned objects limits."""
 
-    def validate(self, tokens: List[str]) -> None:
+    def validate(self, tree: ExpressionTree) -> None:
         menu = self.validator.menu
-        for token in tokens:
-            if not isFunction(token):
+        for node in tree.functions:
+            if node.name not in (tmGrammar.dist, tmGrammar.dist_orm):
                 continue
-            name = token.split("{")[0].strip()  # fetch function name, eg "dist{...}[...]"
-            if name not in (tmGrammar.dist, tmGrammar.dist_orm):
-                continue
-            for name in functionCuts(token):
-                cut = menu.cutByName(name)
+            for name in node.cuts:
+                cut = tree.cut(name)
                 if cut.type == tmGrammar.DETA:
-                    for object in functionObjects(token):
-                        scale = list(filter(lambda scale: scale[kObject] == object.type and scale[kType] == tmGrammar.ETA, menu.scales.scales))[0]
+                    for object in node.objects:
+                        scale = menu.scaleIndex.get(object.type, tmGrammar.ETA)
+                        if scale is None:
+                            message = f"No ETA scale for object type {object.type!r} in scale set near {name!r}"
+                            raise AlgorithmSyntaxError(message)
                         minimum = 0
                         maximum = abs(float(scale[kMinimum])) + float(scale[kMaximum])
                         if not minimum <= float(cut.minimum) <= maximum:
@@ -379,8 +473,11 @@ class DistDeltaRange(SyntaxRule):
                             message = f"Cut {name!r} maximum limit of {cut.maximum!r} exceed valid object DETA range of {maximum!r}"
                             raise AlgorithmSyntaxError(message)
                 if cut.type == tmGrammar.DPHI:
-                    for object in functionObjects(token):
-                        scale = list(filter(lambda scale: scale[kObject] == object.type and scale[kType] == tmGrammar.PHI, menu.scales.scales))[0]
+                    for object in node.objects:
+                        scale = menu.scaleIndex.get(object.type, tmGrammar.PHI)
+                        if scale is None:
+                            message = f"No PHI scale for object type {object.type!r} in scale set near {name!r}"
+                            raise AlgorithmSyntaxError(message)
                         minimum = 0
                         maximum = float(format(float(scale[kMaximum]), ".3f"))
                         if not minimum <= float(cut.minimum) <= maximum:
@@ -396,27 +493,26 @@ class DistDeltaRange(SyntaxRule):
 class CutCount(SyntaxRule):
     """Limit number of cuts allowed to be assigned at once."""
 
-    def validate(self, tokens: List[str]) -> None:
-        for token in tokens:
+    def validate(self, tree: ExpressionTree) -> None:
+        for node in tree.nodes:
             # Objects
-            if isObject(token):
-                counts = self.countCuts(objectCuts(token))
-                self.checkCutCount(token, counts)
+            if isinstance(node, ObjectNode):
+                counts = self.countCuts(tree, node.cuts)
+                self.checkCutCount(node.token, counts)
             # Functions
-            if isFunction(token):
-                obj_cuts = functionObjectsCuts(token)
-                for i, obj_token in enumerate(functionObjects(token)):
-                    counts = self.countCuts(obj_cuts[i])
-                    self.checkCutCount(token, counts)
-                counts = self.countCuts(functionCuts(token))
-                self.checkCutCount(token, counts)
-
-    def countCuts(self, names: Iterable[str]) -> Dict:
+            if isinstance(node, FunctionNode):
+                obj_cuts = node.objectCuts
+                for i, obj_node in enumerate(node.objectNodes):
+                    counts = self.countCuts(tree, obj_cuts[i])
+                    self.checkCutCount(node.token, counts)
+                counts = self.countCuts(tree, node.cuts)
+                self.checkCutCount(node.token, counts)
+
+    def countCuts(self, tree: ExpressionTree, names: Iterable[str]) -> Dict:
         """Returns dictionary with key of cut object/type pair and occurence as value."""
-        menu = self.validator.menu
         counts = {}
         for name in names:
-            cut = menu.cutByName(name)
+            cut = tree.cut(name)
             if cut:
                 key = (cut.object, cut.type)
                 if key not in counts:
@@ -439,76 +535,63 @@ class CutCount(SyntaxRule):
 class TransverseMass(SyntaxRule):
     """Validates transverse mass object requirements At least one non eta object is required."""
 
-    def validate(self, tokens: List[str]) -> None:
-        for token in tokens:
-            if not isFunction(token):
+    def validate(self, tree: ExpressionTree) -> None:
+        for node in tree.functions:
+            if not node.name == tmGrammar.mass_trv:
                 continue
-            name = token.split("{")[0].strip()  # fetch function name, eg "dist{...}[...]"
-            if not name == tmGrammar.mass_trv:
-                continue
-            objects = functionObjects(token)
             nonEtaCount = 0
-            for obj in objects:
+            for obj in node.objects:
                 if obj.type in (tmGrammar.ETM, tmGrammar.ETMHF, tmGrammar.HTM, tmGrammar.HTMHF):
                     nonEtaCount += 1
             if nonEtaCount < 1:
                 message = f"Transverse mass functions require at least one object requirement without an eta component (ETM, ETMHF, HTM, HTMHF).\n" \
-                          f"Invalid expression near {token!r}"
-                raise AlgorithmSyntaxError(message, token)
+                          f"Invalid expression near {node.token!r}"
+                raise AlgorithmSyntaxError(message, node.token)
 
 
 class InvarientMass3(SyntaxRule):
     """Validates invariant mass of three objects requirements."""
 
-    def validate(self, tokens: List[str]) -> None:
-        for token in tokens:
-            if not isFunction(token):
+    def validate(self, tree: ExpressionTree) -> None:
+        for node in tree.functions:
+            if not node.name == tmGrammar.mass_inv_3:
                 continue
-            name = token.split("{")[0].strip()  # fetch function name, eg "dist{...}[...]"
-            if not name == tmGrammar.mass_inv_3:
-                continue
-            objects = functionObjects(token)
-            types = {object.type for object in objects}
+            types = {object.type for object in node.objects}
             if len(types) != 1:
                 message = f"Invariant mass for three objects functions require only muons or only calorimeter objects.\n" \
-                          f"Invalid expression near {token!r}"
-                raise AlgorithmSyntaxError(message, token)
+                          f"Invalid expression near {node.token!r}"
+                raise AlgorithmSyntaxError(message, node.token)
 
 
 class TwoBodyPtNrObjects(SyntaxRule):
     """Validates number of objects in combination with two body Pt cuts."""
 
-    def validate(self, tokens: List[str]) -> None:
-        menu = self.validator.menu
-        for token in tokens:
-            if not isFunction(token):
-                continue
-            name = token.split("{")[0].strip()  # fetch function name, eg "dist{...}[...]"
+    def validate(self, tree: ExpressionTree) -> None:
+        for node in tree.functions:
+            name = node.name
             requiredObjects = (2, 2)
             if name in (tmGrammar.comb_orm, tmGrammar.dist_orm, tmGrammar.mass_inv_orm, tmGrammar.mass_trv_orm):
                 requiredObjects = (2, 3)  # for overlap removal add the reference
-            objects = functionObjects(token)
-            for cutname in functionCuts(token):
-                cut = menu.cutByName(cutname)
+            objects = node.objects
+            for cutname in node.cuts:
+                cut = tree.cut(cutname)
                 if cut.type == tmGrammar.TBPT:
                     if not requiredObjects[0] <= len(objects) <= requiredObjects[1]:
                         message = f"Two body Pt cut requires exactly two base object requirements to be applied on.\n" \
-                                  f"Invalid expression in function {name!r} with cut {cutname!r} near {token!r}"
-                        raise AlgorithmSyntaxError(message, token)
+                                  f"Invalid expression in function {name!r} with cut {cutname!r} near {node.token!r}"
+                        raise AlgorithmSyntaxError(message, node.token)
 
 
 class ImpactPrameter(SyntaxRule):
     """Impact parameter cut requires also a upt cut."""
 
-    def validate(self, tokens: List[str]) -> None:
-        for token in tokens:
-            if isObject(token):
-                item = self.toObjectItem(token)
-                cuts = [cut for cut in item.cuts]
-                self.validateObject(cuts, token)
-            elif isFunction(token):
-                for cuts in functionObjectsCuts(token):
-                    self.validateObject(cuts, token)
+    def validate(self, tree: ExpressionTree) -> None:
+        for node in tree.nodes:
+            if isinstance(node, ObjectNode):
+                self.validateObject(node.cuts, node.token)
+            elif isinstance(node, FunctionNode):
+                for cuts in node.objectCuts:
+                    self.validateObject(cuts, node.token)
 
     def hasImpactParameter(self, cuts) -> bool:
         for cut in cuts:
@@ -533,15 +616,11 @@ class ImpactPrameter(SyntaxRule):
 class OverlapRemoval(SyntaxRule):
     """Validates only calorimeter objects are used with overlap removal functions."""
 
-    def validate(self, tokens: List[str]) -> None:
-        for token in tokens:
-            if not isFunction(token):
+    def validate(self, tree: ExpressionTree) -> None:
+        for node in tree.functions:
+            if node.name not in (tmGrammar.comb_orm, tmGrammar.dist_orm, tmGrammar.mass_inv_orm, tmGrammar.mass_trv_orm):
                 continue
-            name = token.split("{")[0].strip()  # fetch function name, eg "dist{...}[...]"
-            if name not in (tmGrammar.comb_orm, tmGrammar.dist_orm, tmGrammar.mass_inv_orm, tmGrammar.mass_trv_orm):
-                continue
-            objects = functionObjects(token)
-            for object_ in objects:
+            for object_ in node.objects:
                 if object_.type not in (tmGrammar.EG, tmGrammar.JET, tmGrammar.TAU):
                     message = "Overlap removal function supports only calorimeter type objects."
-                    raise AlgorithmSyntaxError(message, token)
+                    raise AlgorithmSyntaxError(message, node.token)
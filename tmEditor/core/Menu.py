@@ -1,23 +1,293 @@
 """Menu container."""
 
+import copy
 import logging
 import uuid
 import re
-from typing import List, Optional
+import weakref
+from typing import Callable, Dict, Hashable, List, Optional
 
 from packaging.version import Version
 
 from .Settings import MaxAlgorithms
 from .AlgorithmSyntaxValidator import AlgorithmSyntaxValidator
-from .Algorithm import toObject, toExternal
+from .Algorithm import Algorithm, Cut, toExternal
+from .ParallelValidator import ParallelValidator
+from .ReferenceExtractor import extractReferences, extractObject
+from .ScaleBins import ScaleBins, scaleBins
+from .ScaleIndex import ScaleIndex, scaleIndex
 
 __all__ = ["Menu", "GrammarVersion"]
 
 GrammarVersion = Version("0.13")
 """Supported grammar version."""
 
-kObject: str = "object"
-kType: str = "type"
+kName: str = "name"
+
+
+ParallelValidationThreshold = 64
+"""Minimum number of algorithms to be validated for using worker processes."""
+
+class TableSnapshot:
+    """Base class for tables provided as plain Python types, supports weak
+    references (see `SetRegistry`).
+    """
+
+    __slots__ = ("__weakref__", )
+
+    def astuple(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def __eq__(self, other) -> bool:
+        return type(self) is type(other) and self.astuple() == other.astuple()
+
+    __hash__ = None  # mutable
+
+    def __getstate__(self):
+        return self.astuple()
+
+    def __setstate__(self, state) -> None:
+        self.__init__(*state)
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({values})"
+
+
+class ScalesSnapshot(TableSnapshot):
+    """Scale set provided as plain Python types."""
+
+    __slots__ = ("scaleSet", "scales", "bins")
+
+    def __init__(self, scaleSet: dict, scales: list, bins: dict) -> None:
+        self.scaleSet = scaleSet
+        self.scales = scales
+        self.bins = bins
+
+
+class ExtSignalsSnapshot(TableSnapshot):
+    """External signal set provided as plain Python types."""
+
+    __slots__ = ("extSignalSet", "extSignals")
+
+    def __init__(self, extSignalSet: dict, extSignals: list) -> None:
+        self.extSignalSet = extSignalSet
+        self.extSignals = extSignals
+
+
+class ItemList(list):
+    """List calling back on every item inserted or removed. Used for menu
+    contents to keep the menu's lookup indices in sync with direct list
+    manipulations (eg. by table models).
+
+    Registered observers are notified by `itemsAboutToBeInserted(position,
+    count)` before and `itemsInserted(position, count)` after appending or
+    inserting items, eg. to let table models announce rows in time.
+    Observers are referenced weakly.
+    """
+
+    def __init__(self, items=(), inserted: Optional[Callable] = None, removed: Optional[Callable] = None) -> None:
+        super().__init__(items)
+        self.inserted = inserted
+        self.removed = removed
+        self.observers = weakref.WeakSet()
+        for item in self:
+            self._inserted(item)
+
+    def addObserver(self, observer) -> None:
+        self.observers.add(observer)
+
+    def removeObserver(self, observer) -> None:
+        self.observers.discard(observer)
+
+    def __reduce__(self):
+        # Copies and pickles are plain lists.
+        return list, (list(self),)
+
+    def _inserted(self, item) -> None:
+        if item is not None and self.inserted:
+            self.inserted(item)
+
+    def _removed(self, item) -> None:
+        if item is not None and self.removed:
+            self.removed(item)
+
+    def _aboutToInsert(self, position: int, count: int) -> None:
+        for observer in list(self.observers):
+            observer.itemsAboutToBeInserted(position, count)
+
+    def _itemsInserted(self, position: int, count: int) -> None:
+        for observer in list(self.observers):
+            observer.itemsInserted(position, count)
+
+    def append(self, item) -> None:
+        position = len(self)
+        self._aboutToInsert(position, 1)
+        super().append(item)
+        self._inserted(item)
+        self._itemsInserted(position, 1)
+
+    def extend(self, items) -> None:
+        for item in items:
+            self.append(item)
+
+    def __iadd__(self, items):
+        self.extend(items)
+        return self
+
+    def insert(self, index, item) -> None:
+        # Resolve position like list.insert does.
+        position = max(0, len(self) + index) if index < 0 else min(index, len(self))
+        self._aboutToInsert(position, 1)
+        super().insert(index, item)
+        self._inserted(item)
+        self._itemsInserted(position, 1)
+
+    def remove(self, item) -> None:
+        self.pop(self.index(item))
+
+    def pop(self, index=-1):
+        item = super().pop(index)
+        self._removed(item)
+        return item
+
+    def clear(self) -> None:
+        items = list(self)
+        super().clear()
+        for item in items:
+            self._removed(item)
+
+    def __setitem__(self, index, value) -> None:
+        previous = self[index]
+        super().__setitem__(index, value)
+        for item in (previous if isinstance(index, slice) else [previous]):
+            self._removed(item)
+        for item in (self[index] if isinstance(index, slice) else [value]):
+            self._inserted(item)
+
+    def __delitem__(self, index) -> None:
+        previous = self[index]
+        super().__delitem__(index)
+        for item in (previous if isinstance(index, slice) else [previous]):
+            self._removed(item)
+
+
+class ItemIndex:
+    """Hash index mapping keys to menu items. Items sharing the same key are
+    kept in insertion order, lookups return the first one.
+    """
+
+    def __init__(self, key: Callable) -> None:
+        self.key: Callable = key
+        self.buckets: Dict[Hashable, List] = {}
+        self.keys: Dict[int, Hashable] = {}
+
+    def add(self, item) -> None:
+        key = self.key(item)
+        self.buckets.setdefault(key, []).append(item)
+        self.keys[id(item)] = key
+
+    def discard(self, item) -> None:
+        key = self.keys.pop(id(item), None)
+        bucket = self.buckets.get(key)
+        if bucket:
+            for i, other in enumerate(bucket):
+                if other is item:
+                    del bucket[i]
+                    break
+            if not bucket:
+                del self.buckets[key]
+
+    def update(self, item) -> None:
+        """Re-index item after its key changed."""
+        self.discard(item)
+        self.add(item)
+
+    def get(self, key):
+        bucket = self.buckets.get(key)
+        return bucket[0] if bucket else None
+
+    def clear(self) -> None:
+        self.buckets.clear()
+        self.keys.clear()
+
+
+class ReferenceGraph:
+    """Reverse reference graph mapping cut, object and external signal names
+    to the algorithms referencing them. Added or modified algorithms are
+    queued and their references resolved on the next query.
+    """
+
+    def __init__(self) -> None:
+        self.cuts: Dict[str, Dict[int, object]] = {}
+        self.objects: Dict[str, Dict[int, object]] = {}
+        self.externals: Dict[str, Dict[int, object]] = {}
+        self.registered: Dict[int, tuple] = {}
+        self.pending: Dict[int, object] = {}
+
+    def add(self, algorithm) -> None:
+        self.pending[id(algorithm)] = algorithm
+
+    def discard(self, algorithm) -> None:
+        key = id(algorithm)
+        self.pending.pop(key, None)
+        entry = self.registered.pop(key, None)
+        if entry:
+            _, references = entry
+            for table, names in self.tables(references):
+                for name in names:
+                    users = table.get(name)
+                    if users is not None:
+                        users.pop(key, None)
+                        if not users:
+                            del table[name]
+
+    def update(self, algorithm) -> None:
+        self.discard(algorithm)
+        self.add(algorithm)
+
+    def clear(self) -> None:
+        self.cuts.clear()
+        self.objects.clear()
+        self.externals.clear()
+        self.registered.clear()
+        self.pending.clear()
+
+    def tables(self, references):
+        return (
+            (self.cuts, references.cuts),
+            (self.objects, references.objects),
+            (self.externals, references.externals),
+        )
+
+    def resolve(self) -> None:
+        """Register references of all queued algorithms. Raises a ValueError
+        if an expression can not be parsed (the algorithm stays queued).
+        """
+        while self.pending:
+            key, algorithm = next(iter(self.pending.items()))
+            references = algorithm.references()
+            del self.pending[key]
+            self.registered[key] = (algorithm, references)
+            for table, names in self.tables(references):
+                for name in names:
+                    table.setdefault(name, {})[key] = algorithm
+
+    def users(self, table: Dict[str, Dict[int, object]], name: str) -> List:
+        self.resolve()
+        return list(table.get(name, {}).values())
+
+    def isUsed(self, table: Dict[str, Dict[int, object]], name: str) -> bool:
+        self.resolve()
+        return name in table
+
+
+def algorithmIndexKey(algorithm) -> int:
+    return int(algorithm.index)
+
+
+def nameKey(item) -> str:
+    return item.name
 
 
 class Menu:
@@ -27,13 +297,136 @@ class Menu:
 
     def __init__(self) -> None:
         self.menu = MenuInfo()
-        self.algorithms: List = []
-        self.cuts: List = []
-        self.objects: List = []
-        self.externals: List = []
+        self._createIndices()
+        self.algorithms = []
+        self.cuts = []
+        self.objects = []
+        self.externals = []
         self.scales = None
         self.extSignals = None
 
+    def __getstate__(self) -> dict:
+        state = self.__dict__.copy()
+        for key in ("_algorithms", "_cuts", "_objects", "_externals"):
+            state[key] = list(state[key])
+        for key in list(state.keys()):
+            if isinstance(state[key], (ItemIndex, ReferenceGraph, ScaleIndex)):
+                del state[key]
+        del state["_validated"]
+        return state
+
+    def __setstate__(self, state: dict) -> None:
+        algorithms = state.pop("_algorithms")
+        cuts = state.pop("_cuts")
+        objects = state.pop("_objects")
+        externals = state.pop("_externals")
+        self.__dict__.update(state)
+        self._createIndices()
+        self._scaleIndex = scaleIndex(self._scales)
+        self.algorithms = algorithms
+        self.cuts = cuts
+        self.objects = objects
+        self.externals = externals
+
+    def _createIndices(self) -> None:
+        self._algorithmsByName = ItemIndex(nameKey)
+        self._algorithmsByIndex = ItemIndex(algorithmIndexKey)
+        self._cutsByName = ItemIndex(nameKey)
+        self._objectsByName = ItemIndex(nameKey)
+        self._externalsByName = ItemIndex(nameKey)
+        self._referenceGraph = ReferenceGraph()
+        self._validated: Dict[int, tuple] = {}
+
+    @property
+    def scales(self):
+        """Scale set of the menu."""
+        return self._scales
+
+    @scales.setter
+    def scales(self, scales) -> None:
+        self._scales = scales
+        self._scaleIndex = scaleIndex(scales)
+
+    @property
+    def scaleIndex(self) -> ScaleIndex:
+        """Scale metadata index of the scale set."""
+        return self._scaleIndex
+
+    @property
+    def algorithms(self) -> ItemList:
+        return self._algorithms
+
+    @algorithms.setter
+    def algorithms(self, algorithms) -> None:
+        self._algorithmsByName.clear()
+        self._algorithmsByIndex.clear()
+        self._referenceGraph.clear()
+        self._validated.clear()
+        self._algorithms = ItemList(algorithms, self._onAlgorithmInserted, self._onAlgorithmRemoved)
+
+    @property
+    def cuts(self) -> ItemList:
+        return self._cuts
+
+    @cuts.setter
+    def cuts(self, cuts) -> None:
+        self._cutsByName.clear()
+        self._cuts = ItemList(cuts, self._onCutInserted, self._onCutRemoved)
+
+    @property
+    def objects(self) -> ItemList:
+        return self._objects
+
+    @objects.setter
+    def objects(self, objects) -> None:
+        self._objectsByName.clear()
+        self._objects = ItemList(objects, self._objectsByName.add, self._objectsByName.discard)
+
+    @property
+    def externals(self) -> ItemList:
+        return self._externals
+
+    @externals.setter
+    def externals(self, externals) -> None:
+        self._externalsByName.clear()
+        self._externals = ItemList(externals, self._externalsByName.add, self._externalsByName.discard)
+
+    def _onAlgorithmInserted(self, algorithm) -> None:
+        algorithm._owner = self
+        self._algorithmsByName.add(algorithm)
+        self._algorithmsByIndex.add(algorithm)
+        self._referenceGraph.add(algorithm)
+
+    def _onAlgorithmRemoved(self, algorithm) -> None:
+        if algorithm._owner is self:
+            algorithm._owner = None
+        self._algorithmsByName.discard(algorithm)
+        self._algorithmsByIndex.discard(algorithm)
+        self._referenceGraph.discard(algorithm)
+        self._validated.pop(id(algorithm), None)
+
+    def _onCutInserted(self, cut) -> None:
+        cut._owner = self
+        self._cutsByName.add(cut)
+
+    def _onCutRemoved(self, cut) -> None:
+        if cut._owner is self:
+            cut._owner = None
+        self._cutsByName.discard(cut)
+
+    def itemChanged(self, item, attr: str, previous) -> None:
+        """Called by owned algorithms and cuts on changes of indexed attributes."""
+        if isinstance(item, Algorithm):
+            if attr == "name":
+                self._algorithmsByName.update(item)
+            elif attr == "index":
+                self._algorithmsByIndex.update(item)
+            elif attr == "expression":
+                self._referenceGraph.update(item)
+        elif isinstance(item, Cut):
+            if attr == "name":
+                self._cutsByName.update(item)
+
     def addObject(self, object) -> None:
         """Creates a new object by specifing its paramters and adds it to the menu. Provided for convenience."""
         self.objects.append(object)
@@ -56,81 +449,110 @@ class Menu:
         """Adds missing objects and external signals referenced by the
         *algorithm* to the menu.
         """
+        references = extractReferences(algorithm.expression)
         # Add new objects to list.
-        for item in algorithm.objects():
+        for item in references.objects:
             if not self.objectByName(item):
-                self.objects.append(toObject(item))
+                self.objects.append(extractObject(item))
         # Add new external to list.
-        for item in algorithm.externals():
+        for item in references.externals:
             if not self.externalByName(item):
                 self.externals.append(toExternal(item))
 
     def algorithmByName(self, name: str):
         """Returns algorithm item by its *name* or None if no such algorithm exists."""
-        return (list(filter(lambda item: item.name == name, self.algorithms)) or [None])[0]
+        return self._algorithmsByName.get(name)
 
     def algorithmByIndex(self, index: int):
         """Returns algorithm item by its *index* or None if no such algorithm exists."""
-        return (list(filter(lambda item: int(item.index) == int(index), self.algorithms)) or [None])[0]
+        return self._algorithmsByIndex.get(int(index))
 
     def algorithmsByObject(self, object):
         """Returns list of algorithms containing *object*."""
-        return list(filter(lambda algorithm: object.name in algorithm.objects(), self.algorithms))
+        return self._referenceGraph.users(self._referenceGraph.objects, object.name)
 
     def algorithmsByExternal(self, external):
         """Returns list of algorithms containing *external* signal."""
-        return list(filter(lambda algorithm: external.basename in algorithm.externals(), self.algorithms))
+        return self._referenceGraph.users(self._referenceGraph.externals, external.basename)
+
+    def algorithmsByCut(self, name: str):
+        """Returns list of algorithms using cut by its *name*."""
+        return self._referenceGraph.users(self._referenceGraph.cuts, name)
+
+    def isObjectOrphaned(self, name: str) -> bool:
+        """Returns True if object requirement *name* is not referenced by any algorithm."""
+        return not self._referenceGraph.isUsed(self._referenceGraph.objects, name)
+
+    def isExternalOrphaned(self, name: str) -> bool:
+        """Returns True if external signal *name* is not referenced by any algorithm."""
+        return not self._referenceGraph.isUsed(self._referenceGraph.externals, name)
+
+    def isCutOrphaned(self, name: str) -> bool:
+        """Returns True if cut *name* is not referenced by any algorithm."""
+        return not self._referenceGraph.isUsed(self._referenceGraph.cuts, name)
 
     def objectByName(self, name: str):
         """Returns object requirement item by its *name* or None if no such object requirement exists."""
-        return (list(filter(lambda item: item.name == name, self.objects)) or [None])[0]
+        return self._objectsByName.get(name)
 
     def cutByName(self, name: str):
         """Returns cut item by its *name* or None if no such cut exists."""
-        return (list(filter(lambda item: item.name == name, self.cuts)) or [None])[0]
+        return self._cutsByName.get(name)
 
     def externalByName(self, name: str):
         """Returns external signal item by its *name* or None if no such external signal exists."""
-        return (list(filter(lambda item: item.name == name, self.externals)) or [None])[0]
+        return self._externalsByName.get(name)
 
     def scaleMeta(self, object, scaleType):
         """Returns scale information for *object* by *scaleType*."""
-        return (list(filter(lambda item: item[kObject] == object.type and item[kType] == scaleType, self.scales.scales)) or [None])[0]
+        return self._scaleIndex.get(object.type, scaleType)
 
-    def scaleBins(self, object, scaleType):
-        """Returns bins for *object* by *scaleType*."""
-        key = f"{object.type}-{scaleType}"
-        return self.scales.bins[key] if key in self.scales.bins else None
+    def scaleBins(self, object, scaleType) -> Optional[ScaleBins]:
+        """Returns bin table for *object* by *scaleType*."""
+        return scaleBins(self.scales, f"{object.type}-{scaleType}")
 
     def orphanedObjects(self) -> list:
         """Returns list of orphaned object names not referenced by any algorithm."""
-        tags: list = [object.name for object in self.objects]
-        for algorithm in self.algorithms:
-            for name in algorithm.objects():
-                if name in tags:
-                    tags.remove(name)
-        return tags
+        return [object.name for object in self.objects if self.isObjectOrphaned(object.name)]
 
     def orphanedExternals(self) -> list:
         """Returns list of orphaned externals names not referenced by any algorithm."""
-        tags: list = [external.name for external in self.externals]
-        for algorithm in self.algorithms:
-            for name in algorithm.objects():
-                if name in tags:
-                    tags.remove(name)
-        return tags
+        return [external.name for external in self.externals if self.isExternalOrphaned(external.name)]
 
     def orphanedCuts(self) -> list:
         """Returns list of orphaned cut names not referenced by any algorithm."""
-        tags: list = [cut.name for cut in self.cuts]
-        for algorithm in self.algorithms:
-            for name in algorithm.cuts():
-                if name in tags:
-                    tags.remove(name)
-        return tags
+        return [cut.name for cut in self.cuts if self.isCutOrphaned(cut.name)]
 
-    def validate(self) -> None:
-        """Consistecy check, raises exception in fail."""
+    def snapshot(self) -> "Menu":
+        """Returns lightweight picklable copy of the menu providing cuts,
+        scales and external signals as required for validating algorithm
+        expressions in worker processes.
+        """
+        snapshot = Menu()
+        # Copies, as the snapshot takes ownership of inserted cuts.
+        snapshot.cuts = [copy.copy(cut) for cut in self.cuts]
+        if self.scales is not None:
+            bins = self.scales.bins
+            snapshot.scales = ScalesSnapshot(
+                dict(self.scales.scaleSet),
+                [dict(scale) for scale in self.scales.scales],
+                {key: [dict(bin) for bin in bins[key]] for key in bins.keys()}
+            )
+        if self.extSignals is not None:
+            snapshot.extSignals = ExtSignalsSnapshot(
+                dict(self.extSignals.extSignalSet),
+                [{kName: signal[kName]} for signal in self.extSignals.extSignals]
+            )
+        return snapshot
+
+    def validate(self, workers: Optional[int] = None, callback: Optional[Callable[[], None]] = None) -> None:
+        """Consistecy check, raises exception in fail.
+
+        If *workers* is greater than one, expressions of changed algorithms are
+        validated using up to *workers* processes if exceeding the parallel
+        validation threshold. Optional *callback* is called before validating every
+        algorithm, eg. to abort validation by raising an exception.
+        """
         self.menu.validate()
 
         count = len(self.algorithms)
@@ -145,13 +567,42 @@ class Menu:
         objectByName = self.objectByName
         externalByName = self.externalByName
 
+        keys = {}
+        for algorithm in self.algorithms:
+            key = self.validationKey(algorithm)
+            if key is None or self._validated.get(id(algorithm)) != key:
+                keys[id(algorithm)] = key
+
+        # Validate expressions of changed algorithms in advance using worker
+        # processes, errors are raised in order of algorithms below.
+        errors: Optional[Dict[int, Optional[Exception]]] = None
+        if workers is not None and workers > 1 and len(keys) >= ParallelValidationThreshold:
+            changed = [algorithm for algorithm in self.algorithms if id(algorithm) in keys]
+            results = ParallelValidator(self, workers).validate(changed)
+            errors = {id(algorithm): result.error for algorithm, result in zip(changed, results)}
+
         for algorithm in self.algorithms:
 
+            if callback:
+                callback()
+
             algorithm.validate()  # check params
-            validate(algorithm.expression)  # validate expression
 
-            for cut in algorithm.cuts():
-                cutByName(cut).validate()
+            # Validate expression and cuts only if changed since last run.
+            if id(algorithm) in keys:
+                key = keys[id(algorithm)]
+                self._validated.pop(id(algorithm), None)
+
+                if errors is None:
+                    validate(algorithm.expression)  # validate expression
+                elif errors[id(algorithm)] is not None:
+                    raise errors[id(algorithm)]
+
+                for cut in algorithm.cuts():
+                    cutByName(cut).validate()
+
+                if key is not None:
+                    self._validated[id(algorithm)] = key
 
             for object in algorithm.objects():
                 objectByName(object).validate()
@@ -159,6 +610,19 @@ class Menu:
             for external in algorithm.externals():
                 externalByName(external).validate()
 
+    def validationKey(self, algorithm) -> Optional[tuple]:
+        """Returns key identifying the validation result of *algorithm*
+        composed of its expression, the versions of referenced cuts and the
+        assigned scale and external signal sets. Returns None if the
+        expression can not be parsed.
+        """
+        try:
+            references = algorithm.references()
+        except ValueError:
+            return None
+        cuts = tuple((name, getattr(self.cutByName(name), "version", None)) for name in references.cuts)
+        return (algorithm.expression, cuts, id(self.scales), id(self.extSignals))
+
 
 class MenuInfo:
     """Menu information container class."""
@@ -0,0 +1,231 @@
+"""Binary menu snapshot cache.
+
+Stores decoded menus (including scales and external signal sets) to skip XML
+parsing, migrations and validation when reopening unchanged files. Entries
+are keyed by the file's real path and validated by its modification time, size
+and content hash.
+
+Entry format: magic, format version (unsigned short) followed by a zlib
+compressed pickle of a dictionary holding the key and the menu contents as
+plain Python types.
+
+>>> cache = MenuCache()
+>>> menu = cache.load(filename)
+>>> if menu is None:
+...     menu = XmlDecoder.load(filename)
+...     cache.store(filename, menu)
+"""
+
+import hashlib
+import logging
+import os
+import pickle
+import struct
+import tempfile
+import threading
+import zlib
+from typing import Optional
+
+from tmEditor import __version__
+from .Algorithm import Algorithm, Cut, Object, External
+from .Menu import Menu, GrammarVersion, ScalesSnapshot, ExtSignalsSnapshot
+from .TableHelper import toScale, toExtSignal
+from .SetRegistry import scalesKey, extSignalsKey, scalesRegistry, extSignalsRegistry
+
+__all__ = ["MenuCache", "menuCache"]
+
+CacheMagic = b"TMEC"
+"""Magic bytes of cache entries."""
+
+CacheFormatVersion = 2
+"""Version of cache entry format, increment on every change of the format."""
+
+CacheMaxSize = 256 * 1024 * 1024
+"""Default size limit of cache directory in bytes."""
+
+CacheSuffix = ".menu"
+
+Header = struct.Struct("<4sH")
+
+
+def defaultCacheDir() -> str:
+    """Returns default cache directory, can be overwritten by environment
+    variable `TM_EDITOR_CACHE_DIR`.
+    """
+    directory = os.getenv("TM_EDITOR_CACHE_DIR")
+    if directory:
+        return directory
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "tm-editor")
+
+
+def fileHash(filename: str) -> str:
+    """Returns SHA-256 hex digest of file contents."""
+    digest = hashlib.sha256()
+    with open(filename, "rb") as fp:
+        for chunk in iter(lambda: fp.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class MenuCache:
+    """On disk menu cache with LRU eviction limiting the size of the cache
+    directory to *maxSize* bytes.
+    """
+
+    def __init__(self, directory: Optional[str] = None, maxSize: int = CacheMaxSize) -> None:
+        self.directory: str = directory or defaultCacheDir()
+        self.maxSize: int = maxSize
+        self.__lock = threading.Lock()
+
+    def entryPath(self, filename: str) -> str:
+        """Returns path of cache entry for *filename*."""
+        key = hashlib.sha1(os.path.realpath(filename).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{key}{CacheSuffix}")
+
+    def fileKey(self, filename: str) -> dict:
+        stat = os.stat(filename)
+        return {
+            "path": os.path.realpath(filename),
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "version": __version__,
+            "grammarVersion": format(GrammarVersion),
+        }
+
+    def load(self, filename: str) -> Optional[Menu]:
+        """Returns cached menu for *filename* or None if not cached or
+        outdated.
+        """
+        path = self.entryPath(filename)
+        try:
+            key = self.fileKey(filename)
+            with open(path, "rb") as fp:
+                magic, version = Header.unpack(fp.read(Header.size))
+                if magic != CacheMagic or version != CacheFormatVersion:
+                    logging.debug("discarding cache entry %r of format version %s", path, version)
+                    return None
+                entry = pickle.loads(zlib.decompress(fp.read()))
+        except FileNotFoundError:
+            return None
+        except Exception as exc:
+            logging.warning("failed to read cache entry %r: %s", path, exc)
+            return None
+        if entry["key"] != key or entry["hash"] != fileHash(filename):
+            logging.debug("outdated cache entry %r for %r", path, filename)
+            return None
+        try:
+            os.utime(path)  # mark recently used
+        except OSError:
+            pass
+        logging.debug("loading menu %r from cache entry %r", filename, path)
+        return self.restore(entry["menu"])
+
+    def store(self, filename: str, menu: Menu) -> None:
+        """Store *menu* decoded from *filename*, evicts least recently used
+        entries exceeding the cache size limit.
+        """
+        entry = {
+            "key": self.fileKey(filename),
+            "hash": fileHash(filename),
+            "menu": self.dump(menu),
+        }
+        data = Header.pack(CacheMagic, CacheFormatVersion) + zlib.compress(pickle.dumps(entry, pickle.HIGHEST_PROTOCOL))
+        with self.__lock:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tempfilename = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+            try:
+                with os.fdopen(fd, "wb") as fp:
+                    fp.write(data)
+                os.replace(tempfilename, self.entryPath(filename))
+            except Exception:
+                os.remove(tempfilename)
+                raise
+            logging.debug("stored menu %r to cache (%d bytes)", filename, len(data))
+            self.evict()
+
+    def evict(self) -> None:
+        """Remove least recently used entries until the cache directory does
+        not exceed the size limit.
+        """
+        entries = []
+        for name in os.listdir(self.directory):
+            if name.endswith(CacheSuffix):
+                path = os.path.join(self.directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime_ns, stat.st_size, path))
+        size = sum(entry[1] for entry in entries)
+        for _, entrySize, path in sorted(entries):
+            if size <= self.maxSize:
+                break
+            logging.debug("evicting cache entry %r", path)
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            size -= entrySize
+
+    def clear(self) -> None:
+        """Remove all cache entries."""
+        with self.__lock:
+            if os.path.isdir(self.directory):
+                for name in os.listdir(self.directory):
+                    if name.endswith(CacheSuffix):
+                        os.remove(os.path.join(self.directory, name))
+
+    @staticmethod
+    def dump(menu: Menu) -> dict:
+        """Returns menu contents as plain Python types."""
+        scales = None
+        if menu.scales is not None:
+            bins = menu.scales.bins
+            scales = {
+                "scaleSet": dict(menu.scales.scaleSet),
+                "scales": [dict(scale) for scale in menu.scales.scales],
+                "bins": {key: [dict(bin_) for bin_ in bins[key]] for key in bins.keys()},
+            }
+        extSignals = None
+        if menu.extSignals is not None:
+            extSignals = {
+                "extSignalSet": dict(menu.extSignals.extSignalSet),
+                "extSignals": [dict(signal) for signal in menu.extSignals.extSignals],
+            }
+        return {
+            "menu": dict(menu.menu.__dict__),
+            "algorithms": [(a.index, a.name, a.expression, a.comment, list(a.labels)) for a in menu.algorithms],
+            "cuts": [(c.name, c.object, c.type, c.minimum, c.maximum, c.data, c.comment) for c in menu.cuts],
+            "objects": [(o.name, o.type, o.threshold, o.comparison_operator, o.bx_offset, o.comment) for o in menu.objects],
+            "externals": [(e.name, e.bx_offset, e.comment) for e in menu.externals],
+            "scales": scales,
+            "extSignals": extSignals,
+        }
+
+    @staticmethod
+    def restore(data: dict) -> Menu:
+        """Returns menu from plain Python types."""
+        menu = Menu()
+        menu.menu.__dict__.update(data["menu"])
+        for item in data["algorithms"]:
+            menu.addAlgorithm(Algorithm(*item))
+        for item in data["cuts"]:
+            menu.addCut(Cut(*item))
+        for item in data["objects"]:
+            menu.addObject(Object(*item))
+        for item in data["externals"]:
+            menu.addExternal(External(*item))
+        if data["scales"] is not None:
+            scales = ScalesSnapshot(**data["scales"])
+            key = scalesKey(scales)
+            menu.scales = scalesRegistry.get(key) or scalesRegistry.intern(toScale(scales), key)
+        if data["extSignals"] is not None:
+            extSignals = ExtSignalsSnapshot(**data["extSignals"])
+            key = extSignalsKey(extSignals)
+            menu.extSignals = extSignalsRegistry.get(key) or extSignalsRegistry.intern(toExtSignal(extSignals), key)
+        return menu
+
+
+menuCache = MenuCache()
+"""Shared menu cache using the default cache directory."""
@@ -0,0 +1,139 @@
+"""Parallel XML decoder for multiple files.
+
+Decodes and validates XML menus concurrently using a process pool, every
+worker process runs an XML decoder queue (see `XmlDecoder.createQueue`) for
+one file. Decoded menus are transferred as plain Python types (see
+`MenuCache.dump`).
+
+Results are provided in order of the given filenames as soon as a file and
+all files preceding it are finished. A file failing to decode does not affect
+the others, its result holds the exception instead of a menu.
+
+>>> decoder = MultiDecoder(filenames)
+>>> for result in decoder.results(progress=print):
+...     if result.error:
+...         print(result.filename, result.error)
+"""
+
+import logging
+import os
+import pickle
+import queue
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Iterator, List, Optional
+
+from . import XmlDecoder
+from .MenuCache import MenuCache, menuCache
+from .ParallelValidator import ProcessContext
+
+__all__ = ["MultiDecoder", "LoadResult"]
+
+LoadResult = namedtuple("LoadResult", "position, filename, menu, migrations, error")
+"""Load result of a file, *error* is None on success."""
+
+PollInterval = .1
+"""Interval for polling progress messages in seconds."""
+
+
+def picklableError(exc: Exception) -> Exception:
+    """Returns *exc* or a RuntimeError holding its message if the exception
+    can not be transferred between processes.
+    """
+    try:
+        pickle.loads(pickle.dumps(exc))
+    except Exception:
+        return RuntimeError(format(exc))
+    return exc
+
+
+def decodeFile(position: int, filename: str, cacheArgs: Optional[tuple], backend: Optional[str],
+               workers: int, progress) -> LoadResult:
+    """Decode *filename* in a worker process, posts tuples of position,
+    progress and message to *progress* queue. Optional *cacheArgs* are the
+    directory and size limit of the menu cache to be used, *workers* is the
+    number of processes validating algorithm expressions.
+    """
+    try:
+        cache = MenuCache(*cacheArgs) if cacheArgs else None
+        decoder = XmlDecoder.createQueue(filename, cache, backend, workers)
+        for callback in decoder:
+            progress.put((position, decoder.progress(), decoder.message()))
+            callback()
+        progress.put((position, 100, "done"))
+        return LoadResult(position, filename, MenuCache.dump(decoder.menu), decoder.applied_mirgrations, None)
+    except Exception as exc:
+        logging.error("failed to load XML menu %r: %s", filename, exc)
+        return LoadResult(position, filename, None, [], picklableError(exc))
+
+
+class MultiDecoder:
+    """Decodes multiple XML menus using a process pool."""
+
+    def __init__(self, filenames: List[str], workers: Optional[int] = None,
+                 cache: Optional[MenuCache] = menuCache, backend: Optional[str] = None) -> None:
+        self.filenames: List[str] = [os.path.abspath(filename) for filename in filenames]
+        self.workers: int = workers or os.cpu_count() or 1
+        self.cache = cache
+        self.backend = backend
+        self.__canceled = False
+
+    def cancel(self) -> None:
+        """Request cancellation, files not yet being decoded are skipped and
+        no further results are provided.
+        """
+        self.__canceled = True
+
+    def isCanceled(self) -> bool:
+        return self.__canceled
+
+    def results(self, progress: Optional[Callable[[int, int, str], None]] = None) -> Iterator[LoadResult]:
+        """Decode all files, yields results in order of filenames. Optional
+        *progress* is called with position, progress (percent) and message of
+        files being decoded.
+        """
+        if not self.filenames:
+            return
+        count = min(self.workers, len(self.filenames))
+        cacheArgs = (self.cache.directory, self.cache.maxSize) if self.cache is not None else None
+        # Share remaining CPUs for validating algorithm expressions.
+        validationWorkers = max(1, self.workers // len(self.filenames))
+        logging.debug("loading %s files using %s worker processes", len(self.filenames), count)
+        with ProcessContext.Manager() as manager, ProcessPoolExecutor(max_workers=count, mp_context=ProcessContext) as executor:
+            messages = manager.Queue()
+            pending = {
+                executor.submit(decodeFile, position, filename, cacheArgs, self.backend, validationWorkers, messages)
+                for position, filename in enumerate(self.filenames)
+            }
+            finished = {}
+            position = 0
+            while pending and not self.isCanceled():
+                done, pending = wait(pending, timeout=PollInterval, return_when=FIRST_COMPLETED)
+                self.pollProgress(messages, progress)
+                for future in done:
+                    result = future.result()
+                    finished[result.position] = result
+                while position in finished:
+                    yield self.restore(finished.pop(position))
+                    position += 1
+            if self.isCanceled():
+                logging.info("canceled loading %s files", len(pending))
+                for future in pending:
+                    future.cancel()
+                return
+            self.pollProgress(messages, progress)
+
+    def pollProgress(self, messages, progress) -> None:
+        while True:
+            try:
+                item = messages.get_nowait()
+            except queue.Empty:
+                break
+            if progress is not None:
+                progress(*item)
+
+    def restore(self, result: LoadResult) -> LoadResult:
+        """Returns result providing a menu restored from plain Python types."""
+        if result.error is not None:
+            return result
+        return result._replace(menu=MenuCache.restore(result.menu))
@@ -0,0 +1,84 @@
+"""Parallel algorithm syntax validator.
+
+Distributes syntax validation of algorithm expressions over a process pool.
+As tmGrammar keeps the parsed algorithm logic in a process global, every
+worker process owns its own parser state and validates against a lightweight
+snapshot of the menu (cuts, scales and external signal names).
+
+Usage example
+-------------
+
+>>> validator = ParallelValidator(menu, workers=8)
+>>> for result in validator.validate(menu.algorithms):
+...     if result.error:
+...         print(result.name, result.error)
+
+"""
+
+import logging
+import multiprocessing
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+
+from .AlgorithmSyntaxValidator import AlgorithmSyntaxValidator
+
+__all__ = [
+    "ParallelValidator",
+    "ProcessContext",
+    "ValidationResult",
+]
+
+ProcessContext = multiprocessing.get_context("spawn")
+"""Start worker processes by spawning, forked children of the multi-threaded
+GUI could inherit locks held by other threads (eg. the tmGrammar lock) and
+deadlock.
+"""
+
+ValidationResult = namedtuple("ValidationResult", "index, name, error")
+"""Validation result of an algorithm, *error* is None on success."""
+
+
+def validateChunk(snapshot, chunk: List[Tuple[int, int, str, str]]) -> List[Tuple[int, ValidationResult]]:
+    """Validate chunk of (position, index, name, expression) tuples in a
+    worker process. Returns list of (position, result) tuples.
+    """
+    validate = AlgorithmSyntaxValidator(snapshot).validate
+    results = []
+    for position, index, name, expression in chunk:
+        error = None
+        try:
+            validate(expression)
+        except Exception as exc:
+            error = exc
+        results.append((position, ValidationResult(index, name, error)))
+    return results
+
+
+class ParallelValidator:
+    """Validates algorithm expressions of a menu using a process pool."""
+
+    def __init__(self, menu, workers: Optional[int] = None) -> None:
+        self.menu = menu
+        self.workers: int = workers or os.cpu_count() or 1
+
+    def validate(self, algorithms) -> List[ValidationResult]:
+        """Validate expressions of *algorithms*, returns list of results in
+        order of the given algorithms.
+        """
+        items = [(position, algorithm.index, algorithm.name, algorithm.expression) for position, algorithm in enumerate(algorithms)]
+        if not items:
+            return []
+        count = min(self.workers, len(items))
+        # Distribute round robin as complex expressions tend to cluster.
+        chunks = [items[i::count] for i in range(count)]
+        snapshot = self.menu.snapshot()
+        logging.debug("validating %s algorithms using %s worker processes", len(items), count)
+        results: List = [None] * len(items)
+        with ProcessPoolExecutor(max_workers=count, mp_context=ProcessContext) as executor:
+            futures = [executor.submit(validateChunk, snapshot, chunk) for chunk in chunks]
+            for future in futures:
+                for position, result in future.result():
+                    results[position] = result
+        return results
@@ -16,11 +16,23 @@ Executing th callback queue.
 loading data ... 0 %
 processing data ... 33 %
 saving data ... 66 %
+
+Canceling a queue executed by another thread (raises QueueCanceled before
+executing the next callback or by callbacks calling checkCanceled()).
+
+>>> q.cancel()
 """
 
+import threading
 from typing import Callable, List
 
 
+class QueueCanceled(Exception):
+    """Exception raised by a canceled queue."""
+    def __init__(self, message=None):
+        super().__init__(message or "canceled")
+
+
 class Callback:
 
     def __init__(self, callback: Callable, message: str):
@@ -34,6 +46,7 @@ class Queue:
         self.__callbacks: List[Callback] = []
         self.__count: int = 0
         self.__message: str = ""
+        self.__canceled = threading.Event()
 
     def add_callback(self, callback: Callable, message: str) -> None:
         self.__callbacks.append(Callback(callback, message))
@@ -44,6 +57,22 @@ class Queue:
     def message(self) -> str:
         return self.__message
 
+    def cancel(self) -> None:
+        """Request cancellation of the queue, thread safe."""
+        self.__canceled.set()
+
+    def isCanceled(self) -> bool:
+        return self.__canceled.is_set()
+
+    def stop(self) -> None:
+        """Skip all remaining callbacks, eg. if results are already known."""
+        self.__count = len(self.__callbacks)
+
+    def checkCanceled(self) -> None:
+        """Raises QueueCanceled if cancellation was requested."""
+        if self.__canceled.is_set():
+            raise QueueCanceled()
+
     def __iter__(self):
         return self
 
@@ -51,6 +80,7 @@ class Queue:
         """Python3 version."""
         if self.__count >= len(self.__callbacks):
             raise StopIteration()
+        self.checkCanceled()
         callback = self.__callbacks[self.__count]
         self.__message = callback.message
         self.__count += 1
@@ -0,0 +1,208 @@
+"""Pure Python algorithm reference extractor.
+
+Extracts object, cut and external signal names referenced by an algorithm
+expression without using tmGrammar. Intended for read only queries (previews,
+encoding, collecting referenced menu items) not requiring a full grammar
+validation. Has no global state and is safe to be used from multiple threads.
+
+Usage example
+-------------
+
+>>> references = extractReferences("comb{MU20[MU-ISO_1],MU10} AND EXT_BPTX_plus")
+>>> references.objects
+('MU20', 'MU10')
+>>> references.cuts
+('MU-ISO_1',)
+>>> references.externals
+('EXT_BPTX_plus',)
+
+"""
+
+import functools
+import re
+from typing import Dict, List, Optional, Tuple
+
+from .types import ObjectTypes, SignalTypes, FunctionTypes
+from .AlgorithmFormatter import AlgorithmFormatter
+from .Algorithm import Object, AlgorithmReferences, FunctionReferences
+from .Algorithm import RegExExtSignal, TokenCacheSize
+
+__all__ = [
+    "ReferenceExtractor",
+    "extractReferences",
+    "extractObject",
+]
+
+
+def alternatives(names) -> str:
+    """Returns regular expression alternatives, longest names first."""
+    return "|".join(re.escape(name) for name in sorted(names, key=len, reverse=True))
+
+
+RegExObjectName = re.compile(r"({0})(\.(?:ge|eq)\.)?(\d+(?:p\d+)?)([\+\-]\d+)?".format(alternatives(ObjectTypes)))
+"""Precompiled regular expression for object requirement names (without cuts)."""
+
+RegExSignalName = re.compile(r"({0})([\+\-]\d+)?".format(alternatives(SignalTypes)))
+"""Precompiled regular expression for signal names (without cuts)."""
+
+ComparisonDefault = ".ge."
+
+
+class ReferenceExtractor:
+    """State machine collecting references from tokens returned by
+    AlgorithmFormatter.tokenize(). Raises a ValueError on malformed
+    expressions.
+    """
+
+    def __init__(self, expression: str) -> None:
+        self.tokens: List[str] = AlgorithmFormatter.tokenize(expression)
+        self.position: int = 0
+        self.objects: Dict[str, None] = {}
+        self.cuts: Dict[str, None] = {}
+        self.externals: Dict[str, None] = {}
+        self.functions: List[FunctionReferences] = []
+
+    def error(self, token: Optional[str] = None) -> ValueError:
+        message = "Failed to parse algorithm expression"
+        if token is not None:
+            message = f"{message} near {token!r}"
+        return ValueError(message)
+
+    def peek(self) -> Optional[str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position]
+        return None
+
+    def next(self) -> str:
+        token = self.peek()
+        if token is None:
+            raise self.error()
+        self.position += 1
+        return token
+
+    def expect(self, expected: str) -> None:
+        token = self.next()
+        if token != expected:
+            raise self.error(token)
+
+    def extract(self) -> AlgorithmReferences:
+        depth = 0
+        while self.peek() is not None:
+            token = self.next()
+            if token in AlgorithmFormatter.Operators:
+                continue
+            if token == AlgorithmFormatter.LeftPar:
+                depth += 1
+            elif token == AlgorithmFormatter.RightPar:
+                depth -= 1
+                if depth < 0:
+                    raise self.error(token)
+            elif self.peek() == AlgorithmFormatter.LeftFunctionPar:
+                self.extractFunction(token)
+            elif RegExExtSignal.fullmatch(token):
+                self.externals.setdefault(token)
+            else:
+                self.objects.setdefault(self.objectName(token))
+                for cut in self.extractCuts():
+                    self.cuts.setdefault(cut)
+        if depth:
+            raise self.error()
+        return AlgorithmReferences(
+            objects=tuple(self.objects),
+            cuts=tuple(self.cuts),
+            externals=tuple(self.externals),
+            functions=tuple(self.functions)
+        )
+
+    def extractFunction(self, name: str) -> None:
+        if name not in FunctionTypes:
+            raise self.error(name)
+        start = self.position - 1
+        self.expect(AlgorithmFormatter.LeftFunctionPar)
+        objects: List[str] = []
+        objectCuts: List[Tuple[str, ...]] = []
+        while True:
+            objects.append(self.objectName(self.next()))
+            objectCuts.append(self.extractCuts())
+            token = self.next()
+            if token == AlgorithmFormatter.RightFunctionPar:
+                break
+            if token not in AlgorithmFormatter.Separators:
+                raise self.error(token)
+        cuts = self.extractCuts()
+        function = FunctionReferences(
+            token="".join(self.tokens[start:self.position]),
+            objects=tuple(objects),
+            cuts=cuts,
+            objectCuts=tuple(objectCuts)
+        )
+        for object in function.objects:
+            self.objects.setdefault(object)
+        for cut in function.cuts:
+            self.cuts.setdefault(cut)
+        for names in function.objectCuts:
+            for cut in names:
+                self.cuts.setdefault(cut)
+        self.functions.append(function)
+
+    def extractCuts(self) -> Tuple[str, ...]:
+        """Returns tuple of cut names if followed by a cut list."""
+        cuts: List[str] = []
+        if self.peek() == AlgorithmFormatter.LeftCutPar:
+            self.next()
+            while True:
+                token = self.next()
+                if token in AlgorithmFormatter.Paranthesis or token in AlgorithmFormatter.Separators:
+                    raise self.error(token)
+                cuts.append(token)
+                token = self.next()
+                if token == AlgorithmFormatter.RightCutPar:
+                    break
+                if token not in AlgorithmFormatter.Separators:
+                    raise self.error(token)
+        return tuple(cuts)
+
+    def objectName(self, token: str) -> str:
+        try:
+            return extractObject(token).name
+        except ValueError:
+            raise self.error(token)
+
+
+def formatBxOffset(bx_offset: Optional[str]) -> str:
+    """Returns BX offset as used in object names, omitting zero offsets."""
+    value = int(bx_offset or 0)
+    return format(value, "+d") if value else ""
+
+
+@functools.lru_cache(maxsize=TokenCacheSize)
+def extractReferences(expression: str) -> AlgorithmReferences:
+    """Returns references of an algorithm expression. Results are cached per
+    expression. Raises a ValueError on malformed expressions.
+    """
+    return ReferenceExtractor(expression).extract()
+
+
+def extractObject(token: str) -> Object:
+    """Returns object for object requirement *token* (without cuts), the
+    object name is normalized as returned by tmGrammar. Raises a ValueError
+    if *token* is not a valid object requirement.
+    """
+    result = RegExObjectName.fullmatch(token)
+    if result:
+        type_, comparison, threshold, bx_offset = result.groups()
+    else:
+        result = RegExSignalName.fullmatch(token)
+        if not result:
+            raise ValueError(token)
+        type_, bx_offset = result.groups()
+        comparison, threshold = None, ""
+    comparison = comparison or ComparisonDefault
+    prefix = "" if comparison == ComparisonDefault else comparison
+    return Object(
+        name="".join((type_, prefix, threshold, formatBxOffset(bx_offset))),
+        type=type_,
+        threshold=threshold,
+        comparison_operator=comparison,
+        bx_offset=int(bx_offset or 0)
+    )
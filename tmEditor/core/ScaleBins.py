@@ -0,0 +1,175 @@
+"""Compact scale bin tables.
+
+Scale bins provided by the scale set are rows of strings. `ScaleBins` converts
+a bin table once into contiguous arrays of bin numbers, lower and upper limits
+providing binary search lookups (see module `bisect`).
+
+Bin tables are built on first access and shared for every scale set
+instance (see `scaleBins`).
+
+>>> bins = scaleBins(menu.scales, "MU-ET")
+>>> bins.nearest(42.2, kMinimum)
+42.0
+>>> bins.binForValue(42.2)
+84
+"""
+
+import bisect
+import threading
+import weakref
+from array import array
+from typing import Callable, Dict, Hashable, Iterable, List, Optional
+
+__all__ = ["Bin", "ScaleBins", "scaleBins"]
+
+kMaximum: str = "maximum"
+kMinimum: str = "minimum"
+kNumber: str = "number"
+
+
+class Bin:
+    """Single scale bin, provides item access by key like a bin table row."""
+
+    __slots__ = ("index", "number", "minimum", "maximum")
+
+    def __init__(self, index: int, number: int, minimum: float, maximum: float) -> None:
+        self.index = index
+        self.number = number
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def __getitem__(self, key: str):
+        if key not in (kNumber, kMinimum, kMaximum):
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def keys(self) -> tuple:
+        return (kNumber, kMinimum, kMaximum)
+
+    def __repr__(self) -> str:
+        return f"Bin(number={self.number!r}, minimum={self.minimum!r}, maximum={self.maximum!r})"
+
+
+class ScaleBins:
+    """Bin table stored in arrays. Arrays `numbers`, `minimums` and `maximums`
+    keep the order of the scale set, lookups use arrays sorted by bin limits
+    (bins are not sorted by their numbers, eg. two's complement encoded eta
+    bins).
+    """
+
+    def __init__(self, bins: Iterable) -> None:
+        self.numbers = array("q")
+        self.minimums = array("d")
+        self.maximums = array("d")
+        for bin_ in bins:
+            self.numbers.append(int(bin_[kNumber]))
+            self.minimums.append(float(bin_[kMinimum]))
+            self.maximums.append(float(bin_[kMaximum]))
+        order = sorted(range(len(self.numbers)), key=lambda i: (self.minimums[i], self.maximums[i]))
+        self.order = array("q", order)
+        self.sorted: Dict[str, array] = {
+            kMinimum: array("d", (self.minimums[i] for i in order)),
+            kMaximum: array("d", (self.maximums[i] for i in order)),
+        }
+        self.minimum: float = self.sorted[kMinimum][0] if order else .0
+        self.maximum: float = max(self.maximums) if order else .0
+        self.step: float = min((b - a for a, b in zip(self.minimums, self.maximums)), default=.0)
+        self.lastIndex: Optional[int] = self.maximums.index(self.maximum) if order else None
+
+    def __len__(self) -> int:
+        return len(self.numbers)
+
+    def bin(self, index: int) -> Bin:
+        """Returns bin at *index* (order of the scale set)."""
+        return Bin(index, self.numbers[index], self.minimums[index], self.maximums[index])
+
+    def bins(self) -> List[Bin]:
+        """Returns list of all bins (order of the scale set)."""
+        return [self.bin(index) for index in range(len(self))]
+
+    def values(self, mode: str = kMinimum) -> array:
+        """Returns sorted lower (*mode* minimum) or upper (*mode* maximum) bin
+        limits.
+        """
+        return self.sorted[mode]
+
+    def nearestIndex(self, value: float, mode: str = kMinimum) -> int:
+        """Returns index of nearest bin limit of *value* in sorted values of
+        *mode*, prefers the lower neighbor on ties.
+        """
+        values = self.sorted[mode]
+        if not values:
+            raise IndexError("empty bin table")
+        index = bisect.bisect_left(values, value)
+        if index >= len(values):
+            return len(values) - 1
+        if index and value - values[index - 1] <= values[index] - value:
+            return index - 1
+        return index
+
+    def nearest(self, value: float, mode: str = kMinimum) -> float:
+        """Returns nearest lower (*mode* minimum) or upper (*mode* maximum)
+        bin limit of *value*.
+        """
+        return self.sorted[mode][self.nearestIndex(value, mode)]
+
+    def binForValue(self, value: float) -> Optional[int]:
+        """Returns number of bin containing *value* (lower limit inclusive)
+        or None if *value* is out of range.
+        """
+        minimums = self.sorted[kMinimum]
+        index = bisect.bisect_right(minimums, value) - 1
+        if index < 0:
+            return None
+        bin_ = self.order[index]
+        if value < self.maximums[bin_]:
+            return self.numbers[bin_]
+        return None
+
+    def isLimit(self, value: float) -> bool:
+        """Returns True if *value* matches any lower or upper bin limit."""
+        for values in self.sorted.values():
+            index = bisect.bisect_left(values, value)
+            if index < len(values) and values[index] == value:
+                return True
+        return False
+
+
+class ScalesCache:
+    """Cache of items created by *factory* per scale set instance, entries are
+    released with their scale set.
+    """
+
+    def __init__(self, factory: Callable) -> None:
+        self.factory = factory
+        self.__entries: Dict[int, Dict[Hashable, object]] = {}
+        self.__lock = threading.Lock()
+
+    def get(self, scales, key: Hashable = None):
+        """Returns item *key* for *scales*, created on first access."""
+        with self.__lock:
+            entry = self.__entries.get(id(scales))
+            if entry is None:
+                try:
+                    weakref.finalize(scales, self.__entries.pop, id(scales), None)
+                except TypeError:  # not weak referenceable, do not cache
+                    return self.factory(scales, key)
+                entry = self.__entries[id(scales)] = {}
+            if key not in entry:
+                entry[key] = self.factory(scales, key)
+            return entry[key]
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+
+binsCache = ScalesCache(lambda scales, key: ScaleBins(scales.bins[key]))
+
+
+def scaleBins(scales, key: str) -> Optional[ScaleBins]:
+    """Returns bin table *key* (eg. `MU-ET`) of *scales* or None if no such
+    bin table exists.
+    """
+    if key not in scales.bins:
+        return None
+    return binsCache.get(scales, key)
@@ -0,0 +1,68 @@
+"""Scale metadata index.
+
+Provides lookups of scale metadata (rows of the scale set) by object type and
+scale type without scanning the scale set. The index is built once per scale
+set instance (see `scaleIndex`), usually when scales are attached to a menu.
+
+>>> index = scaleIndex(menu.scales)
+>>> index.get("MU", "ET")["maximum"]
+'255.5'
+>>> "JET" in index
+True
+"""
+
+from typing import Dict, Iterable, List, Tuple
+
+from .ScaleBins import ScalesCache
+
+__all__ = ["ScaleIndex", "scaleIndex"]
+
+kObject: str = "object"
+kType: str = "type"
+
+
+class ScaleIndex:
+    """Scale metadata keyed by object type and scale type and by object
+    type, keeps the order of the scale set.
+    """
+
+    def __init__(self, scales: Iterable) -> None:
+        self.__scales: Dict[Tuple[str, str], object] = {}
+        self.__objects: Dict[str, List] = {}
+        for scale in scales:
+            key = (scale[kObject], scale[kType])
+            self.__scales.setdefault(key, scale)
+            self.__objects.setdefault(key[0], []).append(scale)
+
+    def get(self, objectType: str, scaleType: str):
+        """Returns scale metadata of *objectType* and *scaleType* or None if
+        no such scale exists.
+        """
+        return self.__scales.get((objectType, scaleType))
+
+    def byObject(self, objectType: str) -> List:
+        """Returns list of scale metadata of *objectType*."""
+        return self.__objects.get(objectType, [])
+
+    def objectTypes(self) -> List[str]:
+        """Returns list of object types provided by the scale set."""
+        return list(self.__objects.keys())
+
+    def __contains__(self, objectType: str) -> bool:
+        return objectType in self.__objects
+
+    def __len__(self) -> int:
+        return len(self.__scales)
+
+
+EmptyScaleIndex = ScaleIndex([])
+"""Index of a menu without scale set."""
+
+indexCache = ScalesCache(lambda scales, key: ScaleIndex(scales.scales))
+
+
+def scaleIndex(scales) -> ScaleIndex:
+    """Returns scale metadata index of *scales*."""
+    if scales is None:
+        return EmptyScaleIndex
+    return indexCache.get(scales)
@@ -0,0 +1,208 @@
+"""Search index and queries for filtering menu tables.
+
+Every item is represented by a search entry holding its lower-cased search
+text and attribute values for token aware queries. Entries are built once per
+item and rebuilt only if the indexed attributes of an item changed.
+
+Query syntax: whitespace separated terms, all terms must match (double quotes
+group terms containing whitespace).
+
+    MU10            search text contains `mu10`
+    cut:MU-ETA_2p1  a cut name contains `mu-eta_2p1`
+    label:physics   a label contains `physics`
+    name:SingleMu   name contains `singlemu`
+    index:100-200   index in range 100 to 200 (inclusive)
+    index:42        index equals 42
+
+>>> index = SearchIndex(algorithmEntry, algorithmSignature)
+>>> query = SearchQuery("cut:MU-ETA index:0-10")
+>>> [algorithm for algorithm in menu.algorithms if query.matches(index.entry(algorithm))]
+"""
+
+import re
+import shlex
+from collections import namedtuple
+from typing import Callable, Dict, Hashable, Iterable, List, Tuple
+
+from .AlgorithmFormatter import AlgorithmFormatter
+from .ReferenceExtractor import extractReferences
+
+__all__ = [
+    "SearchEntry",
+    "SearchQuery",
+    "SearchIndex",
+    "algorithmEntry",
+    "algorithmSignature",
+    "cutEntry",
+    "cutSignature",
+]
+
+SearchEntry = namedtuple("SearchEntry", "text, fields, index")
+"""Search entry, *fields* maps query field names to tuples of lower-cased
+values, *index* is an optional integer.
+"""
+
+kCut = "cut"
+kIndex = "index"
+kLabel = "label"
+kName = "name"
+kObject = "object"
+kType = "type"
+
+QueryFields = (kCut, kLabel, kName, kObject, kType)
+"""Supported query fields matching values of search entries."""
+
+RegExRange = re.compile(r"^(\d+)(?:-(\d+))?$")
+
+
+def joinText(*values) -> str:
+    return "\n".join(format(value) for value in values if value not in (None, "")).lower()
+
+
+def lowerTuple(values) -> Tuple[str, ...]:
+    return tuple(format(value).lower() for value in values)
+
+
+def algorithmSignature(algorithm) -> Hashable:
+    """Returns attributes of an algorithm indexed by `algorithmEntry`."""
+    return (algorithm.index, algorithm.name, algorithm.expression, algorithm.comment, tuple(algorithm.labels))
+
+
+def algorithmEntry(algorithm) -> SearchEntry:
+    """Returns search entry of an algorithm covering index, name, expression
+    (raw and normalized), referenced cuts and objects, labels and comment.
+    """
+    try:
+        references = extractReferences(algorithm.expression)
+        cuts, objects = references.cuts, references.objects
+    except ValueError:
+        cuts, objects = (), ()
+    try:
+        normalized = AlgorithmFormatter.normalize(algorithm.expression)
+    except Exception:
+        normalized = ""
+    text = joinText(algorithm.index, algorithm.name, algorithm.expression, normalized,
+                    ", ".join(algorithm.labels), algorithm.comment)
+    fields = {
+        kCut: lowerTuple(cuts),
+        kLabel: lowerTuple(algorithm.labels),
+        kName: lowerTuple([algorithm.name]),
+        kObject: lowerTuple(objects),
+    }
+    return SearchEntry(text, fields, int(algorithm.index))
+
+
+def cutSignature(cut) -> Hashable:
+    """Returns attributes of a cut indexed by `cutEntry`."""
+    return (cut.name, cut.object, cut.type, cut.minimum, cut.maximum, cut.data, cut.comment)
+
+
+def cutEntry(cut) -> SearchEntry:
+    """Returns search entry of a cut covering name, object, type, range, data
+    and comment.
+    """
+    text = joinText(cut.name, cut.object, cut.type, cut.minimum, cut.maximum, cut.data, cut.comment)
+    fields = {
+        kCut: lowerTuple([cut.name]),
+        kName: lowerTuple([cut.name]),
+        kObject: lowerTuple([cut.object]),
+        kType: lowerTuple([cut.type]),
+    }
+    return SearchEntry(text, fields, None)
+
+
+class SearchQuery:
+    """Parsed filter query, all terms must match."""
+
+    def __init__(self, text: str) -> None:
+        self.text: str = text
+        self.terms: List[str] = []
+        self.fields: List[Tuple[str, str]] = []
+        self.ranges: List[Tuple[int, int]] = []
+        for token in self.split(text):
+            self.parseToken(token)
+
+    @staticmethod
+    def split(text: str) -> List[str]:
+        try:
+            return shlex.split(text)
+        except ValueError:  # unbalanced quotes while typing
+            return [token.strip("\"'") for token in text.split() if token.strip("\"'")]
+
+    def parseToken(self, token: str) -> None:
+        field, sep, value = token.partition(":")
+        field = field.lower()
+        if sep and value:
+            if field == kIndex:
+                result = RegExRange.match(value)
+                if result:
+                    first, last = result.groups()
+                    first = int(first)
+                    last = first if last is None else int(last)
+                    self.ranges.append((min(first, last), max(first, last)))
+                    return
+            elif field in QueryFields:
+                self.fields.append((field, value.lower()))
+                return
+        elif sep and field in QueryFields + (kIndex, ):
+            return  # incomplete term while typing
+        self.terms.append(token.lower())
+
+    def isEmpty(self) -> bool:
+        return not (self.terms or self.fields or self.ranges)
+
+    def matches(self, entry: SearchEntry) -> bool:
+        """Returns True if search *entry* matches all terms."""
+        for term in self.terms:
+            if term not in entry.text:
+                return False
+        for field, value in self.fields:
+            if not any(value in item for item in entry.fields.get(field, ())):
+                return False
+        for first, last in self.ranges:
+            if entry.index is None or not first <= entry.index <= last:
+                return False
+        return True
+
+
+class SearchIndex:
+    """Search entries of items, built by *factory* on first access and
+    rebuilt if the *signature* of an item changed.
+    """
+
+    def __init__(self, factory: Callable[[object], SearchEntry], signature: Callable[[object], Hashable]) -> None:
+        self.factory = factory
+        self.signature = signature
+        self.__entries: Dict[int, Tuple[object, Hashable, SearchEntry]] = {}
+
+    def entry(self, item) -> SearchEntry:
+        """Returns search entry of *item*."""
+        signature = self.signature(item)
+        cached = self.__entries.get(id(item))
+        if cached is not None and cached[0] is item and cached[1] == signature:
+            return cached[2]
+        entry = self.factory(item)
+        self.__entries[id(item)] = (item, signature, entry)
+        return entry
+
+    def remove(self, item) -> None:
+        """Remove entry of *item*."""
+        self.__entries.pop(id(item), None)
+
+    def prune(self, items: Iterable) -> None:
+        """Remove entries of items not contained in *items*."""
+        keep = {id(item) for item in items}
+        for key in [key for key in self.__entries if key not in keep]:
+            del self.__entries[key]
+
+    def clear(self) -> None:
+        self.__entries.clear()
+
+    def __len__(self) -> int:
+        return len(self.__entries)
+
+    def filter(self, items, query: SearchQuery) -> list:
+        """Returns items matching *query*."""
+        if query.isEmpty():
+            return list(items)
+        return [item for item in items if query.matches(self.entry(item))]
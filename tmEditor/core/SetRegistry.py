@@ -0,0 +1,102 @@
+"""Registry of shared scale and external signal sets.
+
+Scale and external signal sets are interned by their set name and a hash of
+their contents, so documents loading the same set share a single instance.
+Shared instances must be treated as read only. Instances are released as soon
+as no menu references them anymore.
+
+>>> menu.scales = internScales(scales)
+>>> menu.extSignals = internExtSignals(extSignals)
+"""
+
+import hashlib
+import threading
+import weakref
+from typing import Hashable, Optional, Tuple
+
+__all__ = [
+    "SetRegistry",
+    "scalesRegistry",
+    "extSignalsRegistry",
+    "scalesKey",
+    "extSignalsKey",
+    "internScales",
+    "internExtSignals",
+]
+
+kName = "name"
+
+
+def rowsDigest(digest, rows) -> None:
+    for row in rows:
+        digest.update(repr(sorted(dict(row).items())).encode("utf-8"))
+    digest.update(b"\0")
+
+
+def scalesKey(scales) -> Tuple[str, str]:
+    """Returns key of scale set, tuple of set name and content hash."""
+    digest = hashlib.sha256()
+    rowsDigest(digest, [scales.scaleSet])
+    rowsDigest(digest, scales.scales)
+    bins = scales.bins
+    for key in sorted(bins.keys()):
+        digest.update(key.encode("utf-8"))
+        rowsDigest(digest, bins[key])
+    return scales.scaleSet[kName], digest.hexdigest()
+
+
+def extSignalsKey(extSignals) -> Tuple[str, str]:
+    """Returns key of external signal set, tuple of set name and content hash."""
+    digest = hashlib.sha256()
+    rowsDigest(digest, [extSignals.extSignalSet])
+    rowsDigest(digest, extSignals.extSignals)
+    return extSignals.extSignalSet[kName], digest.hexdigest()
+
+
+class SetRegistry:
+    """Thread safe registry holding weak references to interned sets."""
+
+    def __init__(self) -> None:
+        self.__sets = weakref.WeakValueDictionary()
+        self.__lock = threading.Lock()
+
+    def get(self, key: Hashable):
+        """Returns interned instance for *key* or None."""
+        with self.__lock:
+            return self.__sets.get(key)
+
+    def intern(self, instance, key: Hashable):
+        """Returns interned instance for *key*, registers *instance* if no
+        such instance exists.
+        """
+        with self.__lock:
+            existing = self.__sets.get(key)
+            if existing is not None:
+                return existing
+            self.__sets[key] = instance
+            return instance
+
+    def __len__(self) -> int:
+        with self.__lock:
+            return len(self.__sets)
+
+
+scalesRegistry = SetRegistry()
+"""Shared scale sets."""
+
+extSignalsRegistry = SetRegistry()
+"""Shared external signal sets."""
+
+
+def internScales(scales, key: Optional[Hashable] = None):
+    """Returns shared instance of scale set *scales*."""
+    if scales is None:
+        return None
+    return scalesRegistry.intern(scales, key or scalesKey(scales))
+
+
+def internExtSignals(extSignals, key: Optional[Hashable] = None):
+    """Returns shared instance of external signal set *extSignals*."""
+    if extSignals is None:
+        return None
+    return extSignalsRegistry.intern(extSignals, key or extSignalsKey(extSignals))
@@ -24,3 +24,41 @@ class TableHelper:
         """Dump tables to XML file."""
         filename = str(filename)  # fixing unicode bug
         tmTable.menu2xml(self.menu, self.scale, self.extSignal, filename)
+
+
+def createRow(data: dict) -> tmTable.Row:
+    """Returns table row from dictionary."""
+    row = tmTable.Row()
+    for key, value in data.items():
+        row[key] = value
+    return row
+
+
+def toScale(scales) -> tmTable.Scale:
+    """Returns tmTable scale set, converts scale sets provided as plain Python
+    types (eg. `ScalesSnapshot`).
+    """
+    if isinstance(scales, tmTable.Scale):
+        return scales
+    scale = tmTable.Scale()
+    for key, value in scales.scaleSet.items():
+        scale.scaleSet[key] = value
+    for item in scales.scales:
+        scale.scales.append(createRow(item))
+    for key, bins in scales.bins.items():
+        scale.bins[key] = tuple(createRow(bin_) for bin_ in bins)
+    return scale
+
+
+def toExtSignal(extSignals) -> tmTable.ExtSignal:
+    """Returns tmTable external signal set, converts external signal sets
+    provided as plain Python types (eg. `ExtSignalsSnapshot`).
+    """
+    if isinstance(extSignals, tmTable.ExtSignal):
+        return extSignals
+    extSignal = tmTable.ExtSignal()
+    for key, value in extSignals.extSignalSet.items():
+        extSignal.extSignalSet[key] = value
+    for item in extSignals.extSignals:
+        extSignal.extSignals.append(createRow(item))
+    return extSignal
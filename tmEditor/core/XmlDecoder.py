@@ -2,7 +2,9 @@
 
 import logging
 import os
+import pickle
 import re
+from typing import Optional
 
 from packaging.version import Version
 from collections import namedtuple
@@ -16,6 +18,9 @@ from tmEditor.core import types
 from .toolbox import safe_str, decode_labels
 from .Queue import Queue
 from .TableHelper import TableHelper
+from .MenuCache import MenuCache
+from .SetRegistry import internScales, internExtSignals
+from .ScaleIndex import scaleIndex
 
 # -----------------------------------------------------------------------------
 #  Keys
@@ -47,6 +52,12 @@ kType = "type"
 kUUIDFirmware = "uuid_firmware"
 kUUIDMenu = "uuid_menu"
 
+DefaultBackend = "tmtable"
+"""Default XML decoder backend."""
+
+DefaultValidationWorkers = os.cpu_count() or 1
+"""Default number of worker processes validating algorithm expressions."""
+
 MirgrationResult = namedtuple("MirgrationResult", "subject,param,before,after")
 
 
@@ -100,13 +111,27 @@ class XmlDecoderError(Exception):
 
 
 class XmlDecoderQueue(Queue):
+    """XML decoder using tmTable, validating the XML file against the XSD.
+    Optional *workers* is the number of processes validating algorithm
+    expressions (see `Menu.validate`), validates in process if not set.
+    """
 
-    def __init__(self, filename):
+    def __init__(self, filename, cache: Optional[MenuCache] = None, workers: Optional[int] = None):
         super().__init__()
         self.filename = os.path.abspath(filename)
+        self.cache = cache
+        self.workers = workers
         self.applied_mirgrations = []
         self.menu = None
         self.add_callback(self.run_prepare, "check access rights")
+        if self.cache is not None:
+            self.add_callback(self.run_load_cache, "loading cached menu")
+        self.add_decoder_callbacks()
+        self.add_callback(self.run_verify_menu, "verifying menu integrity")
+        if self.cache is not None:
+            self.add_callback(self.run_store_cache, "updating menu cache")
+
+    def add_decoder_callbacks(self):
         self.add_callback(self.run_load_xml, "loading XML file")
         self.add_callback(self.run_version_check, "checking versions")
         self.add_callback(self.run_process_info, "loading menu information")
@@ -116,7 +141,6 @@ class XmlDecoderQueue(Queue):
         self.add_callback(self.run_process_externals, "loading external signals requirements")
         self.add_callback(self.run_process_scales, "loading scales")
         self.add_callback(self.run_process_ext_signals, "loading external signals")
-        self.add_callback(self.run_verify_menu, "verifying menu integrity")
 
     def run_prepare(self):
         logging.debug("checking file access rights...")
@@ -125,6 +149,13 @@ class XmlDecoderQueue(Queue):
             logging.error(message)
             raise XmlDecoderError(message)
 
+    def run_load_cache(self):
+        """Load unchanged menu from cache, skips all remaining steps."""
+        menu = self.cache.load(self.filename)
+        if menu is not None:
+            self.menu = menu
+            self.stop()
+
     def run_load_xml(self):
         logging.debug("Reading XML file from %r", self.filename)
         self.tables = TableHelper()
@@ -141,7 +172,9 @@ class XmlDecoderQueue(Queue):
             message = "Missing grammar version, corrupted file?"
             logging.error(message)
             raise XmlDecoderError(message)
-        version = self.tables.menu.menu[kGrammarVersion]
+        self.check_version(self.tables.menu.menu[kGrammarVersion])
+
+    def check_version(self, version):
         if not version:
             message = "Missing grammar version, corrupted file?"
             logging.error(message)
@@ -160,116 +193,174 @@ class XmlDecoderQueue(Queue):
     def run_process_info(self):
         logging.debug("adding menu info...")
         self.menu = Menu.Menu()
-        self.menu.menu.name = safe_str(self.tables.menu.menu[kName], "menu name")
-        self.menu.menu.comment = self.tables.menu.menu[kComment] if kComment in self.tables.menu.menu else ""
-        self.menu.menu.uuid_menu = self.tables.menu.menu[kUUIDMenu]
-        self.menu.menu.grammar_version = self.tables.menu.menu[kGrammarVersion]
+        self.decode_info(dict(self.tables.menu.menu))
+
+    def decode_info(self, row):
+        self.menu.menu.name = safe_str(row[kName], "menu name")
+        self.menu.menu.comment = row.get(kComment, "")
+        self.menu.menu.uuid_menu = row[kUUIDMenu]
+        self.menu.menu.grammar_version = row[kGrammarVersion]
 
         logging.debug("loaded menu information: %s", self.menu.menu.__dict__)
 
     def run_process_algorithms(self):
         logging.debug("adding algorithms...")
         for row in [dict(row) for row in self.tables.menu.algorithms]:
-            index = int(row[kIndex])
-            name = safe_str(row[kName], "algorithm name")
-            expression = row[kExpression]
-            comment = row.get(kComment, "")
-            labels = decode_labels(row.get(kLabels, ""))
-            algorithm = Algorithm.Algorithm(index, name, expression, comment, labels)
-            # Patch outdated expressions
-            result = mirgrate_mass_function(algorithm)
-            if result:
-                self.applied_mirgrations.append(result)
-            logging.debug("adding algorithm: %s", algorithm.__dict__)
-            self.menu.addAlgorithm(algorithm)
+            self.checkCanceled()
+            self.decode_algorithm(row)
+
+    def decode_algorithm(self, row):
+        index = int(row[kIndex])
+        name = safe_str(row[kName], "algorithm name")
+        expression = row[kExpression]
+        comment = row.get(kComment, "")
+        labels = decode_labels(row.get(kLabels, ""))
+        algorithm = Algorithm.Algorithm(index, name, expression, comment, labels)
+        # Patch outdated expressions
+        result = mirgrate_mass_function(algorithm)
+        if result:
+            self.applied_mirgrations.append(result)
+        logging.debug("adding algorithm: %s", algorithm.__dict__)
+        self.menu.addAlgorithm(algorithm)
 
     def run_process_cuts(self):
         logging.debug("adding cuts...")
         for cuts in self.tables.menu.cuts.values():
             for row in [dict(row) for row in cuts]:
-                name = safe_str(row[kName], "cut name")
-                object = row[kObject]
-                type = row[kType]
-                minimum = float(row[kMinimum])
-                maximum = float(row[kMaximum])
-                data = row[kData]
-                comment = row.get(kComment, "")
-                cut = Algorithm.Cut(name, object, type, minimum, maximum, data, comment)
-                # Migrate old formats
-                result = mirgrate_cut_object(cut)
-                if result:
-                    self.applied_mirgrations.append(result)
-                result = mirgrate_chgcor_cut(cut)
-                if result:
-                    self.applied_mirgrations.append(result)
-                if cut.type not in types.CutTypes:
-                    message = "Unsupported cut type {0} (grammar version <= {1})".format(cut.type, Menu.GrammarVersion)
-                    logging.error(message)
-                    raise XmlDecoderError(message)
-                if not self.menu.cutByName(cut.name):
-                    logging.debug("adding cut: %s", cut.__dict__)
-                    self.menu.addCut(cut)
+                self.checkCanceled()
+                self.decode_cut(row)
+
+    def decode_cut(self, row):
+        name = safe_str(row[kName], "cut name")
+        object = row[kObject]
+        type = row[kType]
+        minimum = float(row[kMinimum])
+        maximum = float(row[kMaximum])
+        data = row[kData]
+        comment = row.get(kComment, "")
+        cut = Algorithm.Cut(name, object, type, minimum, maximum, data, comment)
+        # Migrate old formats
+        result = mirgrate_cut_object(cut)
+        if result:
+            self.applied_mirgrations.append(result)
+        result = mirgrate_chgcor_cut(cut)
+        if result:
+            self.applied_mirgrations.append(result)
+        if cut.type not in types.CutTypes:
+            message = "Unsupported cut type {0} (grammar version <= {1})".format(cut.type, Menu.GrammarVersion)
+            logging.error(message)
+            raise XmlDecoderError(message)
+        if not self.menu.cutByName(cut.name):
+            logging.debug("adding cut: %s", cut.__dict__)
+            self.menu.addCut(cut)
 
     def run_process_objects(self):
         logging.debug("adding object requirements...")
         for objs in self.tables.menu.objects.values():
             for row in [dict(row) for row in objs]:
-                name = safe_str(row[kName], "object name")
-                type = row[kType]
-                threshold = row[kThreshold]
-                comparison_operator = row[kComparisonOperator]
-                bx_offset = int(row[kBxOffset])
-                comment = row.get(kComment, "")
-                obj = Algorithm.Object(name, type, threshold, comparison_operator, bx_offset, comment)
-                all_types = types.ObjectTypes + types.SignalTypes
-                if obj.type not in all_types:
-                    message = "Unsupported object type {0} (grammar version <= {1})".format(obj.type, Menu.GrammarVersion)
-                    logging.error(message)
-                    raise XmlDecoderError(message)
-                if obj.type in types.ObjectTypes:
-                    if obj.type not in [scaleSet[kObject] for scaleSet in self.tables.scale.scales]:
-                        algorithm = self.menu.algorithmsByObject(obj)[0]
-                        message = "Object type {0!r} assigned to algorithm {1!r} {2!r} is missing in scales set {3!r}".format(obj.type, algorithm.index, algorithm.name, self.tables.scale.scaleSet[kName])
-                        logging.error(message)
-                        raise XmlDecoderError(message)
-                if not obj in self.menu.objects:
-                    logging.debug("adding object requirement: %s", obj.__dict__)
-                    self.menu.addObject(obj)
+                self.checkCanceled()
+                obj = self.decode_object(row)
+                self.check_object_scales(obj, self.tables.scale)
+
+    def decode_object(self, row):
+        name = safe_str(row[kName], "object name")
+        type = row[kType]
+        threshold = row[kThreshold]
+        comparison_operator = row[kComparisonOperator]
+        bx_offset = int(row[kBxOffset])
+        comment = row.get(kComment, "")
+        obj = Algorithm.Object(name, type, threshold, comparison_operator, bx_offset, comment)
+        all_types = types.ObjectTypes + types.SignalTypes
+        if obj.type not in all_types:
+            message = "Unsupported object type {0} (grammar version <= {1})".format(obj.type, Menu.GrammarVersion)
+            logging.error(message)
+            raise XmlDecoderError(message)
+        if not obj in self.menu.objects:
+            logging.debug("adding object requirement: %s", obj.__dict__)
+            self.menu.addObject(obj)
+        return obj
+
+    def check_object_scales(self, obj, scales):
+        """Verify that object type is part of the scale set."""
+        if obj.type in types.ObjectTypes:
+            if obj.type not in scaleIndex(scales):
+                algorithm = self.menu.algorithmsByObject(obj)[0]
+                message = "Object type {0!r} assigned to algorithm {1!r} {2!r} is missing in scales set {3!r}".format(obj.type, algorithm.index, algorithm.name, scales.scaleSet[kName])
+                logging.error(message)
+                raise XmlDecoderError(message)
 
     def run_process_externals(self):
         logging.debug("adding external signals...")
-        ext_signal_names = [item[kName] for item in self.tables.extSignal.extSignals]
-        ext_signal_set_name = self.tables.extSignal.extSignalSet[kName]
         for externals in self.tables.menu.externals.values():
             for row in [dict(row) for row in externals]:
-                name = safe_str(row[kName], "external signal name")
-                bx_offset = int(row[kBxOffset])
-                comment = row.get(kComment, "")
-                external = Algorithm.External(name, bx_offset, comment)
-                # Verify that all external signals are part of the external signal set.
-                if external.signal_name not in ext_signal_names:
-                    message = "External signal {0!r} is missing in external signal set {1!r}".format(external.basename, ext_signal_set_name)
-                    logging.error(message)
-                    raise XmlDecoderError(message)
-                if external not in self.menu.externals:
-                    logging.debug("adding external signal: %s", external.__dict__)
-                    self.menu.addExternal(external)
+                self.checkCanceled()
+                external = self.decode_external(row)
+                self.check_external_signal(external, self.tables.extSignal)
+
+    def decode_external(self, row):
+        name = safe_str(row[kName], "external signal name")
+        bx_offset = int(row[kBxOffset])
+        comment = row.get(kComment, "")
+        external = Algorithm.External(name, bx_offset, comment)
+        if external not in self.menu.externals:
+            logging.debug("adding external signal: %s", external.__dict__)
+            self.menu.addExternal(external)
+        return external
+
+    def check_external_signal(self, external, extSignals):
+        """Verify that all external signals are part of the external signal set."""
+        ext_signal_names = [item[kName] for item in extSignals.extSignals]
+        if external.signal_name not in ext_signal_names:
+            ext_signal_set_name = extSignals.extSignalSet[kName]
+            message = "External signal {0!r} is missing in external signal set {1!r}".format(external.basename, ext_signal_set_name)
+            logging.error(message)
+            raise XmlDecoderError(message)
 
     def run_process_scales(self):
         logging.debug("adding scales...")
-        self.menu.scales = self.tables.scale
+        self.menu.scales = internScales(self.tables.scale)
 
     def run_process_ext_signals(self):
         logging.debug("adding external signal sets...")
-        self.menu.extSignals = self.tables.extSignal
+        self.menu.extSignals = internExtSignals(self.tables.extSignal)
 
     def run_verify_menu(self):
         logging.debug("verify menu integrity...")
-        self.menu.validate()
+        self.menu.validate(workers=self.workers, callback=self.checkCanceled)
+
+    def run_store_cache(self):
+        """Store menu to cache, migrated menus are not cached to report applied
+        migrations on every load.
+        """
+        if self.applied_mirgrations:
+            return
+        try:
+            self.cache.store(self.filename, self.menu)
+        except (OSError, pickle.PicklingError) as exc:
+            logging.warning("failed to cache menu %r: %s", self.filename, exc)
 
 
-def load(filename):
+def createQueue(filename, cache: Optional[MenuCache] = None, backend: Optional[str] = None,
+                workers: Optional[int] = None) -> XmlDecoderQueue:
+    """Returns decoder queue for *filename* using decoder *backend* (`tmtable`
+    or `stream`), defaults to environment variable `TM_EDITOR_XML_DECODER` or
+    `tmtable` if not set. Algorithm expressions are validated using up to
+    *workers* processes, defaults to the number of CPUs.
+    """
+    backend = backend or os.getenv("TM_EDITOR_XML_DECODER") or DefaultBackend
+    workers = DefaultValidationWorkers if workers is None else workers
+    if backend == "tmtable":
+        return XmlDecoderQueue(filename, cache, workers)
+    if backend == "stream":
+        from .XmlStreamDecoder import XmlStreamDecoderQueue
+        return XmlStreamDecoderQueue(filename, cache, workers)
+    message = "invalid XML decoder backend: {0!r}".format(backend)
+    logging.error(message)
+    raise ValueError(message)
+
+
+def load(filename, cache: Optional[MenuCache] = None, backend: Optional[str] = None, workers: Optional[int] = None):
     """Read XML menu from *filename*. Returns menu object."""
-    queue = XmlDecoderQueue(filename)
+    queue = createQueue(filename, cache, backend, workers)
     queue.exec_()
     return queue.menu
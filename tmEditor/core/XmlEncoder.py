@@ -1,17 +1,26 @@
-"""XML encoder."""
+"""XML encoder.
+
+The XML file is written to a temporary file in the target's directory, synced
+to disk and atomically renamed to the target filename, so an interrupted save
+never leaves a truncated menu behind.
+"""
 
 import functools
 import logging
 import os
+import tempfile
+from collections import namedtuple
+from typing import Optional
 
 import tmTable
 
 from tmEditor.core import toolbox
 
 from .toolbox import safe_str, encode_labels
-from .TableHelper import TableHelper
+from .TableHelper import TableHelper, createRow, toScale, toExtSignal
 from .Queue import Queue
 from .AlgorithmFormatter import AlgorithmFormatter
+from .ReferenceExtractor import extractReferences
 
 kAncestorId = "ancestor_id"
 kBxOffset = "bx_offset"
@@ -43,9 +52,26 @@ kType = "type"
 kUUIDFirmware = "uuid_firmware"
 kUUIDMenu = "uuid_menu"
 
+DefaultBackend = "tmtable"
+"""Default XML encoder backend."""
+
 DEFAULT_UUID = "00000000-0000-0000-0000-000000000000"
 """Empty UUID"""
 
+
+def currentUmask() -> int:
+    """Returns the file mode creation mask of the process. Temporarily
+    changes the process wide mask, call only while no other threads are
+    creating files (eg. at import time).
+    """
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+ProcessUmask = currentUmask()
+"""File mode creation mask read once at import time."""
+
 FORMAT_FLOAT = "+23.16E"
 """Floating point string format."""
 
@@ -78,194 +104,302 @@ def chdir(directory):
     return decorate
 
 
+def fsync(filename: str) -> None:
+    """Flush file contents of *filename* to disk."""
+    with open(filename, "rb") as fp:
+        os.fsync(fp.fileno())
+
+
+def fsyncDirectory(directory: str) -> None:
+    """Flush directory entries of *directory* to disk (if supported by the
+    platform) making a preceding rename durable.
+    """
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return  # not supported (eg. on Windows)
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def atomicReplace(source: str, target: str) -> None:
+    """Sync file *source* to disk and atomically rename it to *target*.
+    Applies the permissions of an existing *target* or the default permissions
+    for new files.
+    """
+    fsync(source)
+    if os.path.isfile(target):
+        os.chmod(source, os.stat(target).st_mode & 0o7777)
+    else:
+        os.chmod(source, 0o666 & ~ProcessUmask)
+    os.replace(source, target)
+    fsyncDirectory(os.path.dirname(os.path.abspath(target)))
+
+
 class XmlEncoderError(Exception):
     """Exeption for XML encoder errors."""
     def __init__(self, message):
         super().__init__(message)
 
 
+def menuInfoRow(info) -> dict:
+    """Returns menu information row."""
+    return {
+        kName: safe_str(info.name, "menu name"),
+        kComment: safe_str(info.comment, "comment"),
+        kUUIDMenu: info.uuid_menu,
+        kUUIDFirmware: DEFAULT_UUID,
+        kGrammarVersion: info.grammar_version,
+        kNModules: "0",
+        kIsValid: "1",
+        kIsObsolete: "0",
+        kAncestorId: "0",
+        kGlobalTag: "",
+    }
+
+
+def algorithmRow(algorithm) -> dict:
+    """Returns algorithm row."""
+    return {
+        kIndex: format(algorithm.index, FORMAT_INDEX),
+        kModuleId: "0",
+        kModuleIndex: format(algorithm.index, FORMAT_INDEX),
+        kName: safe_str(algorithm.name, "algorithm name"),
+        kExpression: AlgorithmFormatter.compress(algorithm.expression),
+        kComment: algorithm.comment,
+        kLabels: encode_labels(algorithm.labels),
+    }
+
+
+def objectRow(object_) -> dict:
+    """Returns object requirement row."""
+    return {
+        kName: safe_str(object_.name, "object name"),
+        kType: object_.type,
+        kThreshold: format(object_.decodeThreshold(), FORMAT_FLOAT),
+        kComparisonOperator: object_.comparison_operator,
+        kBxOffset: format(object_.bx_offset, FORMAT_BX_OFFSET),
+    }
+
+
+def externalRow(external) -> dict:
+    """Returns external signal requirement row."""
+    return {
+        kName: safe_str(external.name, "external_name"),
+        kBxOffset: format(external.bx_offset, FORMAT_BX_OFFSET),
+    }
+
+
+def cutRow(cut) -> dict:
+    """Returns cut row."""
+    row = {
+        kName: safe_str(cut.name, "cut name"),
+        kObject: cut.object,
+        kType: cut.type,
+    }
+    if cut.data:
+        row[kMinimum] = format(0., FORMAT_FLOAT)
+        row[kMaximum] = format(0., FORMAT_FLOAT)
+        row[kData] = cut.data
+    else:
+        row[kMinimum] = format(float(cut.minimum), FORMAT_FLOAT)
+        row[kMaximum] = format(float(cut.maximum), FORMAT_FLOAT)
+        row[kData] = ""
+    row[kComment] = cut.comment
+    return row
+
+
+AlgorithmRows = namedtuple("AlgorithmRows", "algorithm, objects, externals, cuts")
+"""Rows of an algorithm and its requirements."""
+
+
 class XmlEncoderQueue(Queue):
+    """XML encoder using tmTable."""
 
     def __init__(self, menu, filename):
         super().__init__()
         self.menu = menu
-        self.filename = os.path.abspath(filename)
+        # Resolve symbolic links to write through them, the temporary file is
+        # created next to and replaces the actual file.
+        self.filename = os.path.realpath(filename)
+        self.tempfilename = None
+        self.rows = []
         self.add_callback(self.run_prepare, "preparing writing to file")
         self.add_callback(self.run_process_info, "preparing menu info")
-        self.add_callback(self.run_process_algorithms, "preparing algorithms")
-        self.add_callback(self.run_process_objects, "preparing objects")
-        self.add_callback(self.run_process_externals, "preparing external signals")
-        self.add_callback(self.run_process_cuts, "preparing cuts")
-        self.add_callback(self.run_dump_xml, "writing XML file")
+        self.add_callback(self.run_collect_rows, "preparing algorithms")
+        self.add_encoder_callbacks()
         self.add_callback(self.run_verify_dump, "verifying written file")
+        self.add_callback(self.run_replace, "replacing file")
 
-    def run_prepare(self):
-        """Write XML menu to *filename*. This regenerates the UUID."""
-        logging.debug("preparing menu to write to `%s`", self.filename)
+    def add_encoder_callbacks(self):
+        self.add_callback(self.run_process_algorithms, "preparing tables")
+        self.add_callback(self.run_dump_xml, "writing XML file")
 
+    def check_access(self):
         # WORKAROUND (menu2xml() will not fail on permission denied)
         """Test if target filename is writeable by the user."""
-        target = self.filename
-        if not os.path.isfile(target):
-            target = os.path.dirname(target)
-        if not os.access(target, os.W_OK):
-            message = "permission denied `{0}`".format(self.filename)
-            logging.error(message)
-            raise XmlEncoderError(message)
+        # Note: the temporary file requires the target directory to be writeable.
+        targets = [os.path.dirname(self.filename)]
+        if os.path.isfile(self.filename):
+            targets.append(self.filename)
+        for target in targets:
+            if not os.access(target, os.W_OK):
+                message = "permission denied `{0}`".format(self.filename)
+                logging.error(message)
+                raise XmlEncoderError(message)
+
+    def run_prepare(self):
+        """Write XML menu to *filename*. This regenerates the UUID."""
+        logging.debug("preparing menu to write to `%s`", self.filename)
+        self.check_access()
 
         # Setup tables
         self.tables = TableHelper()
-        self.tables.scale = self.menu.scales
-        self.tables.extSignal = self.menu.extSignals
+        self.tables.scale = toScale(self.menu.scales)
+        self.tables.extSignal = toExtSignal(self.menu.extSignals)
 
-    @chdir(toolbox.getXsdDir())
     def run_process_info(self):
-        # Create a new menu instance.
-        self.tables.menu = tmTable.Menu()
-
         # Regenerate UUID and version
         self.menu.menu.regenerate()
         logging.debug("regenerated menu UUID to: %s", self.menu.menu.uuid_menu)
         logging.debug("updated grammar version to: %s", self.menu.menu.grammar_version)
 
-        # Menu inforamtion
-        self.tables.menu.menu[kName] = safe_str(self.menu.menu.name, "menu name")
-        self.tables.menu.menu[kComment] = safe_str(self.menu.menu.comment, "comment")
-        self.tables.menu.menu[kUUIDMenu] = self.menu.menu.uuid_menu
-        self.tables.menu.menu[kUUIDFirmware] = DEFAULT_UUID
-        self.tables.menu.menu[kGrammarVersion] = self.menu.menu.grammar_version
-        self.tables.menu.menu[kNModules] = "0"
-        self.tables.menu.menu[kIsValid] = "1"
-        self.tables.menu.menu[kIsObsolete] = "0"
-        self.tables.menu.menu[kAncestorId] = "0"
-        self.tables.menu.menu[kGlobalTag] = ""
-
-        logging.debug("menu information: %s", dict(self.tables.menu.menu))
-
-    @chdir(toolbox.getXsdDir())
-    def run_process_algorithms(self):
-        for algorithm in self.menu.algorithms:
-            # Create algorithm row
-            row = tmTable.Row()
-            row[kIndex] = format(algorithm.index, FORMAT_INDEX)
-            row[kModuleId] = "0"
-            row[kModuleIndex] = format(algorithm.index, FORMAT_INDEX)
-            row[kName] = safe_str(algorithm.name, "algorithm name")
-            row[kExpression] = AlgorithmFormatter.compress(algorithm.expression)
-            row[kComment] = algorithm.comment
-            row[kLabels] = encode_labels(algorithm.labels)
-            # Validate algorithm row
-            if not tmTable.isAlgorithm(row):
-                message = "invalid algorithm ({algorithm.index}): {algorithm.name}".format(algorithm=algorithm)
-                logging.error(message)
-                raise XmlEncoderError(message)
-            # Append algorithm row
-            logging.debug("appending algorithm: %s", dict(row))
-            self.tables.menu.algorithms.append(row)
-
-    @chdir(toolbox.getXsdDir())
-    def run_process_objects(self):
+    def run_collect_rows(self):
+        """Create rows of all algorithms and their requirements in a single
+        pass using cached references.
+        """
+        self.rows = []
         for algorithm in self.menu.algorithms:
-            # Objects
-            if algorithm.name not in self.tables.menu.objects.keys():
-                self.tables.menu.objects[algorithm.name] = []
-            for name in algorithm.objects():
+            self.checkCanceled()
+            references = extractReferences(algorithm.expression)
+            objects = []
+            for name in references.objects:
                 object_ = self.menu.objectByName(name)
                 if not object_:
                     message = "missing object requirement: {0}".format(name)
                     logging.error(message)
                     raise XmlEncoderError(message)
-                # Create object row
-                row = tmTable.Row()
-                row[kName] = safe_str(object_.name, "object name")
-                row[kType] = object_.type
-                row[kThreshold] = format(object_.decodeThreshold(), FORMAT_FLOAT)
-                row[kComparisonOperator] = object_.comparison_operator
-                row[kBxOffset] = format(object_.bx_offset, FORMAT_BX_OFFSET)
-                # Validate object row
-                if not tmTable.isObjectRequirement(row):
-                    message = "invalid object requirement: {0}".format(name)
-                    logging.error(message)
-                    raise XmlEncoderError(message)
-                # Append object trow
-                logging.debug("appending object requirement: %s", dict(row))
-                self.tables.menu.objects[algorithm.name] = self.tables.menu.objects[algorithm.name] + (row, )
-
-    @chdir(toolbox.getXsdDir())
-    def run_process_externals(self):
-        for algorithm in self.menu.algorithms:
-            # Externals
-            if algorithm.name not in self.tables.menu.externals.keys():
-                self.tables.menu.externals[algorithm.name] = []
-            for name in algorithm.externals():
+                objects.append(objectRow(object_))
+            externals = []
+            for name in references.externals:
                 external = self.menu.externalByName(name)
                 if not external:
                     message = "missing external signal: {0}".format(name)
                     logging.error(message)
                     raise XmlEncoderError(message)
-                # Create external row
-                row = tmTable.Row()
-                row[kName] = safe_str(external.name, "external_name")
-                row[kBxOffset] = format(external.bx_offset, FORMAT_BX_OFFSET)
-                # Validate external row
-                if not tmTable.isExternalRequirement(row):
-                    message = "invalid external signal: {0}".format(name)
-                    logging.error(message)
-                    raise XmlEncoderError(message)
-                # Append external row
-                logging.debug("appending external signal: %s", dict(row))
-                self.tables.menu.externals[algorithm.name] = self.tables.menu.externals[algorithm.name] + (row, )
-
-    @chdir(toolbox.getXsdDir())
-    def run_process_cuts(self):
-        for algorithm in self.menu.algorithms:
-            # Cuts
-            if algorithm.name not in self.tables.menu.cuts.keys():
-                self.tables.menu.cuts[algorithm.name] = []
-            for name in algorithm.cuts():
-                logging.debug("processing cut: %s", name)
+                externals.append(externalRow(external))
+            cuts = []
+            for name in references.cuts:
                 cut = self.menu.cutByName(name)
                 if not cut:
                     message = "missing cut: {0}".format(name)
                     logging.error(message)
                     raise XmlEncoderError(message)
-                # Create cut row
-                row = tmTable.Row()
-                row[kName] = safe_str(cut.name, "cut name")
-                row[kObject] = cut.object
-                row[kType] = cut.type
-                if cut.data:
-                    row[kMinimum] = format(0., FORMAT_FLOAT)
-                    row[kMaximum] = format(0., FORMAT_FLOAT)
-                    row[kData] = cut.data
-                else:
-                    row[kMinimum] = format(float(cut.minimum), FORMAT_FLOAT)
-                    row[kMaximum] = format(float(cut.maximum), FORMAT_FLOAT)
-                    row[kData] = ""
-                row[kComment] = cut.comment
-                # Validate cut row
-                if not tmTable.isCut(row):
-                    message = "invalid cut: {0}".format(name)
-                    logging.error(message)
-                    raise XmlEncoderError(message)
-                # Append cut row
-                logging.debug("appending cut: %s", dict(row))
-                self.tables.menu.cuts[algorithm.name] = self.tables.menu.cuts[algorithm.name] + (row, )
+                cuts.append(cutRow(cut))
+            self.rows.append(AlgorithmRows(algorithmRow(algorithm), objects, externals, cuts))
+
+    def create_row(self, data: dict, validate, message: str):
+        row = createRow(data)
+        if not validate(row):
+            logging.error(message)
+            raise XmlEncoderError(message)
+        return row
+
+    @chdir(toolbox.getXsdDir())
+    def run_process_algorithms(self):
+        # Create a new menu instance.
+        self.tables.menu = tmTable.Menu()
+
+        # Menu inforamtion
+        for key, value in menuInfoRow(self.menu.menu).items():
+            self.tables.menu.menu[key] = value
+        logging.debug("menu information: %s", dict(self.tables.menu.menu))
+
+        for rows in self.rows:
+            self.checkCanceled()
+            name = rows.algorithm[kName]
+            # Create algorithm row
+            message = "invalid algorithm ({0}): {1}".format(rows.algorithm[kIndex], name)
+            row = self.create_row(rows.algorithm, tmTable.isAlgorithm, message)
+            logging.debug("appending algorithm: %s", dict(row))
+            self.tables.menu.algorithms.append(row)
+            # Create requirement rows, assigned once per algorithm
+            self.tables.menu.objects[name] = tuple(
+                self.create_row(item, tmTable.isObjectRequirement, "invalid object requirement: {0}".format(item[kName]))
+                for item in rows.objects
+            )
+            self.tables.menu.externals[name] = tuple(
+                self.create_row(item, tmTable.isExternalRequirement, "invalid external signal: {0}".format(item[kName]))
+                for item in rows.externals
+            )
+            self.tables.menu.cuts[name] = tuple(
+                self.create_row(item, tmTable.isCut, "invalid cut: {0}".format(item[kName]))
+                for item in rows.cuts
+            )
+
+    def create_tempfile(self):
+        """Create temporary file next to the target."""
+        directory, basename = os.path.split(self.filename)
+        fd, self.tempfilename = tempfile.mkstemp(prefix=f".{basename}.", suffix=".tmp", dir=directory)
+        os.close(fd)
 
     @chdir(toolbox.getXsdDir())
     def run_dump_xml(self):
-        # Write to XML file.
-        logging.debug("writing XML file to %r", self.filename)
-        self.tables.dump(self.filename)
+        # Write to temporary XML file next to the target.
+        self.create_tempfile()
+        logging.debug("writing XML file to %r", self.tempfilename)
+        self.tables.dump(self.tempfilename)
 
     def run_verify_dump(self):
         # WORKAROUND (check if file was written)
-        if not os.path.isfile(self.filename):
+        if not os.path.isfile(self.tempfilename) or not os.path.getsize(self.tempfilename):
             message = "failed to write to file {0!r}".format(self.filename)
             logging.error(message)
             raise XmlEncoderError(message)
 
+    def run_replace(self):
+        logging.debug("replacing %r by %r", self.filename, self.tempfilename)
+        try:
+            atomicReplace(self.tempfilename, self.filename)
+        except OSError as exc:
+            message = "failed to write to file {0!r}: {1}".format(self.filename, exc)
+            logging.error(message)
+            raise XmlEncoderError(message) from exc
+        self.tempfilename = None
+
+    def discard(self) -> None:
+        """Remove temporary file left behind by a failed or canceled queue."""
+        if self.tempfilename and os.path.exists(self.tempfilename):
+            logging.debug("removing temporary file %r", self.tempfilename)
+            os.remove(self.tempfilename)
+        self.tempfilename = None
+
+
+def createQueue(menu, filename, backend: Optional[str] = None, validate: bool = True) -> XmlEncoderQueue:
+    """Returns encoder queue writing *menu* to *filename* using encoder
+    *backend* (`tmtable` or `stream`), defaults to environment variable
+    `TM_EDITOR_XML_ENCODER` or `tmtable` if not set. Unless *validate* is
+    cleared, the stream backend validates the written file against the XSD.
+    """
+    backend = backend or os.getenv("TM_EDITOR_XML_ENCODER") or DefaultBackend
+    if backend == "tmtable":
+        return XmlEncoderQueue(menu, filename)
+    if backend == "stream":
+        from .XmlStreamEncoder import XmlStreamEncoderQueue
+        return XmlStreamEncoderQueue(menu, filename, validate)
+    message = "invalid XML encoder backend: {0!r}".format(backend)
+    logging.error(message)
+    raise ValueError(message)
+
 
-def dump(menu, filename):
-    queue = XmlEncoderQueue(menu, filename)
-    queue.exec_()
+def dump(menu, filename, backend: Optional[str] = None):
+    queue = createQueue(menu, filename, backend)
+    try:
+        queue.exec_()
+    except Exception:
+        queue.discard()
+        raise
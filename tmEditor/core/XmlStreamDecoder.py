@@ -0,0 +1,159 @@
+"""Streaming XML decoder.
+
+Alternative decoder backend reading the XML file incrementally using
+`xml.etree.ElementTree.iterparse`. Algorithms, cuts, object and external
+signal requirements as well as scale bins are added to the menu as soon as
+their elements are parsed, processed elements are released immediately.
+
+Scales and external signal sets are provided as plain Python types (see
+`ScalesSnapshot` and `ExtSignalsSnapshot`) instead of tmTable tables.
+
+Note: this backend does not validate the XML file against the XSD.
+
+>>> queue = XmlStreamDecoderQueue(filename)
+>>> queue.exec_()
+>>> menu = queue.menu
+"""
+
+import logging
+import xml.etree.ElementTree as ElementTree
+
+from tmEditor.core import Menu
+
+from .Menu import ScalesSnapshot, ExtSignalsSnapshot
+from .SetRegistry import internScales, internExtSignals
+from .XmlDecoder import XmlDecoderQueue, XmlDecoderError
+from .XmlDecoder import kGrammarVersion, kName, kObject, kType
+
+__all__ = ["XmlStreamDecoderQueue", "load"]
+
+kAlgorithm = "algorithm"
+kBin = "bin"
+kCut = "cut"
+kExtSignal = "ext_signal"
+kExtSignalSet = "ext_signal_set"
+kExternalRequirement = "external_requirement"
+kObjectRequirement = "object_requirement"
+kScale = "scale"
+kScaleSet = "scale_set"
+
+Children = None
+"""Record key collecting composite child elements."""
+
+
+class XmlStreamDecoderQueue(XmlDecoderQueue):
+    """XML decoder streaming contents into the menu."""
+
+    def add_decoder_callbacks(self):
+        self.add_callback(self.run_stream_xml, "loading XML file")
+        self.add_callback(self.run_check_requirements, "checking requirements")
+
+    def run_stream_xml(self):
+        logging.debug("Streaming XML file from %r", self.filename)
+        self.menu = Menu.Menu()
+        self.scaleSet = {}
+        self.scales = []
+        self.bins = {}
+        self.extSignalSet = {}
+        self.extSignals = []
+        try:
+            self.stream()
+        except ElementTree.ParseError as exc:
+            message = "Failed to read XML menu {0!r}\n{1}".format(self.filename, exc)
+            logging.error(message)
+            raise XmlDecoderError(message) from exc
+        self.menu.scales = internScales(ScalesSnapshot(self.scaleSet, self.scales, self.bins))
+        self.menu.extSignals = internExtSignals(ExtSignalsSnapshot(self.extSignalSet, self.extSignals))
+
+    def stream(self):
+        """Parse XML file element by element. Every element is represented by
+        a record (dictionary), leaf elements are assigned as text to their
+        parent's record, composite elements are passed to `process_record`.
+        """
+        records = []
+        root = None
+        for event, element in ElementTree.iterparse(self.filename, events=("start", "end")):
+            if event == "start":
+                if root is None:
+                    root = element
+                records.append({})
+                continue
+            record = records.pop()
+            if not records:
+                self.process_info(record)
+                break
+            parent = records[-1]
+            if record:
+                self.process_record(element.tag, record, parent, len(records))
+            else:
+                parent[element.tag] = element.text or ""
+                if len(records) == 1 and element.tag == kGrammarVersion:
+                    self.check_version(parent[kGrammarVersion])
+            element.clear()
+            if len(records) == 1:
+                root.clear()  # release processed top level elements
+        else:
+            message = "Missing root element, corrupted file?"
+            logging.error(message)
+            raise XmlDecoderError(message)
+
+    def process_info(self, record):
+        if kGrammarVersion not in record:
+            message = "Missing grammar version, corrupted file?"
+            logging.error(message)
+            raise XmlDecoderError(message)
+        self.decode_info(record)
+
+    def process_record(self, tag, record, parent, depth):
+        if depth == 1 and tag == kAlgorithm:
+            self.checkCanceled()
+            self.process_algorithm(record)
+        elif depth == 1 and tag == kScaleSet:
+            record.pop(Children, None)
+            self.scaleSet.update(record)
+        elif depth == 1 and tag == kExtSignalSet:
+            record.pop(Children, None)
+            self.extSignalSet.update(record)
+        elif depth == 2 and tag == kScale:
+            self.checkCanceled()
+            children = record.pop(Children, [])
+            self.scales.append(record)
+            bins = [child for childTag, child in children if childTag == kBin]
+            if bins:
+                self.bins[f"{record[kObject]}-{record[kType]}"] = bins
+        elif depth == 2 and tag == kExtSignal:
+            self.extSignals.append(record)
+        else:
+            parent.setdefault(Children, []).append((tag, record))
+
+    def process_algorithm(self, record):
+        """Add algorithm and its requirements, requirements are distinguished
+        by their element tags.
+        """
+        children = record.pop(Children, [])
+        self.decode_algorithm(record)
+        for tag, child in children:
+            if tag == kObjectRequirement:
+                self.decode_object(child)
+            elif tag == kCut:
+                self.decode_cut(child)
+            elif tag == kExternalRequirement:
+                self.decode_external(child)
+            else:
+                message = "Unknown element <{0}> of algorithm {1!r}, corrupted file?".format(tag, record.get(kName))
+                logging.error(message)
+                raise XmlDecoderError(message)
+
+    def run_check_requirements(self):
+        logging.debug("checking requirements...")
+        for obj in self.menu.objects:
+            self.check_object_scales(obj, self.menu.scales)
+        for external in self.menu.externals:
+            self.check_external_signal(external, self.menu.extSignals)
+
+
+def load(filename):
+    """Read XML menu from *filename*. Returns menu object."""
+    queue = XmlStreamDecoderQueue(filename)
+    queue.exec_()
+    return queue.menu
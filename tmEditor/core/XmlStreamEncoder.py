@@ -0,0 +1,145 @@
+"""Streaming XML encoder.
+
+Alternative encoder backend writing the XML file directly from the menu using
+a buffered writer, without building tmTable tables. Rows of all algorithms and
+their requirements are created in a single pass (see `XmlEncoderQueue`).
+
+The output is equivalent to `tmTable.menu2xml` in contents but not byte
+identical (element order and empty element form may differ), the backend is
+therefore opt-in (`TM_EDITOR_XML_ENCODER=stream`). The written file is
+validated against the XSD (using tmTable) by default.
+
+>>> queue = XmlStreamEncoderQueue(menu, filename)
+>>> queue.exec_()
+"""
+
+import logging
+from typing import Iterable, TextIO, Tuple
+from xml.sax.saxutils import escape
+
+from .TableHelper import TableHelper
+from .XmlEncoder import XmlEncoderQueue, XmlEncoderError
+from .XmlEncoder import menuInfoRow
+
+__all__ = ["XmlStreamEncoderQueue", "dump"]
+
+kAlgorithm = "algorithm"
+kBin = "bin"
+kCut = "cut"
+kExtSignal = "ext_signal"
+kExtSignalSet = "ext_signal_set"
+kExternalRequirement = "external_requirement"
+kObjectRequirement = "object_requirement"
+kRoot = "utm"
+kScale = "scale"
+kScaleSet = "scale_set"
+
+kObject = "object"
+kType = "type"
+
+BufferSize = 1024 * 1024
+"""Size of write buffer in bytes."""
+
+Indent = "  "
+
+XmlDeclaration = '<?xml version="1.0" encoding="UTF-8"?>\n'
+
+
+def writeElements(fp: TextIO, row, depth: int) -> None:
+    """Write text elements of *row*."""
+    indent = Indent * depth
+    for key, value in row.items():
+        fp.write(f"{indent}<{key}>{escape(format(value))}</{key}>\n")
+
+
+def writeRecord(fp: TextIO, tag: str, row, depth: int, children: Iterable[Tuple[str, dict]] = ()) -> None:
+    """Write element *tag* containing text elements of *row* followed by
+    *children* records (tuples of tag and row).
+    """
+    indent = Indent * depth
+    fp.write(f"{indent}<{tag}>\n")
+    writeElements(fp, row, depth + 1)
+    for childTag, child in children:
+        writeRecord(fp, childTag, child, depth + 1)
+    fp.write(f"{indent}</{tag}>\n")
+
+
+class XmlStreamEncoderQueue(XmlEncoderQueue):
+    """XML encoder streaming the menu to file."""
+
+    def __init__(self, menu, filename, validate: bool = True):
+        self.validate = validate
+        super().__init__(menu, filename)
+
+    def add_encoder_callbacks(self):
+        self.add_callback(self.run_write_xml, "writing XML file")
+        if self.validate:
+            self.add_callback(self.run_validate_xml, "validating XML file")
+
+    def run_prepare(self):
+        """Write XML menu to *filename*. This regenerates the UUID."""
+        logging.debug("preparing menu to write to `%s`", self.filename)
+        self.check_access()
+
+    def run_write_xml(self):
+        self.create_tempfile()
+        logging.debug("writing XML file to %r", self.tempfilename)
+        with open(self.tempfilename, "w", encoding="utf-8", buffering=BufferSize) as fp:
+            self.write(fp)
+
+    def write(self, fp: TextIO) -> None:
+        fp.write(XmlDeclaration)
+        fp.write(f"<{kRoot}>\n")
+        writeElements(fp, menuInfoRow(self.menu.menu), 1)
+        self.write_scales(fp)
+        self.write_ext_signals(fp)
+        for rows in self.rows:
+            self.checkCanceled()
+            children = []
+            children.extend((kCut, row) for row in rows.cuts)
+            children.extend((kObjectRequirement, row) for row in rows.objects)
+            children.extend((kExternalRequirement, row) for row in rows.externals)
+            writeRecord(fp, kAlgorithm, rows.algorithm, 1, children)
+        fp.write(f"</{kRoot}>\n")
+
+    def write_scales(self, fp: TextIO) -> None:
+        scales = self.menu.scales
+        if scales is None:
+            return
+        bins = scales.bins
+        fp.write(f"{Indent}<{kScaleSet}>\n")
+        writeElements(fp, dict(scales.scaleSet), 2)
+        for scale in scales.scales:
+            scale = dict(scale)
+            key = f"{scale[kObject]}-{scale[kType]}"
+            children = [(kBin, dict(bin_)) for bin_ in bins[key]] if key in bins else []
+            writeRecord(fp, kScale, scale, 2, children)
+        fp.write(f"{Indent}</{kScaleSet}>\n")
+
+    def write_ext_signals(self, fp: TextIO) -> None:
+        extSignals = self.menu.extSignals
+        if extSignals is None:
+            return
+        fp.write(f"{Indent}<{kExtSignalSet}>\n")
+        writeElements(fp, dict(extSignals.extSignalSet), 2)
+        for signal in extSignals.extSignals:
+            writeRecord(fp, kExtSignal, dict(signal), 2)
+        fp.write(f"{Indent}</{kExtSignalSet}>\n")
+
+    def run_validate_xml(self):
+        """Validate written file against the XSD."""
+        logging.debug("validating XML file %r", self.tempfilename)
+        warnings = TableHelper().load(self.tempfilename)
+        if warnings:
+            message = "Failed to validate XML menu {0!r}\n{1}".format(self.filename, warnings)
+            logging.error(message)
+            raise XmlEncoderError(message)
+
+
+def dump(menu, filename, validate: bool = True):
+    queue = XmlStreamEncoderQueue(menu, filename, validate)
+    try:
+        queue.exec_()
+    except Exception:
+        queue.discard()
+        raise
@@ -0,0 +1,83 @@
+"""Thread-safe access to tmGrammar.
+
+tmGrammar keeps the state of its parsers in process globals (for example the
+RPN tokens in `tmGrammar.Algorithm_Logic`), concurrent calls from different
+threads corrupt each other's results. All tmGrammar parser calls are
+serialized by a process wide reentrant lock.
+
+Serialize direct calls:
+
+>>> with grammarLock:
+...     tmGrammar.Algorithm_parser(expression)
+
+Declare a function accessing tmGrammar:
+
+>>> @synchronized
+... def parse(expression):
+...     ...
+
+Move parsing off the GUI thread using the dedicated parser worker:
+
+>>> future = submit(parseTokens, expression)
+>>> future.add_done_callback(onParsed)
+"""
+
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Optional
+
+__all__ = [
+    "grammarLock",
+    "synchronized",
+    "GrammarWorker",
+    "grammarWorker",
+    "submit",
+]
+
+grammarLock = threading.RLock()
+"""Process wide lock serializing all tmGrammar parser calls."""
+
+
+def synchronized(function: Callable) -> Callable:
+    """Decorator serializing calls of *function* by the grammar lock."""
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        with grammarLock:
+            return function(*args, **kwargs)
+    return wrapper
+
+
+class GrammarWorker:
+    """Dedicated parser thread executing submitted calls in order of
+    submission. The thread is started on first submission.
+    """
+
+    def __init__(self) -> None:
+        self.__executor: Optional[ThreadPoolExecutor] = None
+        self.__lock = threading.Lock()
+
+    def submit(self, function: Callable, *args, **kwargs) -> Future:
+        """Schedule *function* to be executed by the parser thread, returns a
+        future providing the result.
+        """
+        with self.__lock:
+            if self.__executor is None:
+                self.__executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="tmGrammar")
+            return self.__executor.submit(synchronized(function), *args, **kwargs)
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the parser thread, a new thread is started on next submission."""
+        with self.__lock:
+            executor, self.__executor = self.__executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+
+
+grammarWorker = GrammarWorker()
+"""Shared parser worker."""
+
+
+def submit(function: Callable, *args, **kwargs) -> Future:
+    """Schedule *function* to be executed by the shared parser worker."""
+    return grammarWorker.submit(function, *args, **kwargs)
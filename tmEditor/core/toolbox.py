@@ -2,15 +2,9 @@
 
 import logging
 import os
-import platform
 import re
-import ssl
 from typing import Dict, List, Optional, Tuple
 
-from urllib.request import urlopen
-
-from PyQt5 import QtCore
-
 import tmTable
 
 __all__ = [
@@ -18,6 +12,7 @@ __all__ = [
     "getXsdDir",
     "query",
     "natural_sort_key",
+    "numeric_sort_key",
     "safe_str",
     "listextent",
     "listcompress",
@@ -25,7 +20,6 @@ __all__ = [
     "encode_labels",
     "CutSpecificationPool",
     "CutSpecification",
-    "DownloadHelper"
 ]
 
 # -----------------------------------------------------------------------------
@@ -62,6 +56,16 @@ def natural_sort_key(s: str):
     return [int(text) if text.isdigit() else text.lower()
             for text in re.split(_nsre, format(s))]
 
+def numeric_sort_key(value) -> float:
+    """Numeric sorting, values not representing a number sort first.
+    >>> sorted(["2.5", "", "inf", 1], key=numeric_sort_key)
+    ['', 1, '2.5', 'inf']
+    """
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("-inf")
+
 def safe_str(s: str, attrname: str) -> str:
     """Returns safe version of string. The function strips:
      * whitespaces, tabulators
@@ -173,50 +177,3 @@ class CutSpecification:
     def join(object, type) -> str:
         """Join object and type tokens to build a combined cut name."""
         return "-".join((object, type))
-
-# -----------------------------------------------------------------------------
-#  Remote file downloader
-# -----------------------------------------------------------------------------
-
-class DownloadHelper(QtCore.QObject):
-    """Simple download helper class, utilized to fetch remote XML files."""
-
-    receivedChanged = QtCore.pyqtSignal(int)
-    finished = QtCore.pyqtSignal()
-
-    def __init__(self, fp, parent: Optional[QtCore.QObject] = None) -> None:
-        super().__init__()
-        self.fp = fp
-        self.url = None
-        self.contentLength: int = 0
-        self.charset = None
-        self.receivedSize: int = 0
-        self.blockSize: int = 1024 * 128
-
-    def urlopen(self, url, **kwargs):
-        # Workaround for MacOS SSL verification bug (affects python from homebrew and macport).
-        if platform.system() == "Darwin":
-            ctx = ssl.create_default_context()
-            ctx.check_hostname = False
-            ctx.verify_mode = ssl.CERT_NONE
-            kwargs["context"] = ctx
-        # Open remote URL
-        self.url = urlopen(url, **kwargs)
-        # Get byte size of remote content, either integer string or empty if not available.
-        self.contentLength = int(self.url.info().get("Content-Length", 0)) or 0
-        self.charset = self.url.info().get("charset", "utf-8")
-
-    def __call__(self):
-        """Use callback to update status while doenloading or return False to stop.
-        """
-        self.receivedSize = 0
-        try:
-            while True:
-                buffer = self.url.read(self.blockSize)
-                if not buffer:
-                    break
-                self.receivedSize += len(buffer)
-                self.fp.write(buffer)  # TODO /breaks/ .decode(self.charset))
-                self.receivedChanged.emit(self.receivedSize)
-        finally:
-            self.finished.emit()
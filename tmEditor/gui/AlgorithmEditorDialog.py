@@ -720,7 +720,7 @@ class AlgorithmEditorDialog(QtWidgets.QDialog):
                 pass
             algorithm.cuts()
             for name in algorithm.cuts():
-                if not list(filter(lambda item: item.name == name, self.editor.menu.cuts)):
+                if not self.editor.menu.cutByName(name):
                     raise AlgorithmSyntaxError(f"Undefined cut `{name}`.", name)
             for name in algorithm.externals():
                 def signal_name(name): return External(name, 0).signal_name
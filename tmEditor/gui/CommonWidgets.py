@@ -22,7 +22,8 @@ from typing import List, Optional, Tuple
 from PyQt5 import QtCore, QtGui, QtWidgets
 
 from tmEditor.core import formatter
-from tmEditor.core.Algorithm import toObject, toExternal
+from tmEditor.core.Algorithm import toExternal
+from tmEditor.core.ReferenceExtractor import extractReferences, extractObject
 from tmEditor.core.types import CountObjectTypes, ObjectTypes, SignalTypes
 
 __all__ = [
@@ -48,7 +49,7 @@ __all__ = [
 
 def richTextObjectsPreview(algorithm, parent):
     content = []
-    objects = [toObject(obj) for obj in algorithm.objects()]
+    objects = [extractObject(obj) for obj in extractReferences(algorithm.expression).objects]
     objects = [obj for obj in objects if obj.type in ObjectTypes]
     if objects:
         content.append(parent.tr("<p><strong>Objects:</strong></p>"))
@@ -68,7 +69,7 @@ def richTextObjectsPreview(algorithm, parent):
 
 def richTextSignalsPreview(algorithm, parent):
     content = []
-    signals = [toObject(obj) for obj in algorithm.objects()]
+    signals = [extractObject(obj) for obj in extractReferences(algorithm.expression).objects]
     signals = [obj for obj in signals if obj.type in SignalTypes]
     if signals:
         content.append(parent.tr("<p><strong>Signals:</strong></p>"))
@@ -83,7 +84,7 @@ def richTextSignalsPreview(algorithm, parent):
 
 def richTextExtSignalsPreview(algorithm, parent):
     content = []
-    externals = [toExternal(ext) for ext in algorithm.externals()]
+    externals = [toExternal(ext) for ext in extractReferences(algorithm.expression).externals]
     if externals:
         content.append(parent.tr("<p><strong>Externals:</strong></p>"))
         content.append(parent.tr("<p>"))
@@ -97,11 +98,12 @@ def richTextExtSignalsPreview(algorithm, parent):
 def richTextCutsPreview(menu, algorithm, parent):
     # List used cuts.
     content = []
-    if algorithm.cuts():
+    names = extractReferences(algorithm.expression).cuts
+    if names:
         content.append(parent.tr("<p><strong>Cuts:</strong></p>"))
         content.append(parent.tr("<p>"))
         cuts = []
-        for name in algorithm.cuts():
+        for name in names:
             cut = menu.cutByName(name)
             if cut: # might be None!
                 cuts.append(cut)
@@ -247,6 +249,10 @@ class TextFilterWidget(QtWidgets.QWidget):
         self.filterLabel = QtWidgets.QLabel(self.tr("Filter"), self)
         self.filterLineEdit = QtWidgets.QLineEdit(self)
         self.filterLineEdit.setClearButtonEnabled(True)
+        self.filterLineEdit.setToolTip(self.tr(
+            "Space separated terms, all terms must match.\n"
+            "Supports queries like cut:MU-ETA_2p1, label:physics, name:SingleMu or index:100-200."
+        ))
         self.filterLineEdit.textChanged.connect(lambda text: self.textChanged.emit(text))
         hbox = QtWidgets.QHBoxLayout()
         if spacer:
@@ -3,7 +3,7 @@
 import math
 import logging
 import re
-from typing import List, Optional, Tuple
+from typing import Optional, Tuple
 
 from PyQt5 import QtCore, QtGui, QtWidgets
 
@@ -11,6 +11,8 @@ import tmGrammar
 
 from tmEditor.core.types import FunctionCutTypes
 from tmEditor.core.Algorithm import Cut
+from tmEditor.core.ScaleBins import ScaleBins, scaleBins
+from tmEditor.core.ScaleIndex import scaleIndex
 from tmEditor.core import html, toolbox
 
 from tmEditor.core.Algorithm import (
@@ -63,11 +65,8 @@ RegExFloatingPoint = re.compile(r"([-+]?\d*\.?\d+(?:[eE][-+]?\d+)?)")
 #  Helper functions
 # -----------------------------------------------------------------------------
 
-def getScale(scales, name: str) -> List:
-    try:
-        return scales.bins[name]
-    except IndexError:
-        return []
+def getScale(scales, name: str) -> ScaleBins:
+    return scaleBins(scales, name) or ScaleSpinBox.EmptyScale
 
 
 def createVerticalSpacerItem(width: int = 0, height: int = 0):
@@ -79,27 +78,25 @@ def createVerticalSpacerItem(width: int = 0, height: int = 0):
 
 def calculateRange(specification, scales) -> RangeType:
     """Returns calcualted range for linear cut."""
+    index = scaleIndex(scales)
     # Unconstrained pt
     if specification.type == tmGrammar.UPT:
-        def isMuUpt(scale): # filter
-            return scale[kObject] == tmGrammar.MU and scale[kType] == tmGrammar.UPT
-        for scale in filter(isMuUpt, scales.scales):
+        scale = index.get(tmGrammar.MU, tmGrammar.UPT)
+        if scale is not None:
             minimum = float(scale[kMinimum])
             maximum = float(scale[kMaximum])
             return minimum, maximum
         return 0.0, 0.0
     # Delta eta
     if specification.type in (tmGrammar.DETA, tmGrammar.ORMDETA):
-        def isMuEta(scale): # filter
-            return scale[kObject] == tmGrammar.MU and scale[kType] == tmGrammar.ETA
-        def isJetEta(scale): # filter
-            return scale[kObject] == tmGrammar.JET and scale[kType] == tmGrammar.ETA
-        for scaleMu in filter(isMuEta, scales.scales):
-            for scaleCalo in filter(isJetEta, scales.scales):
-                scale = scaleMu if scaleMu[kMaximum] > scaleCalo[kMaximum] else scaleCalo
-                minimum = 0.0
-                maximum = float(scale[kMaximum]) * 2.0
-                return minimum, maximum
+        scaleMu = index.get(tmGrammar.MU, tmGrammar.ETA)
+        scaleCalo = index.get(tmGrammar.JET, tmGrammar.ETA)
+        if scaleMu is not None and scaleCalo is not None:
+            scale = scaleMu if scaleMu[kMaximum] > scaleCalo[kMaximum] else scaleCalo
+            minimum = 0.0
+            maximum = float(scale[kMaximum]) * 2.0
+            return minimum, maximum
+        if scaleMu is not None:
             return 0.0, 0.0
     # Delta phi
     if specification.type in (tmGrammar.DPHI, tmGrammar.ORMDPHI):
@@ -132,9 +129,8 @@ def calculateRange(specification, scales) -> RangeType:
         return 0.0, 2**32
     # CICADA score
     if specification.type == tmGrammar.CSCORE:
-        def isCScore(scale):
-            return scale[kObject] == tmGrammar.CICADA and scale[kType] == tmGrammar.CSCORE
-        for scale in filter(isCScore, scales.scales):
+        scale = index.get(tmGrammar.CICADA, tmGrammar.CSCORE)
+        if scale is not None:
             minimum = float(scale[kMinimum])
             maximum = float(scale[kMaximum])
             return minimum, maximum
@@ -145,9 +141,8 @@ def calculateStep(specification, scales) -> float:
     """Calculate dynamic or static range step for cut (experimental)."""
     # CICADA score
     if specification.type == tmGrammar.CSCORE:
-        def isPrecisionCScore(scale):
-            return scale[kObject] == "PRECISION" and scale[kType] == f"{tmGrammar.CICADA}-{tmGrammar.CSCORE}"
-        for scale in filter(isPrecisionCScore, scales.scales):
+        scale = scaleIndex(scales).get("PRECISION", f"{tmGrammar.CICADA}-{tmGrammar.CSCORE}")
+        if scale is not None:
             n_bits = float(scale[kNBits])
             return 1 / (2**n_bits)
         return specification.range_step
@@ -169,7 +164,7 @@ class ScaleSpinBox(QtWidgets.QDoubleSpinBox):
 
     MinimumMode = kMinimum
     MaximumMode = kMaximum
-    EmptyScale = [{kNumber: 0, kMinimum: .0, kMaximum: .0}]
+    EmptyScale = ScaleBins([{kNumber: 0, kMinimum: .0, kMaximum: .0}])
 
     def __init__(self, mode=MinimumMode, parent: Optional[QtWidgets.QWidget] = None) -> None:
         super().__init__(parent)
@@ -182,27 +177,25 @@ class ScaleSpinBox(QtWidgets.QDoubleSpinBox):
     def setMode(self, mode):
         self.mode = mode
 
-    def setScale(self, scale, prec=3):
-        """Scale requires a list of dictionaries with at least a *number*,
-        *minimum* and *maximum* keys. *mode* specifies if the upper or lower bin
-         limit is used."""
-        # Important: sort the scale set by minimum or maximum - not by numbers (encoded in two's complement).
-        self.scale = sorted(scale, key=lambda bin: float(bin[self.mode]))
+    def setScale(self, scale: ScaleBins, prec=3):
+        """Scale requires a bin table (see `ScaleBins`). *mode* specifies if
+        the upper or lower bin limit is used."""
+        # Important: use bins sorted by minimum or maximum - not by numbers (encoded in two's complement).
+        self.scale = scale
+        self.values = scale.values(self.mode) if len(scale) else self.EmptyScale.values(self.mode)
         self.index = 0
         self.setDecimals(prec)
-        minimum = min([float(value[self.mode]) for value in self.scale] or [0.])
-        maximum = max([float(value[self.mode]) for value in self.scale] or [0.])
-        self.setRange(minimum, maximum)
+        self.setRange(self.values[0], self.values[-1])
 
     def stepBy(self, steps):
-        self.index += steps
-        self.setValue(float(self.scale[self.index][self.mode]))
+        self.index = max(0, min(len(self.values) - 1, self.index + steps))
+        self.setValue(self.values[self.index])
 
     def value(self, index=None):
         """Returns floating point value by bin index (upper or lower depending on mode)."""
         if index == None:
             index = self.index
-        return float(self.scale[index][self.mode])
+        return self.values[index]
 
     def minimum(self):
         return self.value(0)
@@ -223,10 +216,7 @@ class ScaleSpinBox(QtWidgets.QDoubleSpinBox):
 
     def nearest(self, value):
         """Returns nearest neighbor of value in range."""
-        # See also "finding index of an item closest to the value in a list that's not entirely sorted"
-        # http://stackoverflow.com/questions/9706041/finding-index-of-an-item-closest-to-the-value-in-a-list-thats-not-entirely-sort
-        result = min(range(len(self.scale)), key=lambda i: abs(float(self.scale[i][self.mode]) - float(value)))
-        self.index = result
+        self.index = self.scale.nearestIndex(float(value), self.mode) if len(self.scale) else 0
         return self.value(self.index)
 
 # -----------------------------------------------------------------------------
@@ -1054,7 +1044,7 @@ class CutEditorDialog(QtWidgets.QDialog):
         """Initialize dialog from existing cut."""
         self.loadedCut = cut
         self.suffixLineEdit.setText(cut.suffix)
-        self.suffixLineEdit.setEnabled(not list(filter(lambda algorithm: cut.name in algorithm.cuts(), self.menu.algorithms)))
+        self.suffixLineEdit.setEnabled(self.menu.isCutOrphaned(cut.name))
         if self.copyMode:
             self.suffixLineEdit.setEnabled(True) # HACK overrule on copy
         if cut.isFunctionCut: # TODO not efficient
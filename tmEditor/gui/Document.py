@@ -4,6 +4,7 @@ import logging
 import copy
 import os
 import threading
+from collections import OrderedDict
 from typing import List, Optional
 
 from PyQt5 import QtCore, QtWidgets
@@ -15,6 +16,7 @@ from tmEditor.core.Algorithm import Algorithm, Cut, toObject
 from tmEditor.core import XmlDecoder, XmlEncoder
 from tmEditor.core.XmlEncoder import XmlEncoderError
 from tmEditor.core.XmlDecoder import XmlDecoderError
+from tmEditor.core.MenuCache import menuCache
 
 # Models and proxies for table views
 from tmEditor.gui.models import *
@@ -25,6 +27,7 @@ from tmEditor.gui.CutEditorDialog import CutEditorDialog
 from tmEditor.gui.AlgorithmEditorDialog import AlgorithmEditorDialog
 from tmEditor.gui.AlgorithmSelectIndexDialog import AlgorithmSelectIndexDialog
 from tmEditor.gui.BottomWidget import BottomWidget
+from tmEditor.gui.QueueThread import execQueue
 
 # Common widgets
 from tmEditor.gui.CommonWidgets import TextFilterWidget
@@ -61,14 +64,6 @@ def fScale(scale):
         return "MU-PT"
     return scale
 
-# HACK
-def updateModel(model, context):
-    """Workaround while fixing table models..."""
-    source = model.sourceModel()
-    model.setSourceModel(source.__class__(context.menu(), context))
-    source.setParent(None)
-    source.deleteLater()
-
 def handleException(method):
     """Method decorator, show message box on exception."""
     def handleException(self, *args, **kwargs):
@@ -138,10 +133,16 @@ class Document(BaseDocument):
 
     """
 
-    def __init__(self, filename: str, parent: Optional[QtWidgets.QWidget] = None) -> None:
+    MaxScaleBinsPages = 8
+    """Maximum number of scale bins table views kept loaded."""
+
+    def __init__(self, filename: str, parent: Optional[QtWidgets.QWidget] = None, menu=None, migrations=None) -> None:
         super().__init__(filename, parent)
         # Attributes
-        self.loadMenu(filename)
+        if menu is None:
+            self.loadMenu(filename)
+        else:
+            self.setMenu(filename, menu, migrations or [])
         # Layout
         self.setContentsMargins(0, 0, 0, 0)
         #
@@ -218,37 +219,69 @@ class Document(BaseDocument):
     def createAlgorithmsPage(self):
         model = AlgorithmsModel(self.menu(), self)
         tableView = self.newProxyTableView("algorithmsTableView", model)
-        tableView.resizeColumnsToContents()
+        tableView.resizeColumnsToSample()
         self.algorithmsPage = self.addPage(self.tr("Algorithms/Seeds"), tableView, self.menuPage)
         self.algorithmsPage.setIcon(0, createIcon("expression"))
 
     def createCutsPage(self):
         model = CutsModel(self.menu(), self)
         tableView = self.newProxyTableView("cutsTableView", model, proxyclass=CutsModelProxy)
-        tableView.resizeColumnsToContents()
+        tableView.resizeColumnsToSample()
         self.cutsPage = self.addPage(self.tr("Cuts"), tableView, self.menuPage)
         self.cutsPage.setIcon(0, createIcon("path-cut"))
 
     def createScalesPage(self):
         model = ScalesModel(self.menu(), self)
         tableView = self.newProxyTableView("scalesTableView", model, proxyclass=ScalesModelProxy)
-        tableView.resizeColumnsToContents()
+        tableView.resizeColumnsToSample()
         self.scalesPage = self.addPage(self.tr("Scales"), tableView)
 
     def createExtSignalsPage(self):
         model = ExtSignalsModel(self.menu(), self)
         tableView = self.newProxyTableView("externalsTableView", model)
-        tableView.resizeColumnsToContents()
+        tableView.resizeColumnsToSample()
         self.extSignalsPage = self.addPage(self.tr("External Signals"), tableView)
 
     def createScaleBinsPages(self):
+        """Add navigation entries for scale bins, table views are created on
+        first selection (see `loadScaleBinsPage`)."""
         self.scalesTypePages = {}
+        self.scaleBinsPagesLoaded = OrderedDict()
         for scale in self.menu().scales.bins.keys():
-            model = BinsModel(self.menu(), scale, self)
-            tableView = self.newProxyTableView(f"{scale}TableView", model)
-            self.scalesTypePages[scale] = self.addPage(fScale(scale), tableView, self.scalesPage)
-
-    def newProxyTableView(self, name, model, proxyclass=QtCore.QSortFilterProxyModel):
+            page = self.addPage(fScale(scale), None, self.scalesPage)
+            page.scale = scale
+            self.scalesTypePages[scale] = page
+
+    def loadScaleBinsPage(self, page):
+        """Create table view of scale bins *page* if not loaded, releases
+        views of least recently selected pages exceeding `MaxScaleBinsPages`."""
+        if page.top is None:
+            model = BinsModel(self.menu(), page.scale, self)
+            tableView = self.newProxyTableView(f"{page.scale}TableView", model)
+            self.topStack.addWidget(tableView)
+            page.top = tableView
+            logging.debug("loaded scale bins page %r", page.scale)
+        self.scaleBinsPagesLoaded[page.scale] = page
+        self.scaleBinsPagesLoaded.move_to_end(page.scale)
+        while len(self.scaleBinsPagesLoaded) > self.MaxScaleBinsPages:
+            scale, released = self.scaleBinsPagesLoaded.popitem(last=False)
+            self.releaseScaleBinsPage(released)
+
+    def releaseScaleBinsPage(self, page):
+        """Delete table view, proxy and model of scale bins *page*."""
+        tableView = page.top
+        if tableView is None:
+            return
+        page.top = None
+        proxyModel = tableView.model()
+        sourceModel = proxyModel.sourceModel()
+        self.topStack.removeWidget(tableView)
+        for widget in (tableView, proxyModel, sourceModel):
+            widget.setParent(None)
+            widget.deleteLater()
+        logging.debug("released scale bins page %r", page.scale)
+
+    def newProxyTableView(self, name, model, proxyclass=TableModelProxy):
         """Factory to create new QTableView view using a QSortFilterProxyModel."""
         proxyModel = proxyclass(self)
         proxyModel.setFilterKeyColumn(-1)
@@ -267,7 +300,7 @@ class Document(BaseDocument):
         page = PageItem(name, top, self.bottomWidget, parent)
         if parent is None:
             self.navigationTreeWidget.addTopLevelItem(page)
-        if 0 > self.topStack.indexOf(top):
+        if top is not None and 0 > self.topStack.indexOf(top):
             self.topStack.addWidget(top)
         self._pages.append(page)
         return page
@@ -276,7 +309,7 @@ class Document(BaseDocument):
         index, item = self.getSelection()
         excludedPages = [self.menuPage, ]
         if item not in excludedPages:
-            item.top.model().setFilterFixedString(text)
+            item.top.model().setFilterQuery(text)
 
     @QtCore.pyqtSlot()
     def onModified(self) -> None:
@@ -290,32 +323,18 @@ class Document(BaseDocument):
         """Load menu from filename, setup new document."""
         self.setFilename(filename)
         self.setName(os.path.basename(self.filename()))
-        try:
-            dialog = QtWidgets.QProgressDialog(self)
-            dialog.setWindowTitle(self.tr("Loading..."))
-            dialog.setCancelButton(None)
-            dialog.setWindowModality(QtCore.Qt.WindowModal)
-            dialog.resize(260, dialog.height())
-            dialog.show()
-            QtWidgets.QApplication.processEvents()
-            # Create XML decoder and run
-            queue = XmlDecoder.XmlDecoderQueue(self.filename())
-            try:
-                for callback in queue:
-                    dialog.setLabelText(self.tr("{0}...").format(queue.message().capitalize()))
-                    logging.debug("processing: %s...", queue.message())
-                    QtWidgets.QApplication.sendPostedEvents(dialog, 0)
-                    QtWidgets.QApplication.processEvents()
-                    callback()
-                    dialog.setValue(queue.progress())
-                    QtWidgets.QApplication.processEvents()
-            except XmlDecoderError as exc:
-                raise
-        except Exception:
-            dialog.close()
-            raise
-        self._menu = queue.menu
-        if queue.applied_mirgrations:
+        # Create XML decoder and run in worker thread
+        queue = XmlDecoder.createQueue(self.filename(), menuCache)
+        execQueue(queue, self.tr("Loading..."), self)
+        self.setMenu(filename, queue.menu, queue.applied_mirgrations)
+
+    def setMenu(self, filename: str, menu, migrations: list) -> None:
+        """Setup new document from menu decoded from filename, reports
+        applied migrations."""
+        self.setFilename(filename)
+        self.setName(os.path.basename(self.filename()))
+        self._menu = menu
+        if migrations:
             msgBox = QtWidgets.QMessageBox(self)
             msgBox.setIcon(QtWidgets.QMessageBox.Information)
             msgBox.setWindowTitle(self.tr("Migration report"))
@@ -323,7 +342,7 @@ class Document(BaseDocument):
             messages = [
                 f"in file {filename!r}"
             ]
-            for migration in queue.applied_mirgrations:
+            for migration in migrations:
                 if isinstance(migration.subject, Cut):
                     if migration.param == "object":
                         message = f"in cut {migration.subject.name!r}:\n" \
@@ -363,29 +382,13 @@ class Document(BaseDocument):
         # Update meta information
         self._menu.menu.name = self.menuPage.top.nameLineEdit.text()
         self._menu.menu.comment = self.menuPage.top.commentTextEdit.toPlainText()
-        # Process dialog
-        dialog = QtWidgets.QProgressDialog(self)
-        dialog.setWindowTitle(self.tr("Saving..."))
-        dialog.setCancelButton(None)
-        dialog.setWindowModality(QtCore.Qt.WindowModal)
-        dialog.resize(260, dialog.height())
-        dialog.show()
-        QtWidgets.QApplication.processEvents()
-        # Create XML encoder queue and run queue
-        queue = XmlEncoder.XmlEncoderQueue(self._menu, filename)
+        # Create XML encoder queue and run in worker thread
+        queue = XmlEncoder.createQueue(self._menu, filename)
         try:
-            for callback in queue:
-                dialog.setLabelText(self.tr("{0}...").format(queue.message().capitalize()))
-                logging.debug("processing: %s...", queue.message())
-                QtWidgets.QApplication.sendPostedEvents(dialog, 0)
-                QtWidgets.QApplication.processEvents()
-                callback()
-                dialog.setValue(queue.progress())
-                QtWidgets.QApplication.processEvents()
-        except XmlEncoderError:
-            dialog.close()
+            execQueue(queue, self.tr("Saving..."), self)
+        except Exception:
+            queue.discard()
             raise
-        dialog.close()
         # Update document
         self.setFilename(filename)
         self.setName(os.path.basename(filename))
@@ -406,13 +409,22 @@ class Document(BaseDocument):
             return index, item
         return None, item
 
+    def sourceModel(self, item):
+        """Returns source table model of page *item*."""
+        return item.top.model().sourceModel()
+
+    def selectSourceRow(self, item, row):
+        """Select and show source model *row* in table view of page *item*."""
+        proxy = item.top.model()
+        index = proxy.mapFromSource(proxy.sourceModel().index(row, 0))
+        if index.isValid():
+            item.top.setCurrentIndex(index)
+            item.top.scrollTo(index)
+
     def getUnusedAlgorithmIndices(self):
         """"""
-        free = [i for i in range(MaxAlgorithms)]
-        for algorithm in self.menu().algorithms:
-            if int(algorithm.index) in free:
-                free.remove(int(algorithm.index))
-        return free
+        algorithmByIndex = self.menu().algorithmByIndex
+        return [i for i in range(MaxAlgorithms) if algorithmByIndex(i) is None]
 
     def getUniqueAlgorithmName(self, basename="L1_Unnamed"):
         """Returns eiter *basename* if not already used in menu, else tries to
@@ -430,6 +442,8 @@ class Document(BaseDocument):
 
     def updateTop(self):
         index, item = self.getSelection()
+        if item in self.scalesTypePages.values():
+            self.loadScaleBinsPage(item)
         if item and hasattr(item.top, "sortByColumn"):
             item.top.sortByColumn(0, QtCore.Qt.AscendingOrder)
         self.topStack.setCurrentWidget(item.top)
@@ -514,10 +528,8 @@ class Document(BaseDocument):
                 item.bottom.toolbar.removeButton.setEnabled(True)
                 cut = self.menu().cuts[index.row()]
                 # Disable edit and remove button for cuts already used in algorithms
-                for algorithm in self.menu().algorithms:
-                    if cut.name in algorithm.cuts():
-                        item.bottom.toolbar.removeButton.setEnabled(False)
-                        break
+                if not self.menu().isCutOrphaned(cut.name):
+                    item.bottom.toolbar.removeButton.setEnabled(False)
         else:
             item.bottom.toolbar.hide()
 
@@ -527,8 +539,6 @@ class Document(BaseDocument):
             if not self.menu().cutByName(cut.name):
                 cut.modified = True
                 self.menu().addCut(cut)
-        # HACK
-        updateModel(self.cutsPage.top.model(), self)
 
     def importAlgorithms(self, algorithms):
         """Import algorithms from another menu."""
@@ -563,9 +573,6 @@ class Document(BaseDocument):
             algorithm.modified = True
             self.menu().addAlgorithm(algorithm)
             self.menu().extendReferenced(algorithm)
-        # HACK
-        updateModel(self.algorithmsPage.top.model(), self)
-        self.algorithmsPage.top.resizeColumnsToContents()
 
     def addItem(self):
         try:
@@ -592,8 +599,6 @@ class Document(BaseDocument):
         dialog.setName(self.getUniqueAlgorithmName(self.tr("L1_Unnamed")))
         dialog.editor.setModified(False)
         dialog.exec_()
-        # HACK
-        updateModel(self.cutsPage.top.model(), self)
         if dialog.result() != QtWidgets.QDialog.Accepted:
             return
         self.setModified(True)
@@ -605,23 +610,14 @@ class Document(BaseDocument):
         )
         algorithm.modified = True
         for name in algorithm.cuts():
-            if not list(filter(lambda item: item.name == name, self.menu().cuts)):
+            if not self.menu().cutByName(name):
                 raise RuntimeError("NO SUCH CUT AVAILABLE")
         self.menu().addAlgorithm(algorithm)
         self.menu().extendReferenced(self.menu().algorithmByName(algorithm.name)) # IMPORTANT: add/update new objects!
-        # HACK
-        updateModel(item.top.model(), self)
-        self.algorithmsPage.top.resizeColumnsToContents()
         # REBUILD INDEX
         self.updateBottom()
         self.modified.emit()
-        # Select new entry TODO: better to implement insertRow in model!
-        proxy = item.top.model()
-        for row in range(proxy.rowCount()):
-            index = proxy.index(row, 1)
-            if index.data() == algorithm.name:
-                item.top.setCurrentIndex(index)
-                break
+        self.selectSourceRow(item, len(self.menu().algorithms) - 1)
 
     def addCut(self, index, item):
         dialog = CutEditorDialog(self.menu(), self)
@@ -632,18 +628,10 @@ class Document(BaseDocument):
             return
         cut = dialog.newCut()
         self.menu().addCut(cut)
-        # HACK
-        updateModel(self.cutsPage.top.model(), self)
         self.updateBottom()
         self.setModified(True)
         self.modified.emit()
-        # Select new entry TODO: better to implement insertRow in model!
-        proxy = item.top.model()
-        for row in range(proxy.rowCount()):
-            index = proxy.index(row, 0)
-            if index.data() == cut.name:
-                item.top.setCurrentIndex(index)
-                break
+        self.selectSourceRow(self.cutsPage, len(self.menu().cuts) - 1)
 
     def editItem(self):
         try:
@@ -667,15 +655,14 @@ class Document(BaseDocument):
         dialog.loadAlgorithm(algorithm)
         dialog.editor.setModified(False)
         dialog.exec_()
-        # HACK
-        updateModel(self.cutsPage.top.model(), self)
         if dialog.result() != QtWidgets.QDialog.Accepted:
             return
         self.setModified(True)
         algorithm.modified = True
         dialog.updateAlgorithm(algorithm)
+        self.sourceModel(item).emitDataChanged(index.row(), index.row())
         for name in algorithm.cuts():
-            if not list(filter(lambda item: item.name == name, self.menu().cuts)):
+            if not self.menu().cutByName(name):
                 raise RuntimeError("NO SUCH CUT AVAILABLE") # TODO
         # REBUILD INDEX
         self.updateBottom()
@@ -694,6 +681,7 @@ class Document(BaseDocument):
             return
         self.setModified(True)
         dialog.updateCut(cut)
+        self.sourceModel(item).emitDataChanged(index.row(), index.row())
         self.updateBottom()
         self.modified.emit()
 
@@ -723,8 +711,6 @@ class Document(BaseDocument):
         dialog.setExpression(algorithm.expression)
         dialog.editor.setModified(False)
         dialog.exec_()
-        # HACK
-        updateModel(self.cutsPage.top.model(), self)
         if dialog.result() != QtWidgets.QDialog.Accepted:
             return
         algorithm.expression = dialog.expression()
@@ -732,28 +718,20 @@ class Document(BaseDocument):
         algorithm.name = dialog.name()
         algorithm.modified = True
         for name in algorithm.cuts():
-            if not list(filter(lambda item: item.name == name, self.menu().cuts)):
+            if not self.menu().cutByName(name):
                 raise RuntimeError("NO SUCH CUT AVAILABLE") # TODO
         for name in algorithm.externals():
-            if not list(filter(lambda item: item.name == name, self.menu().externals)):
+            if not self.menu().externalByName(name):
                 raise RuntimeError("NO SUCH EXTERNAL AVAILABLE") # TODO
         self.menu().algorithms.append(algorithm)
-        # HACK
-        updateModel(item.top.model(), self)
         # REBUILD INDEX
         self.updateBottom()
         self.modified.emit()
         self.setModified(True)
         for name in algorithm.objects():
-            if not list(filter(lambda item: item.name == name, self.menu().objects)):
+            if not self.menu().objectByName(name):
                 self.menu().addObject(toObject(name))
-        # Select new entry TODO: better to implement insertRow in model!
-        proxy = item.top.model()
-        for row in range(proxy.rowCount()):
-            index = proxy.index(row, 1)
-            if index.data() == algorithm.name:
-                item.top.setCurrentIndex(index)
-                break
+        self.selectSourceRow(item, len(self.menu().algorithms) - 1)
 
     @handleException
     def copyCut(self, index, item):
@@ -769,18 +747,10 @@ class Document(BaseDocument):
             return
         cut = dialog.newCut()
         self.menu().addCut(cut)
-        # HACK
-        updateModel(self.cutsPage.top.model(), self)
         self.updateBottom()
         self.setModified(True)
         self.modified.emit()
-        # Select new entry TODO: better to implement insertRow in model!
-        proxy = item.top.model()
-        for row in range(proxy.rowCount()):
-            index = proxy.index(row, 0)
-            if index.data() == cut.name:
-                item.top.setCurrentIndex(index)
-                break
+        self.selectSourceRow(self.cutsPage, len(self.menu().cuts) - 1)
 
     @handleException
     def removeItem(self):
@@ -822,14 +792,13 @@ class Document(BaseDocument):
                 rows = item.top.selectionModel().selectedRows()
                 row = rows[0]
                 cut = item.top.model().sourceModel().values[item.top.model().mapToSource(row).row()]
-                for algorithm in self.menu().algorithms:
-                    if cut.name in algorithm.cuts():
-                        QtWidgets.QMessageBox.warning(
-                            self,
-                            self.tr("Cut is used"),
-                            self.tr("Cut {0} is used by algorithm {1} an can not be removed. Remove the corresponding algorithm first.").format(cut.name, algorithm.name)
-                        )
-                        return
+                for algorithm in self.menu().algorithmsByCut(cut.name):
+                    QtWidgets.QMessageBox.warning(
+                        self,
+                        self.tr("Cut is used"),
+                        self.tr("Cut {0} is used by algorithm {1} an can not be removed. Remove the corresponding algorithm first.").format(cut.name, algorithm.name)
+                    )
+                    return
                 if confirm:
                     result = QtWidgets.QMessageBox.question(
                         self,
@@ -864,12 +833,12 @@ class Document(BaseDocument):
         dialog.setModal(True)
         if dialog.exec_() == QtWidgets.QDialog.Accepted:
             logging.debug("moving algorithms:")
-            for k, v in dialog.mapping.items():
-                algorithm = self.menu().algorithmByIndex(k)
+            moved = [(self.menu().algorithmByIndex(k), v) for k, v in dialog.mapping.items()]
+            for algorithm, v in moved:
                 logging.debug("%s => %s", algorithm.index, v)
-                assert algorithm.index == k
                 algorithm.index = v
                 algorithm.modified = True
+            self.sourceModel(item).emitItemsChanged([algorithm for algorithm, v in moved])
             self.setModified(True)
             self.modified.emit()
             item.top.sortByColumn(0, QtCore.Qt.AscendingOrder)
@@ -0,0 +1,67 @@
+"""Remote file downloader.
+
+Fetches remote XML files block by block, reporting the received size by
+signals.
+
+Example usage:
+>>> helper = DownloadHelper(fp)
+>>> helper.urlopen(url, timeout=10)
+>>> helper()
+"""
+
+import platform
+import ssl
+from typing import Optional
+
+from urllib.request import urlopen
+
+from PyQt5 import QtCore
+
+__all__ = ["DownloadHelper"]
+
+# -----------------------------------------------------------------------------
+#  Remote file downloader
+# -----------------------------------------------------------------------------
+
+class DownloadHelper(QtCore.QObject):
+    """Simple download helper class, utilized to fetch remote XML files."""
+
+    receivedChanged = QtCore.pyqtSignal(int)
+    finished = QtCore.pyqtSignal()
+
+    def __init__(self, fp, parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__()
+        self.fp = fp
+        self.url = None
+        self.contentLength: int = 0
+        self.charset = None
+        self.receivedSize: int = 0
+        self.blockSize: int = 1024 * 128
+
+    def urlopen(self, url, **kwargs):
+        # Workaround for MacOS SSL verification bug (affects python from homebrew and macport).
+        if platform.system() == "Darwin":
+            ctx = ssl.create_default_context()
+            ctx.check_hostname = False
+            ctx.verify_mode = ssl.CERT_NONE
+            kwargs["context"] = ctx
+        # Open remote URL
+        self.url = urlopen(url, **kwargs)
+        # Get byte size of remote content, either integer string or empty if not available.
+        self.contentLength = int(self.url.info().get("Content-Length", 0)) or 0
+        self.charset = self.url.info().get("charset", "utf-8")
+
+    def __call__(self):
+        """Use callback to update status while doenloading or return False to stop.
+        """
+        self.receivedSize = 0
+        try:
+            while True:
+                buffer = self.url.read(self.blockSize)
+                if not buffer:
+                    break
+                self.receivedSize += len(buffer)
+                self.fp.write(buffer)  # TODO /breaks/ .decode(self.charset))
+                self.receivedChanged.emit(self.receivedSize)
+        finally:
+            self.finished.emit()
@@ -12,6 +12,7 @@ from tmEditor.core.types import ObjectTypes
 
 from tmEditor.core.AlgorithmHelper import AlgorithmHelper
 from tmEditor.core.AlgorithmFormatter import AlgorithmFormatter
+from tmEditor.core.grammar import grammarLock
 from tmEditor.core.AlgorithmSyntaxValidator import AlgorithmSyntaxValidator, AlgorithmSyntaxError
 
 # Common widgets
@@ -192,12 +193,15 @@ class FunctionEditorDialog(QtWidgets.QDialog):
         """Load dialog by values from function. Will raise a ValueError if string
         *token* is not a valid object.
         """
-        f = tmGrammar.Function_Item()
-        if not tmGrammar.Function_parser(AlgorithmFormatter.compress(token), f):
-            raise ValueError(token)
+        with grammarLock:
+            f = tmGrammar.Function_Item()
+            if not tmGrammar.Function_parser(AlgorithmFormatter.compress(token), f):
+                raise ValueError(token)
+            objects = list(tmGrammar.Function_getObjects(f))
+            objectCuts = list(tmGrammar.Function_getObjectCuts(f))
+            functionCuts = list(tmGrammar.Function_getCuts(f))
         self.functionComboBox.setCurrentIndex(self.functionComboBox.findData(f.name))
-        objects = list(tmGrammar.Function_getObjects(f))
-        for i, cuts in enumerate(tmGrammar.Function_getObjectCuts(f)):
+        for i, cuts in enumerate(objectCuts):
             if cuts:
                 objects[i] = "{object}[{cuts}]".format(object=objects[i], cuts=cuts)
         for helper in self.objectHelpers:
@@ -206,7 +210,7 @@ class FunctionEditorDialog(QtWidgets.QDialog):
             else:
                 helper.lineEdit.clear()
         for cut in self.cutModel._items:
-            if cut.data().name in tmGrammar.Function_getCuts(f):
+            if cut.data().name in functionCuts:
                 cut.setCheckState(QtCore.Qt.Checked)
         self.updateInfoText() # refresh
 
@@ -15,9 +15,12 @@ from typing import List, Optional
 from PyQt5 import QtCore, QtWidgets
 
 from tmEditor.core import XmlDecoder
+from tmEditor.core.MenuCache import menuCache
 
 from tmEditor.gui.models import AlgorithmsModel
+from tmEditor.gui.proxies import TableModelProxy
 from tmEditor.gui.Document import TableView
+from tmEditor.gui.QueueThread import execQueue
 
 # Common widgets
 from tmEditor.gui.CommonWidgets import IconLabel, createIcon
@@ -65,9 +68,7 @@ class ImportDialog(QtWidgets.QDialog):
         self.filterWidget.textChanged.connect(self.setFilterText)
         # Table view
         model = AlgorithmsModel(self.menu, self)
-        proxyModel = QtCore.QSortFilterProxyModel(self)
-        proxyModel.setFilterKeyColumn(-1) # Filter all collumns
-        proxyModel.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        proxyModel = TableModelProxy(self)
         proxyModel.setSourceModel(model)
         self.tableView = TableView(self)
         self.tableView.setObjectName("importDialogTabelView")
@@ -87,34 +88,12 @@ class ImportDialog(QtWidgets.QDialog):
         self.setLayout(layout)
 
     def setFilterText(self, text):
-        self.tableView.model().setFilterWildcard(text)
+        self.tableView.model().setFilterQuery(text)
 
     def loadMenu(self, filename):
         """Load XML menu from file."""
-        dialog = QtWidgets.QProgressDialog(self)
-        dialog.setWindowTitle(self.tr("Loading..."))
-        dialog.setCancelButton(None)
-        dialog.setWindowModality(QtCore.Qt.WindowModal)
-        dialog.resize(260, dialog.height())
-        dialog.show()
-        QtWidgets.QApplication.processEvents()
-        try:
-            queue = XmlDecoder.XmlDecoderQueue(filename)
-            for callback in queue:
-                dialog.setLabelText(self.tr("{}...").format(queue.message().capitalize()))
-                logging.debug("processing: %s...", queue.message())
-                QtWidgets.QApplication.sendPostedEvents(dialog, 0)
-                QtWidgets.QApplication.processEvents()
-                callback()
-                dialog.setValue(queue.progress())
-                QtWidgets.QApplication.processEvents()
-        except XmlDecoder.XmlDecoderError:
-            dialog.close() # make sure to close the progress dialog
-            raise
-        except Exception:
-            dialog.close()
-            raise
-        dialog.close()
+        queue = XmlDecoder.createQueue(filename, menuCache)
+        execQueue(queue, self.tr("Loading..."), self)
         self.menu = queue.menu
 
     def validateMenu(self):
@@ -0,0 +1,119 @@
+"""Load documents dialog.
+
+This dialog loads multiple XML files concurrently (see `MultiDecoder`),
+showing the progress of every file. Decoded menus are provided by signal
+`loaded` in order of the given filenames.
+
+Example usage:
+>>> dialog = LoadDocumentsDialog(filenames)
+>>> dialog.loaded.connect(onLoaded)
+>>> dialog.exec_()
+"""
+
+import logging
+import os
+from typing import List, Optional
+
+from PyQt5 import QtCore, QtWidgets
+
+from tmEditor.core.MultiDecoder import MultiDecoder
+
+__all__ = ["LoadDocumentsDialog"]
+
+# -----------------------------------------------------------------------------
+#  Decoder thread class
+# -----------------------------------------------------------------------------
+
+class MultiDecoderThread(QtCore.QThread):
+    """Thread collecting results of a multi file decoder."""
+
+    progressChanged = QtCore.pyqtSignal(int, int, str)
+    loaded = QtCore.pyqtSignal(object)
+
+    def __init__(self, decoder: MultiDecoder, parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+        self.decoder: MultiDecoder = decoder
+        self.exception: Optional[Exception] = None
+
+    def run(self) -> None:
+        try:
+            for result in self.decoder.results(self.progressChanged.emit):
+                self.loaded.emit(result)
+        except Exception as exc:
+            logging.exception(exc)
+            self.exception = exc
+
+    @QtCore.pyqtSlot()
+    def cancel(self) -> None:
+        self.decoder.cancel()
+
+# -----------------------------------------------------------------------------
+#  Load documents dialog class
+# -----------------------------------------------------------------------------
+
+class LoadDocumentsDialog(QtWidgets.QDialog):
+    """Dialog showing progress of concurrently loaded files. Emits `loaded`
+    with a `LoadResult` for every file, in order of filenames.
+    """
+
+    loaded = QtCore.pyqtSignal(object)
+
+    def __init__(self, filenames: List[str], parent: Optional[QtWidgets.QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle(self.tr("Loading..."))
+        self.setMinimumWidth(400)
+        self.setWindowModality(QtCore.Qt.WindowModal)
+        self.labels: List[QtWidgets.QLabel] = []
+        self.progressBars: List[QtWidgets.QProgressBar] = []
+        layout = QtWidgets.QGridLayout()
+        for row, filename in enumerate(filenames):
+            label = QtWidgets.QLabel(os.path.basename(filename), self)
+            label.setToolTip(filename)
+            progressBar = QtWidgets.QProgressBar(self)
+            progressBar.setRange(0, 100)
+            progressBar.setFormat(self.tr("Waiting..."))
+            layout.addWidget(label, row, 0)
+            layout.addWidget(progressBar, row, 1)
+            self.labels.append(label)
+            self.progressBars.append(progressBar)
+        buttonBox = QtWidgets.QDialogButtonBox(QtWidgets.QDialogButtonBox.Cancel)
+        buttonBox.rejected.connect(self.cancel)
+        layout.addWidget(buttonBox, len(filenames), 0, 1, 2)
+        self.setLayout(layout)
+        self.thread = MultiDecoderThread(MultiDecoder(filenames), self)
+        self.thread.progressChanged.connect(self.setProgress)
+        self.thread.loaded.connect(self.onLoaded)
+        self.thread.finished.connect(self.accept)
+
+    def exec_(self) -> int:
+        """Start loading and show dialog until all files are loaded. Re-raises
+        an exception raised by the decoder."""
+        QtCore.QTimer.singleShot(0, self.thread.start)
+        result = super().exec_()
+        self.thread.wait()
+        if self.thread.exception is not None:
+            raise self.thread.exception
+        return result
+
+    @QtCore.pyqtSlot(int, int, str)
+    def setProgress(self, position: int, value: int, message: str) -> None:
+        progressBar = self.progressBars[position]
+        progressBar.setValue(value)
+        progressBar.setFormat(f"{message.capitalize()}...")
+
+    @QtCore.pyqtSlot(object)
+    def onLoaded(self, result) -> None:
+        progressBar = self.progressBars[result.position]
+        progressBar.setValue(100)
+        progressBar.setFormat(self.tr("Failed") if result.error else self.tr("Done"))
+        self.loaded.emit(result)
+
+    @QtCore.pyqtSlot()
+    def cancel(self) -> None:
+        """Request cancellation, dialog closes when the decoder stopped."""
+        self.setWindowTitle(self.tr("Canceling..."))
+        self.thread.cancel()
+
+    def reject(self) -> None:
+        """Prevent closing the dialog before the decoder stopped."""
+        self.cancel()
@@ -13,8 +13,8 @@ from urllib.error import HTTPError, URLError
 from PyQt5 import QtCore, QtGui, QtWidgets
 
 from ..core.formatter import fFileSize
+from ..core.Queue import QueueCanceled
 from ..core.AlgorithmSyntaxValidator import AlgorithmSyntaxError
-from ..core.toolbox import DownloadHelper
 from ..core.Settings import ContentsURL
 from ..core.XmlEncoder import XmlEncoderError
 from ..core.XmlDecoder import XmlDecoderError
@@ -23,7 +23,9 @@ from .AboutDialog import AboutDialog
 from .PreferencesDialog import PreferencesDialog
 from .OpenUrlDialog import OpenUrlDialog
 from .ImportDialog import ImportDialog
+from .LoadDocumentsDialog import LoadDocumentsDialog
 from .CommonWidgets import createIcon
+from .DownloadHelper import DownloadHelper
 
 from .Document import Document
 from .MdiArea import MdiArea
@@ -270,6 +272,8 @@ class MainWindow(QtWidgets.QMainWindow):
                 try:
                     # Create document by reading temporary file.
                     document = Document(fp.name, self)
+                except QueueCanceled:
+                    logger.info("canceled loading XML menu: %s", url)
                 except (RuntimeError, OSError) as exc:
                     logger.error("Failed to open XML menu: %s", exc)
                     QtWidgets.QMessageBox.critical(
@@ -314,6 +318,8 @@ class MainWindow(QtWidgets.QMainWindow):
                     self.mdiArea.setCurrentWidget(duplicate)
                     return
                 document = Document(filename, self)
+        except QueueCanceled:
+            logger.info("canceled loading XML menu: %s", filename)
         except Exception as exc:
             logger.exception(exc)
             logger.error("Failed to open XML menu: %s", filename)
@@ -328,6 +334,56 @@ class MainWindow(QtWidgets.QMainWindow):
             self.insertRecentFile(os.path.realpath(filename))
             self.updateRecentFilesMenu()
 
+    def loadDocuments(self, filenames: List[str]) -> None:
+        """Load multiple documents, local files are loaded concurrently and
+        added to the MDI area in order of *filenames*. URLs and already opened
+        files are processed afterwards using `loadDocument`.
+        """
+        localFilenames = []
+        otherFilenames = []
+        for filename in filenames:
+            if RegExUrl.match(filename) or self.mdiArea.findDocument(filename):
+                otherFilenames.append(filename)
+            else:
+                localFilenames.append(filename)
+        if len(localFilenames) < 2:
+            otherFilenames = filenames
+            localFilenames = []
+        if localFilenames:
+            errors = []
+
+            def onLoaded(result):
+                if result.error is not None:
+                    logger.error("Failed to open XML menu: %s", result.filename)
+                    errors.append(f"{result.filename}: {result.error}")
+                    return
+                try:
+                    document = Document(result.filename, self, result.menu, result.migrations)
+                except Exception as exc:
+                    logger.exception(exc)
+                    errors.append(f"{result.filename}: {exc}")
+                    return
+                index = self.mdiArea.addDocument(document)
+                self.mdiArea.setCurrentIndex(index)
+                self.insertRecentFile(os.path.realpath(result.filename))
+
+            dialog = LoadDocumentsDialog(localFilenames, self)
+            dialog.loaded.connect(onLoaded)
+            try:
+                dialog.exec_()
+            except Exception as exc:
+                logger.exception(exc)
+                errors.append(format(exc))
+            self.updateRecentFilesMenu()
+            if errors:
+                QtWidgets.QMessageBox.critical(
+                    self,
+                    self.tr("Failed to open XML menu"),
+                    "\n\n".join(errors)
+                )
+        for filename in otherFilenames:
+            self.loadDocument(filename)
+
     @QtCore.pyqtSlot()
     def onOpen(self) -> None:
         """Select a XML menu file using an dialog."""
@@ -340,8 +396,7 @@ class MainWindow(QtWidgets.QMainWindow):
             path,
             self.tr("L1-Trigger Menus (*{0})").format(XmlFileExtension)
         )
-        for filename in filenames:
-            self.loadDocument(filename)
+        self.loadDocuments(filenames)
 
     @QtCore.pyqtSlot()
     def onOpenUrl(self) -> None:
@@ -378,6 +433,9 @@ class MainWindow(QtWidgets.QMainWindow):
             if filename:
                 try:
                     dialog = ImportDialog(filename, self.mdiArea.currentDocument().menu(), self)
+                except QueueCanceled:
+                    logger.info("canceled importing XML menu: %s", filename)
+                    return
                 except AlgorithmSyntaxError as exc:
                     QtWidgets.QMessageBox.critical(
                         self,
@@ -414,6 +472,8 @@ class MainWindow(QtWidgets.QMainWindow):
         try:
             document.saveMenu()
             self.mdiArea.setTabText(self.mdiArea.currentIndex(), document.name())
+        except QueueCanceled:
+            logger.info("canceled writing XML menu: %s", document.filename())
         except Exception as exc:
             logger.exception(exc)
             QtWidgets.QMessageBox.critical(
@@ -441,6 +501,8 @@ class MainWindow(QtWidgets.QMainWindow):
                 # TODO
                 self.mdiArea.setTabText(self.mdiArea.currentIndex(), document.name())
                 self.insertRecentFile(os.path.realpath(document.filename()))
+            except QueueCanceled:
+                logger.info("canceled writing XML menu: %s", filename)
             except (XmlEncoderError, RuntimeError, ValueError, IOError) as exc:
                 QtWidgets.QMessageBox.critical(
                     self,
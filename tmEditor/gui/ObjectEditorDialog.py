@@ -255,17 +255,13 @@ class ObjectEditorDialog(QtWidgets.QDialog):
 
     def getScale(self, objectType):
         """Returns scale for object or None if not found."""
-        # Get only scales of object type
-        scales = list(filter(lambda item: item[kObject] == objectType, self.menu().scales.scales))
         # Get only threshold/count scales
-        return (list(filter(lambda item: item[kType] in (kET, kCOUNT, ), scales)) or [None])[0]
+        scaleIndex = self.menu().scaleIndex
+        return scaleIndex.get(objectType, kET) or scaleIndex.get(objectType, kCOUNT)
 
     def getPrecScale(self, scaleType):
-        """Returns scale for object or None if not found."""
-        # Get only scales of object type
-        scales = list(filter(lambda item: item[kObject] == "PRECISION", self.menu().scales.scales))
-        # Get only threshold/count scales
-        return (list(filter(lambda item: item[kType] in (scaleType), scales)) or [None])[0]
+        """Returns precision scale or None if not found."""
+        return self.menu().scaleIndex.get("PRECISION", scaleType)
 
     def updateFilter(self, text):
         """Update cut filter."""
@@ -0,0 +1,82 @@
+"""Queue thread.
+
+Executes a callback queue (eg. XML decoder or encoder queue) in a worker thread
+while showing a cancelable progress dialog, keeping the GUI responsive.
+
+Example usage:
+>>> queue = XmlDecoderQueue(filename)
+>>> execQueue(queue, "Loading...", parent)
+>>> menu = queue.menu
+"""
+
+import logging
+from typing import Optional
+
+from PyQt5 import QtCore, QtWidgets
+
+from tmEditor.core.Queue import Queue, QueueCanceled
+
+__all__ = ["QueueThread", "execQueue"]
+
+
+class QueueThread(QtCore.QThread):
+    """Thread executing all callbacks of a queue, reporting progress and
+    stage messages by signals. An exception raised by a callback is stored in
+    attribute `exception`.
+    """
+
+    progressChanged = QtCore.pyqtSignal(int)
+    labelChanged = QtCore.pyqtSignal(str)
+
+    def __init__(self, queue: Queue, parent: Optional[QtCore.QObject] = None) -> None:
+        super().__init__(parent)
+        self.queue: Queue = queue
+        self.exception: Optional[Exception] = None
+
+    def run(self) -> None:
+        try:
+            for callback in self.queue:
+                logging.debug("processing: %s...", self.queue.message())
+                self.labelChanged.emit(f"{self.queue.message().capitalize()}...")
+                callback()
+                self.progressChanged.emit(self.queue.progress())
+        except QueueCanceled as exc:
+            logging.info("queue canceled")
+            self.exception = exc
+        except Exception as exc:
+            self.exception = exc
+
+    @QtCore.pyqtSlot()
+    def cancel(self) -> None:
+        """Request cancellation, the queue stops before executing the next
+        callback or inside a callback's row loop.
+        """
+        self.queue.cancel()
+
+
+def execQueue(queue: Queue, title: str, parent: Optional[QtWidgets.QWidget] = None) -> None:
+    """Execute *queue* in a worker thread showing a cancelable progress
+    dialog. Re-raises an exception raised by the queue, raises QueueCanceled if
+    canceled by the user.
+    """
+    dialog = QtWidgets.QProgressDialog(parent)
+    dialog.setWindowTitle(title)
+    dialog.setWindowModality(QtCore.Qt.WindowModal)
+    dialog.setAutoClose(False)
+    dialog.setAutoReset(False)
+    dialog.setMinimumDuration(0)
+    dialog.resize(260, dialog.height())
+    thread = QueueThread(queue)
+    thread.labelChanged.connect(dialog.setLabelText)
+    thread.progressChanged.connect(dialog.setValue)
+    dialog.canceled.connect(thread.cancel, QtCore.Qt.DirectConnection)
+    loop = QtCore.QEventLoop()
+    thread.finished.connect(loop.quit)
+    dialog.show()
+    thread.start()
+    if thread.isRunning():
+        loop.exec_()
+    thread.wait()
+    dialog.close()
+    if thread.exception is not None:
+        raise thread.exception
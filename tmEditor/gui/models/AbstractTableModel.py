@@ -1,11 +1,14 @@
 """Abstract table model."""
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from collections import namedtuple
 
 from PyQt5 import QtCore
 
+from tmEditor.core.toolbox import natural_sort_key
+from tmEditor.core.SearchIndex import SearchEntry, SearchIndex
+
 __all__ = ['AbstractTableModel', ]
 
 # ------------------------------------------------------------------------------
@@ -19,14 +22,39 @@ class AbstractTableModel(QtCore.QAbstractTableModel):
     AlignRight = QtCore.Qt.AlignRight | QtCore.Qt.AlignVCenter
     AlignCenter = QtCore.Qt.AlignCenter | QtCore.Qt.AlignVCenter
 
+    SortRole = QtCore.Qt.UserRole + 1
+    """Role providing typed sort keys (see `addColumnSpec`)."""
+
+    SearchRole = QtCore.Qt.UserRole + 2
+    """Role providing search entries of rows (see `searchEntry`)."""
+
     ColumnSpec = namedtuple('ColumnSpec', 'title, callback, format, textAlignment, ' \
                                           'decoration, headerToolTip, headerDecoration, ' \
-                                          'headerSizeHint, headerTextAlignment')
+                                          'headerSizeHint, headerTextAlignment, sortKey')
 
     def __init__(self, values, parent: Optional[QtCore.QObject] = None) -> None:
         super().__init__(parent)
         self.values = values
+        # Menu item lists announce inserted items as rows, eg. cuts added
+        # to the menu by an editor dialog.
+        self.observesValues: bool = hasattr(values, "addObserver")
+        if self.observesValues:
+            values.addObserver(self)
         self.columnSpecs: List = []
+        # Optional search index of items, defaults to searching display text.
+        self.searchIndex: Optional[SearchIndex] = None
+        # Formatted display values and sort keys by row, column and role,
+        # entries hold the item and its revision (see `MenuItem`) at time of
+        # formatting to detect changes.
+        self.displayCache: Dict[Tuple[int, int, int], Tuple[Any, Any, Any]] = {}
+        self.dataChanged.connect(self.onDataChanged)
+        self.rowsInserted.connect(self.clearDisplayCache)
+        self.rowsRemoved.connect(self.clearDisplayCache)
+        self.rowsRemoved.connect(self.pruneSearchIndex)
+        self.rowsMoved.connect(self.clearDisplayCache)
+        self.layoutChanged.connect(self.clearDisplayCache)
+        self.modelReset.connect(self.clearDisplayCache)
+        self.modelReset.connect(self.pruneSearchIndex)
 
     def addColumnSpec(self, title, callback,
                       format=str,
@@ -35,9 +63,11 @@ class AbstractTableModel(QtCore.QAbstractTableModel):
                       headerToolTip=QtCore.QVariant(),
                       headerDecoration=QtCore.QVariant(),
                       headerSizeHint=QtCore.QVariant(),
-                      headerTextAlignment=AlignCenter):
-        """Add a column to be displayed, assign data using a callback (usually a lamda function accessing an attribute)."""
-        spec = self.ColumnSpec(title, callback, format, textAlignment, decoration, headerToolTip, headerDecoration, headerSizeHint, headerTextAlignment)
+                      headerTextAlignment=AlignCenter,
+                      sortKey=None):
+        """Add a column to be displayed, assign data using a callback (usually a lamda function accessing an attribute).
+        Optional *sortKey* returns a typed sort key for an item, defaults to natural sorting of the display text."""
+        spec = self.ColumnSpec(title, callback, format, textAlignment, decoration, headerToolTip, headerDecoration, headerSizeHint, headerTextAlignment, sortKey)
         self.columnSpecs.append(spec)
 
     def addEmptyColumn(self):
@@ -45,6 +75,85 @@ class AbstractTableModel(QtCore.QAbstractTableModel):
         tables with view columns to prevent last column to get stretched."""
         self.columnSpecs.append(None)
 
+    def clearDisplayCache(self, *args) -> None:
+        """Invalidate all cached display values."""
+        self.displayCache.clear()
+
+    def pruneSearchIndex(self, *args) -> None:
+        """Remove search entries of items no longer contained in the model."""
+        if self.searchIndex is not None:
+            self.searchIndex.prune(self.values)
+
+    def onDataChanged(self, topLeft, bottomRight, roles=None) -> None:
+        """Invalidate cached display values of changed cells."""
+        if not topLeft.isValid() or not bottomRight.isValid():
+            self.clearDisplayCache()
+            return
+        for row in range(topLeft.row(), bottomRight.row() + 1):
+            self.displayCache.pop((row, -1, self.SearchRole), None)
+            for column in range(topLeft.column(), bottomRight.column() + 1):
+                self.displayCache.pop((row, column, QtCore.Qt.DisplayRole), None)
+                self.displayCache.pop((row, column, self.SortRole), None)
+
+    def emitDataChanged(self, first: int = 0, last: Optional[int] = None) -> None:
+        """Notify views about changed rows *first* to *last* (default all
+        rows), eg. after modifying items in place."""
+        last = self.rowCount(QtCore.QModelIndex()) - 1 if last is None else last
+        if last < first:
+            return
+        topLeft = self.index(first, 0)
+        bottomRight = self.index(last, self.columnCount(QtCore.QModelIndex()) - 1)
+        self.dataChanged.emit(topLeft, bottomRight)
+
+    def itemsAboutToBeInserted(self, position: int, count: int) -> None:
+        """Announce rows inserted into observed values (see `ItemList`)."""
+        self.beginInsertRows(QtCore.QModelIndex(), position, position + count - 1)
+
+    def itemsInserted(self, position: int, count: int) -> None:
+        self.endInsertRows()
+
+    def emitItemsChanged(self, items) -> None:
+        """Notify views about rows of changed *items*, eg. after editing them
+        in place."""
+        changed = {id(item) for item in items}
+        for row, value in enumerate(self.values):
+            if id(value) in changed:
+                self.emitDataChanged(row, row)
+
+    def displayData(self, row: int, column: int, spec) -> Any:
+        """Returns cached formatted display value."""
+        return self.cachedData(row, column, QtCore.Qt.DisplayRole, lambda item: spec.format(spec.callback(item)))
+
+    def sortData(self, row: int, column: int, spec) -> Any:
+        """Returns cached typed sort key."""
+        if spec.sortKey is None:
+            return self.cachedData(row, column, self.SortRole, lambda item: natural_sort_key(self.displayData(row, column, spec)))
+        return self.cachedData(row, column, self.SortRole, spec.sortKey)
+
+    def searchEntry(self, row: int) -> SearchEntry:
+        """Returns search entry of *row*, provided by the search index or
+        built from the display text of all columns. Entries are rebuilt only
+        for changed items."""
+        if self.searchIndex is not None:
+            return self.searchIndex.entry(self.values[row])
+        def entry(item):
+            values = (self.displayData(row, column, spec) for column, spec in enumerate(self.columnSpecs) if spec)
+            return SearchEntry("\n".join(format(value) for value in values).lower(), {}, None)
+        return self.cachedData(row, -1, self.SearchRole, entry)
+
+    def cachedData(self, row: int, column: int, role: int, function) -> Any:
+        """Returns cached result of *function* for item of *row*, called again
+        if the item was replaced or edited in place (see `MenuItem.revision`)."""
+        item = self.values[row]
+        revision = (getattr(item, "revision", None), getattr(item, "modified", None))
+        key = (row, column, role)
+        entry = self.displayCache.get(key)
+        if entry is not None and entry[0] is item and entry[1] == revision:
+            return entry[2]
+        value = function(item)
+        self.displayCache[key] = (item, revision, value)
+        return value
+
     def toolTip(self, row, column):
         """Reimplement this to provide data specific tool tip informations."""
         return QtCore.QVariant()
@@ -66,7 +175,9 @@ class AbstractTableModel(QtCore.QAbstractTableModel):
         if not spec:
             return QtCore.QVariant()
         if role == QtCore.Qt.DisplayRole:
-            return spec.format(spec.callback(self.values[row])) # TODO
+            return self.displayData(row, column, spec)
+        if role == self.SortRole:
+            return self.sortData(row, column, spec)
         if role == QtCore.Qt.TextAlignmentRole:
             return int(spec.textAlignment)
         if role == QtCore.Qt.DecorationRole:
@@ -4,8 +4,9 @@ from typing import Any, Optional
 
 from PyQt5 import QtCore, QtGui
 
-from tmEditor.core.toolbox import encode_labels
+from tmEditor.core.toolbox import encode_labels, natural_sort_key
 from tmEditor.core.AlgorithmFormatter import AlgorithmFormatter
+from tmEditor.core.SearchIndex import SearchIndex, algorithmEntry, algorithmSignature
 from .AbstractTableModel import AbstractTableModel
 
 __all__ = ["AlgorithmsModel"]
@@ -19,10 +20,11 @@ class AlgorithmsModel(AbstractTableModel):
 
     def __init__(self, menu, parent: Optional[QtCore.QObject] = None) -> None:
         super().__init__(menu.algorithms, parent)
-        self.addColumnSpec("Index", lambda item: item.index, int, self.AlignRight)
-        self.addColumnSpec("Name", lambda item: item.name)
+        self.addColumnSpec("Index", lambda item: item.index, int, self.AlignRight, sortKey=lambda item: int(item.index))
+        self.addColumnSpec("Name", lambda item: item.name, sortKey=lambda item: natural_sort_key(item.name))
         self.addColumnSpec("Expression", lambda item: item.expression, AlgorithmFormatter.normalize)
         self.addColumnSpec("Labels", lambda item: encode_labels(item.labels, pretty=True))
+        self.searchIndex = SearchIndex(algorithmEntry, algorithmSignature)
 
     def data(self, index: QtCore.QModelIndex, role: int = QtCore.Qt.DisplayRole) -> Any:
         """Overloaded for experimental decoration."""
@@ -37,10 +39,13 @@ class AlgorithmsModel(AbstractTableModel):
 
     def insertRows(self, position: int, rows: int, parent: Optional[QtCore.QModelIndex] = None) -> bool:
         parent = QtCore.QModelIndex() if parent is None else parent
-        self.beginInsertRows(parent, position, position + rows - 1)
+        # Observed values announce inserted rows themselves.
+        if not self.observesValues:
+            self.beginInsertRows(parent, position, position + rows - 1)
         for i in range(rows):
             self.values.append(None)
-        self.endInsertRows()
+        if not self.observesValues:
+            self.endInsertRows()
         return True
 
     def removeRows(self, position: int, rows: int, parent: Optional[QtCore.QModelIndex] = None) -> bool:
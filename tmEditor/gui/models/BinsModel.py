@@ -6,14 +6,11 @@ from PyQt5 import QtCore
 
 from tmEditor.core.formatter import fHex, fCutValue
 from tmEditor.core.types import ThresholdCutNames
+from tmEditor.core.ScaleBins import scaleBins
 from .AbstractTableModel import AbstractTableModel
 
 __all__ = ['BinsModel', ]
 
-kNumber = 'number'
-kMinimum = 'minimum'
-kMaximum = 'maximum'
-
 # ------------------------------------------------------------------------------
 #  Bins model class
 # ------------------------------------------------------------------------------
@@ -22,21 +19,18 @@ class BinsModel(AbstractTableModel):
     """Default scale bins table model."""
 
     def __init__(self, menu, name, parent: Optional[QtCore.QObject] = None) -> None:
-        super().__init__(menu.scales.bins[name], parent)
+        self.bins = scaleBins(menu.scales, name)
+        super().__init__(self.bins.bins(), parent)
         self.name = name
-        self.addColumnSpec("Number dec", lambda item: item[kNumber], int, self.AlignRight)
-        self.addColumnSpec("Number hex", lambda item: item[kNumber], fHex, self.AlignRight)
-        self.addColumnSpec("Minimum", lambda item: item[kMinimum], fCutValue, self.AlignRight)
-        self.addColumnSpec("Maximum", self.maximumCallback, fCutValue, self.AlignRight)
+        self.addColumnSpec("Number dec", lambda item: item.number, int, self.AlignRight, sortKey=lambda item: item.number)
+        self.addColumnSpec("Number hex", lambda item: item.number, fHex, self.AlignRight, sortKey=lambda item: item.number)
+        self.addColumnSpec("Minimum", lambda item: item.minimum, fCutValue, self.AlignRight, sortKey=lambda item: item.minimum)
+        self.addColumnSpec("Maximum", self.maximumCallback, fCutValue, self.AlignRight, sortKey=self.maximumCallback)
         self.addEmptyColumn()
-        # Calculate first and last bin sortd by maximum
-        sortedBins = sorted(self.values, key=lambda item: float(item[kMaximum]))
-        self.firstBin = sortedBins[0] if sortedBins else None
-        self.lastBin = sortedBins[-1] if sortedBins else None
 
     def maximumCallback(self, item):
         """Custom infinite value for all ET/PT scales (visual adaption)."""
         if self.name in ThresholdCutNames:
-            if item == self.lastBin:
+            if item.index == self.bins.lastIndex:
                 return float('inf')
-        return item[kMaximum]
+        return item.maximum
@@ -8,8 +8,10 @@ import tmGrammar
 
 from tmEditor.core.Settings import CutSpecs
 from tmEditor.core.formatter import fCutValue, fCutData
+from tmEditor.core.toolbox import natural_sort_key, numeric_sort_key
 from tmEditor.core.Algorithm import calculateDRRange
 from tmEditor.core.Algorithm import calculateInvMassRange
+from tmEditor.core.SearchIndex import SearchIndex, cutEntry, cutSignature
 
 from .AbstractTableModel import AbstractTableModel
 
@@ -49,11 +51,12 @@ class CutsModel(AbstractTableModel):
     def __init__(self, menu, parent: Optional[QtCore.QObject] = None) -> None:
         super().__init__(menu.cuts, parent)
         self.menu = menu
-        self.addColumnSpec("Name", lambda item: item.name)
+        self.addColumnSpec("Name", lambda item: item.name, sortKey=lambda item: natural_sort_key(item.name))
         self.addColumnSpec("Type", lambda item: item.type)
-        self.addColumnSpec("Minimum", lambda item: item.minimum, fCutValue, self.AlignRight)
-        self.addColumnSpec("Maximum", maximumCallback, fCutValue, self.AlignRight)
+        self.addColumnSpec("Minimum", lambda item: item.minimum, fCutValue, self.AlignRight, sortKey=lambda item: numeric_sort_key(item.minimum))
+        self.addColumnSpec("Maximum", maximumCallback, fCutValue, self.AlignRight, sortKey=lambda item: numeric_sort_key(maximumCallback(item)))
         self.addColumnSpec("Data", lambda item: fCutData(item))
+        self.searchIndex = SearchIndex(cutEntry, cutSignature)
 
     def data(self, index, role):
         """Overloaded for experimental icon decoration."""
@@ -67,10 +70,13 @@ class CutsModel(AbstractTableModel):
         return super().data(index, role)
 
     def insertRows(self, position, rows, parent=QtCore.QModelIndex()):
-        self.beginInsertRows(parent, position, position + rows - 1)
+        # Observed values announce inserted rows themselves.
+        if not self.observesValues:
+            self.beginInsertRows(parent, position, position + rows - 1)
         for i in range(rows):
             self.values.append(None)
-        self.endInsertRows()
+        if not self.observesValues:
+            self.endInsertRows()
         return True
 
     def removeRows(self, position, rows, parent=QtCore.QModelIndex()):
@@ -4,6 +4,7 @@ from typing import Optional
 
 from PyQt5 import QtCore
 
+from tmEditor.core.toolbox import natural_sort_key, numeric_sort_key
 from .AbstractTableModel import AbstractTableModel
 from tmEditor.gui.CommonWidgets import miniIcon
 
@@ -29,8 +30,8 @@ class ExtSignalsModel(AbstractTableModel):
     def __init__(self, menu, parent: Optional[QtCore.QObject] = None) -> None:
         super().__init__(menu.extSignals.extSignals, parent)
         self.addColumnSpec("System", lambda item: item[kSystem], decoration=miniIcon('ext'))
-        self.addColumnSpec("Name", lambda item: item[kName])
+        self.addColumnSpec("Name", lambda item: item[kName], sortKey=lambda item: natural_sort_key(item[kName]))
         self.addColumnSpec("Label", lambda item: item[kLabel] if kLabel in item else "")
-        self.addColumnSpec("Cable", lambda item: item[kCable], int, self.AlignRight)
-        self.addColumnSpec("Channel", lambda item: item[kChannel], int, self.AlignRight)
+        self.addColumnSpec("Cable", lambda item: item[kCable], int, self.AlignRight, sortKey=lambda item: numeric_sort_key(item[kCable]))
+        self.addColumnSpec("Channel", lambda item: item[kChannel], int, self.AlignRight, sortKey=lambda item: numeric_sort_key(item[kChannel]))
         self.addEmptyColumn()
@@ -11,6 +11,7 @@ tmGrammar.ET = "ET"
 tmGrammar.PT = "PT"
 
 from tmEditor.core.formatter import fCutValue
+from tmEditor.core.toolbox import numeric_sort_key
 from .AbstractTableModel import AbstractTableModel
 
 __all__ = ['ScalesModel', ]
@@ -44,8 +45,8 @@ class ScalesModel(AbstractTableModel):
         super().__init__(menu.scales.scales, parent)
         self.addColumnSpec("Object", lambda item: item[kObject])
         self.addColumnSpec("Type", fPatchType)
-        self.addColumnSpec("Minimum", lambda item: item[kMinimum], fCutValue, self.AlignRight)
-        self.addColumnSpec("Maximum", lambda item: item[kMaximum], fCutValue, self.AlignRight)
-        self.addColumnSpec("Step", lambda item: item[kStep], fCutValue, self.AlignRight)
-        self.addColumnSpec("Bitwidth", lambda item: item[kNBits], int, self.AlignRight)
+        self.addColumnSpec("Minimum", lambda item: item[kMinimum], fCutValue, self.AlignRight, sortKey=lambda item: numeric_sort_key(item[kMinimum]))
+        self.addColumnSpec("Maximum", lambda item: item[kMaximum], fCutValue, self.AlignRight, sortKey=lambda item: numeric_sort_key(item[kMaximum]))
+        self.addColumnSpec("Step", lambda item: item[kStep], fCutValue, self.AlignRight, sortKey=lambda item: numeric_sort_key(item[kStep]))
+        self.addColumnSpec("Bitwidth", lambda item: item[kNBits], int, self.AlignRight, sortKey=lambda item: numeric_sort_key(item[kNBits]))
         self.addEmptyColumn()
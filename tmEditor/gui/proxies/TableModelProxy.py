@@ -0,0 +1,48 @@
+"""Table model proxy."""
+
+from PyQt5 import QtCore
+
+from tmEditor.core.SearchIndex import SearchQuery
+from tmEditor.gui.models.AbstractTableModel import AbstractTableModel
+
+__all__ = ['TableModelProxy', ]
+
+# -----------------------------------------------------------------------------
+#  Table model proxy
+# -----------------------------------------------------------------------------
+
+class TableModelProxy(QtCore.QSortFilterProxyModel):
+    """Sort/filter proxy comparing typed sort keys provided by the source
+    model (see `AbstractTableModel.SortRole`), sort keys are cached by the
+    source model. Rows are filtered by search queries (see `setFilterQuery`)
+    matching the search entries of the source model.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setSortRole(AbstractTableModel.SortRole)
+        self.filterQuery = SearchQuery("")
+
+    def setFilterQuery(self, text):
+        """Set search query filtering rows, eg. `MU10 cut:MU-ETA index:100-200`."""
+        self.filterQuery = SearchQuery(text)
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, sourceRow, sourceParent):
+        """Match search query against search entry of source row."""
+        if self.filterQuery.isEmpty():
+            return True
+        model = self.sourceModel()
+        if not isinstance(model, AbstractTableModel):
+            return super().filterAcceptsRow(sourceRow, sourceParent)
+        return self.filterQuery.matches(model.searchEntry(sourceRow))
+
+    def lessThan(self, left, right):
+        """Compare sort keys, falls back to display text for incompatible keys."""
+        model = self.sourceModel()
+        if not isinstance(model, AbstractTableModel):
+            return super().lessThan(left, right)
+        try:
+            return model.data(left, AbstractTableModel.SortRole) < model.data(right, AbstractTableModel.SortRole)
+        except TypeError:
+            return format(model.data(left, QtCore.Qt.DisplayRole)) < format(model.data(right, QtCore.Qt.DisplayRole))
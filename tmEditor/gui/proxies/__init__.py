@@ -1,2 +1,3 @@
+from .TableModelProxy import TableModelProxy
 from .CutsModelProxy import CutsModelProxy
 from .ScalesModelProxy import ScalesModelProxy
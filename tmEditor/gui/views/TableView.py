@@ -1,6 +1,6 @@
 """Table view."""
 
-from typing import Optional
+from typing import Dict, Optional
 
 from PyQt5 import QtCore, QtWidgets
 
@@ -11,8 +11,13 @@ from PyQt5 import QtCore, QtWidgets
 class TableView(QtWidgets.QTableView):
     """Common sortable table view wiget."""
 
+    SampleRows = 64
+    """Number of rows measured to estimate column widths."""
+
     def __init__(self, parent: Optional[QtWidgets.QWidget] = None) -> None:
         super().__init__(parent)
+        # Estimated column widths, only growing for inserted rows.
+        self.columnWidths: Dict[int, int] = {}
 
         self.setShowGrid(False)
         self.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectRows)
@@ -40,3 +45,51 @@ class TableView(QtWidgets.QTableView):
             # Use the assigned proxy model to map the index.
             return self.model().mapToSource(index[0])  # type: ignore
         return None
+
+    def setModel(self, model: QtCore.QAbstractItemModel) -> None:
+        """Overloaded to widen columns for inserted rows."""
+        super().setModel(model)
+        self.columnWidths.clear()
+        model.rowsInserted.connect(self.onRowsInserted)
+
+    def sampleRows(self, first: int, last: int) -> range:
+        """Returns evenly distributed sample of rows *first* to *last*."""
+        step = max(1, (last - first + 1) // self.SampleRows)
+        return range(first, last + 1, step)
+
+    def estimateColumnWidths(self, first: int, last: int) -> Dict[int, int]:
+        """Returns column widths required by a sample of rows *first* to *last*."""
+        model = self.model()
+        widths = {}
+        for column in range(model.columnCount()):
+            width = 0
+            for row in self.sampleRows(first, last):
+                width = max(width, self.sizeHintForIndex(model.index(row, column)).width())
+            widths[column] = width
+        return widths
+
+    def resizeColumnsToSample(self) -> None:
+        """Resize columns to fit the headers and a sample of rows instead of
+        measuring every cell (see `resizeColumnsToContents`)."""
+        model = self.model()
+        if model is None:
+            return
+        header = self.horizontalHeader()
+        widths = self.estimateColumnWidths(0, model.rowCount() - 1)
+        self.columnWidths = {
+            column: max(width, header.sectionSizeHint(column))
+            for column, width in widths.items()
+        }
+        for column, width in self.columnWidths.items():
+            header.resizeSection(column, width)
+
+    @QtCore.pyqtSlot(QtCore.QModelIndex, int, int)
+    def onRowsInserted(self, parent: QtCore.QModelIndex, first: int, last: int) -> None:
+        """Widen columns not fitting a sample of inserted rows."""
+        if not self.columnWidths:
+            return
+        header = self.horizontalHeader()
+        for column, width in self.estimateColumnWidths(first, last).items():
+            if width > self.columnWidths.get(column, 0):
+                self.columnWidths[column] = width
+                header.resizeSection(column, width)
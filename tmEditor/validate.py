@@ -0,0 +1,138 @@
+"""Headless batch validation of XML menus.
+
+Decodes and validates XML menus using a process pool without importing PyQt5,
+writing a JSON report with per file results and timings. Exit status is 0 if
+all files are valid, 1 otherwise.
+
+Example usage:
+$ tm-editor validate --workers 8 L1Menu_*.xml > report.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional
+
+from . import __version__
+from .core import XmlDecoder
+
+__all__ = ["validateFile", "validateFiles", "main"]
+
+
+def parse_args(args: Optional[List[str]] = None) -> argparse.Namespace:
+    """Command line argument parser."""
+    parser = argparse.ArgumentParser(
+        prog="tm-editor validate",
+        description="validate trigger menu XML files without graphical user interface",
+    )
+    parser.add_argument(
+        "filenames",
+        metavar="<file>",
+        nargs="+",
+        help="trigger menu XML file",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        metavar="<n>",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="number of worker processes decoding files and validating algorithms (default number of CPUs)",
+    )
+    parser.add_argument(
+        "--backend",
+        metavar="<name>",
+        choices=("tmtable", "stream"),
+        help="XML decoder backend, tmtable or stream (default tmtable)",
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        metavar="<file>",
+        help="write JSON report to file (default stdout)",
+    )
+    parser.add_argument(
+        "--indent",
+        metavar="<n>",
+        type=int,
+        help="indent JSON report",
+    )
+    parser.add_argument(
+        "-v",
+        "--verbose",
+        action="count",
+        help="increase output verbosity",
+    )
+    return parser.parse_args(args)
+
+
+def validateFile(filename: str, backend: Optional[str] = None, workers: int = 1) -> dict:
+    """Decode and validate *filename*, returns result as plain Python types.
+    Algorithm expressions are validated using up to *workers* processes.
+    Timings of every decoder step are given in seconds.
+    """
+    result = {
+        "filename": filename,
+        "valid": False,
+        "error": None,
+        "algorithms": None,
+        "timings": {},
+    }
+    start = time.perf_counter()
+    try:
+        queue = XmlDecoder.createQueue(filename, None, backend, workers)
+        for callback in queue:
+            stepStart = time.perf_counter()
+            callback()
+            result["timings"][queue.message()] = time.perf_counter() - stepStart
+        result["algorithms"] = len(queue.menu.algorithms)
+        result["valid"] = True
+    except Exception as exc:
+        result["error"] = {"type": type(exc).__name__, "message": format(exc)}
+    result["timings"]["total"] = time.perf_counter() - start
+    return result
+
+
+def validateFiles(filenames: List[str], workers: int = 1, backend: Optional[str] = None) -> List[dict]:
+    """Validate *filenames* using up to *workers* processes, returns results
+    in order of filenames. Processes not required for files are shared for
+    validating algorithm expressions.
+    """
+    count = min(workers, len(filenames))
+    validationWorkers = max(1, workers // max(1, len(filenames)))
+    if count < 2:
+        return [validateFile(filename, backend, validationWorkers) for filename in filenames]
+    with ProcessPoolExecutor(max_workers=count) as executor:
+        return list(executor.map(validateFile, filenames, [backend] * len(filenames), [validationWorkers] * len(filenames)))
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    """Batch validation routine, returns exit status."""
+    options = parse_args(args)
+
+    # Setup console logging (stderr) and debug level.
+    level = logging.DEBUG if options.verbose else logging.WARNING
+    logging.basicConfig(format="%(levelname)s: %(message)s", level=level)
+
+    start = time.perf_counter()
+    results = validateFiles(options.filenames, max(1, options.workers), options.backend)
+    invalid = sum(not result["valid"] for result in results)
+    report = {
+        "version": __version__,
+        "files": results,
+        "valid": len(results) - invalid,
+        "invalid": invalid,
+        "elapsed": time.perf_counter() - start,
+    }
+    if options.output:
+        with open(options.output, "w") as fp:
+            json.dump(report, fp, indent=options.indent)
+            fp.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=options.indent)
+        sys.stdout.write("\n")
+    return 1 if invalid else 0